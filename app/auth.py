@@ -4,35 +4,65 @@ Authentication Service
 
 Provides simple authentication utilities including password hashing,
 user registration with automatic root assignment for the first user,
-and credential validation during login. Interaction with persistence is
-handled through a ``DBController`` instance passed into ``AuthService``.
+credential validation during login and token-based login sessions.
+Interaction with persistence is handled through a ``DBController``
+instance passed into ``AuthService``.
 
 Main features:
-- Secure password hashing (SHA-256)
+- Salted, tunable-cost password hashing (scrypt or PBKDF2, see
+  :mod:`db.passwords`) verified in a bounded worker pool
+- Legacy SHA-256 hashes are upgraded transparently on the next login
+- Login attempts throttled per username and per source with token
+  buckets (see :mod:`app.rate_limit`), before any query or hash
 - User registration with automatic "root" role for first user
 - Login validation against stored password hashes
+- Opaque session tokens with expiry, stored hashed in the ``sessions``
+  table and resolved through an in-memory TTL cache
 - Clean separation between authentication logic and storage backend
+
+Session settings live in ``vars/dev/vars.json`` under ``SESSIONS``::
+
+    "SESSIONS": {
+        "ttl_seconds": 28800,
+        "cache_ttl_seconds": 300,
+        "cache_size": 1024
+    }
 """
 
+from datetime import datetime, timedelta
 import hashlib
+import secrets
+from db.cache import TTLCache, MISSING
+from db.changes import DELETE
+from db.config import get_config
 from db.db_controller import DBController
+from db.passwords import hash_password_async, needs_rehash, verify_password_async
+from app.rate_limit import login_limiters
 
+SESSIONS = get_config().get("SESSIONS", {})
+SESSION_TTL = SESSIONS.get("ttl_seconds", 8 * 3600)
+SESSION_CACHE_TTL = SESSIONS.get("cache_ttl_seconds", 300)
+SESSION_CACHE_SIZE = SESSIONS.get("cache_size", 1024)
 
-def hash_password(password: str) -> str:
+
+def hash_token(token: str) -> str:
     """
-    Compute a SHA-256 hash of the given password.
+    Compute the digest under which a session token is stored.
+
+    Tokens are long random strings, so a single unsalted SHA-256 is
+    enough to keep the stored value from being usable as a token.
 
     Parameters
     ----------
-    password : str
-        The plaintext password to hash.
+    token : str
+        Session token handed to the client.
 
     Returns
     -------
     str
-        Hex-encoded SHA-256 password hash.
+        Hex-encoded SHA-256 of the token.
     """
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
 
 
 class AuthService:
@@ -41,11 +71,17 @@ class AuthService:
 
     This class acts as a layer on top of :class:`DBController`, handling
     password hashing and basic authentication flow (register, login,
-    close). It does not manage permissions or session state — only
-    identity validation and creation.
+    close) and login sessions. It does not manage permissions.
+
+    Resolving a session token costs one dictionary lookup while it is in
+    :attr:`session_cache`; only a miss hashes the token and queries the
+    ``sessions`` table. Cached sessions are dropped as soon as their user
+    changes (role, username...) or the session is deleted, through the
+    controller's change bus (see :mod:`db.changes`).
     """
 
-    def __init__(self, db_controller):
+    def __init__(self, db_controller, session_ttl: float = SESSION_TTL,
+                 cache_ttl: float = SESSION_CACHE_TTL, cache_size: int = SESSION_CACHE_SIZE):
         """
         Initialize the authentication service.
 
@@ -54,8 +90,27 @@ class AuthService:
         db_controller : DBController
             Instance responsible for database operations such as
             retrieving and persisting user records.
+        session_ttl : float, optional
+            Lifetime of a login session, in seconds.
+        cache_ttl : float, optional
+            Longest time a resolved session is served from memory, which
+            bounds how late changes made by other processes are seen.
+        cache_size : int, optional
+            Maximum number of cached sessions.
+
+        Attributes
+        ----------
+        login_by_username, login_by_source : TokenBucketLimiter or None
+            Login throttles configured by ``LOGIN_THROTTLE`` (``None``
+            when disabled). Their :meth:`~app.rate_limit.TokenBucketLimiter.stats`
+            report rejected attempts.
         """
         self.db = db_controller
+        self.session_ttl = timedelta(seconds=session_ttl)
+        # token -> (token_hash, UserView), tagged ("user", id) and ("session", token_hash)
+        self.session_cache = TTLCache(cache_ttl, cache_size)
+        self.login_by_username, self.login_by_source = login_limiters()
+        self._unsubscribe = self.db.change_bus.subscribe(self._on_change, entities=("user", "session"))
 
     def register_user(self, username: str, email: str, password: str, access_level="user"):
         """
@@ -63,7 +118,7 @@ class AuthService:
 
         If this is the first user in the system, they are automatically
         assigned the ``root`` access level. Passwords are hashed using
-        :func:`hash_password`.
+        :func:`db.passwords.hash_password`.
 
         Parameters
         ----------
@@ -82,14 +137,14 @@ class AuthService:
             ``True`` if the user was registered successfully, otherwise
             ``False``.
         """
-        if len(self.db.get_all_users()) == 0:
+        if not self.db.has_users():
             access_level = "root"
             print("⚠ Creating first user as ROOT")
 
         ok, result = self.db.add_user(
             username=username,
             email=email,
-            password_hash=hash_password(password),
+            password_hash=self.hash_password(password),
             access_level=access_level
         )
 
@@ -100,39 +155,163 @@ class AuthService:
         print(f"User '{username}' registered successfully.")
         return True
 
-    def login(self, username: str, password: str):
+    def login(self, username: str, password: str, source: str = "local"):
         """
         Authenticate a user by username and password.
 
+        Each attempt first takes a token from the buckets of ``source``
+        and ``username``; when either is empty the attempt is rejected
+        without touching the database or hashing anything. A successful
+        login refills the username bucket.
+
+        The password is checked in the worker pool of
+        :mod:`db.passwords`. When the stored hash is a legacy SHA-256 hash
+        or was made with another cost than the configured one, it is
+        replaced by a fresh hash of the password that was just verified.
+
         Parameters
         ----------
         username : str
             Username to authenticate.
         password : str
             Plaintext password to verify.
+        source : str, optional
+            Where the attempt comes from (client address, terminal...).
+            Defaults to ``"local"`` for the console menu.
 
         Returns
         -------
         object or None
             The user object on successful login, or ``None`` on failure.
         """
+        if not self._allow_attempt(username, source):
+            print("Too many login attempts. Try again later.")
+            return None
+
         user = self.db.get_user_by_username(username)
 
         if not user:
             print("User not found.")
             return None
 
-        if user.password_hash != hash_password(password):
+        if not verify_password_async(password, user.password_hash).result():
             print("Incorrect password.")
             return None
 
+        if needs_rehash(user.password_hash):
+            self.db.update_user(user.id, {"password_hash": self.hash_password(password)})
+
+        if self.login_by_username is not None:
+            self.login_by_username.reset(username)
         print(f"Welcome {user.username}! ({user.access_level})")
         return user
 
+    def _allow_attempt(self, username: str, source: str) -> bool:
+        # Source first: a flood from one place must not fill the username
+        # table with the names it tries.
+        if self.login_by_source is None:
+            return True
+        return self.login_by_source.allow(source) and self.login_by_username.allow(username)
+
+    def hash_password(self, password: str) -> str:
+        """
+        Hash a new password with the configured KDF, in the worker pool.
+
+        Parameters
+        ----------
+        password : str
+            The plaintext password to hash.
+
+        Returns
+        -------
+        str
+            Encoded hash to store in ``users.password_hash``.
+        """
+        return hash_password_async(password).result()
+
+    def create_session(self, user):
+        """
+        Open a login session for an authenticated user.
+
+        Parameters
+        ----------
+        user : User
+            User returned by :meth:`login`.
+
+        Returns
+        -------
+        str or None
+            Opaque session token, or ``None`` if the session could not be
+            stored.
+        """
+        token = secrets.token_urlsafe(32)
+        ok, message = self.db.create_session(user.id, hash_token(token), datetime.now() + self.session_ttl)
+        if not ok:
+            print(message)
+            return None
+        return token
+
+    def authenticate(self, token: str):
+        """
+        Resolve a session token to its user.
+
+        Parameters
+        ----------
+        token : str
+            Token returned by :meth:`create_session`.
+
+        Returns
+        -------
+        UserView or None
+            Snapshot of the user (see :mod:`db.views`), or ``None`` if the
+            session is unknown, expired or was ended.
+        """
+        entry = self.session_cache.get(token)
+        if entry is not MISSING:
+            return entry[1]
+
+        token_hash = hash_token(token)
+        found = self.db.get_session(token_hash)
+        if found is None:
+            return None
+        user, expires_at = found
+        # Never serve a session from memory past its own expiry.
+        remaining = (expires_at - datetime.now()).total_seconds()
+        self.session_cache.put(
+            token, (token_hash, user), min(self.session_cache.ttl, remaining),
+            tags=(("user", user.id), ("session", token_hash)),
+        )
+        return user
+
+    def end_session(self, token: str) -> bool:
+        """
+        End a login session (logout).
+
+        Parameters
+        ----------
+        token : str
+            Token returned by :meth:`create_session`.
+
+        Returns
+        -------
+        bool
+            ``True`` if the session existed.
+        """
+        self.session_cache.invalidate(token)
+        return self.db.delete_session(hash_token(token))
+
+    def _on_change(self, change):
+        # Entries are tagged with their user ID and token hash, so only the
+        # affected sessions are dropped.
+        if change.entity == "user" or change.op == DELETE:
+            self.session_cache.invalidate_tag((change.entity, change.id))
+
     def close(self):
         """
         Close the underlying database connection.
 
-        This method simply delegates to :meth:`DBController.close`.
+        This method stops following the change bus and delegates to
+        :meth:`DBController.close`.
         """
+        self._unsubscribe()
         self.db.close()
@@ -0,0 +1,271 @@
+"""
+Bulk User Import
+================
+
+Creates user accounts from a CSV file instead of one interactive
+registration at a time. The file needs a header with ``username``,
+``email`` and ``password`` columns and may add ``access_level`` (defaults
+to ``"user"``), which must name a role of the roles file other than the
+reserved ``root``. Run from the project root::
+
+    python -m app.bulk_import users.csv --chunk-size 1000 --workers 4
+
+Main features:
+- The file is read in chunks; each chunk is validated, hashed and
+  inserted before the next one is read.
+- Uniqueness is checked per chunk with one query for usernames and one
+  for emails, plus duplicates inside the file itself.
+- Password hashing runs in a process pool so it uses every core.
+- Each chunk is inserted with a single ``executemany`` in its own
+  transaction; rows that fail validation are reported, not inserted.
+- If another writer takes a username or email between the check and the
+  insert, that chunk is retried row by row so only the conflicting rows
+  are rejected.
+- A report with rows/sec and per-row errors (by CSV line number).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import argparse
+import csv
+import os
+import time
+
+from sqlalchemy.exc import IntegrityError
+
+from app.permissions import PermissionManager
+from db.config import get_config
+from db.passwords import hash_password
+from db.db_controller import DBController
+
+CHUNK_SIZE = 1000
+REQUIRED_COLUMNS = ("username", "email", "password")
+
+# Roles never granted by an import; ``root`` is only given to the first
+# registered user.
+RESERVED_ROLES = ("root",)
+
+
+def importable_roles(permissions=None) -> set:
+    """
+    Return the access levels an imported row may have.
+
+    Parameters
+    ----------
+    permissions : PermissionManager, optional
+        Source of the known roles. Defaults to a manager reading
+        ``ROLES_JSON_FILE``.
+
+    Returns
+    -------
+    set
+        Every role of the roles file except :data:`RESERVED_ROLES`.
+    """
+    if permissions is None:
+        permissions = PermissionManager(get_config()["ROLES_JSON_FILE"], reload_interval=None)
+    return set(permissions.role_masks) - set(RESERVED_ROLES)
+
+
+def _hash_all(passwords, executor, workers):
+    """
+    Hash a list of passwords, in ``executor`` when one is given.
+    """
+    if executor is None:
+        return [hash_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (4 * workers))
+    return list(executor.map(hash_password, passwords, chunksize=chunksize))
+
+
+def _validate_chunk(db, chunk, seen_usernames, seen_emails, access_levels, errors):
+    """
+    Return the rows of ``chunk`` that can be inserted.
+
+    Invalid rows are appended to ``errors`` as ``(line, message)``.
+    ``seen_usernames`` and ``seen_emails`` collect values accepted from
+    earlier rows of the file so duplicates inside the file are caught;
+    ``access_levels`` is the set of roles rows may have.
+    """
+    candidates = []
+    for line, row in chunk:
+        username = (row.get("username") or "").strip()
+        email = (row.get("email") or "").strip()
+        password = (row.get("password") or "").strip()
+        if not username or not email or not password:
+            errors.append((line, "Username, email and password are required."))
+            continue
+        access_level = (row.get("access_level") or "").strip() or "user"
+        if access_level in RESERVED_ROLES:
+            errors.append((line, f"Access level cannot be imported: {access_level}"))
+            continue
+        if access_level not in access_levels:
+            errors.append((line, f"Unknown access level: {access_level}"))
+            continue
+        if username in seen_usernames:
+            errors.append((line, f"Duplicate username in file: {username}"))
+            continue
+        if email in seen_emails:
+            errors.append((line, f"Duplicate email in file: {email}"))
+            continue
+        seen_usernames.add(username)
+        seen_emails.add(email)
+        candidates.append((line, username, email, password, access_level))
+
+    taken_usernames, taken_emails = db.find_taken(
+        (c[1] for c in candidates), (c[2] for c in candidates)
+    )
+
+    valid = []
+    for candidate in candidates:
+        line, username, email = candidate[:3]
+        if username in taken_usernames:
+            errors.append((line, "Username already exists."))
+        elif email in taken_emails:
+            errors.append((line, "Email already exists."))
+        else:
+            valid.append(candidate)
+    return valid
+
+
+def _insert_rows(db, lines, rows, errors) -> int:
+    """
+    Insert ``rows`` one at a time in a single transaction.
+
+    Used when the bulk insert of a chunk hits a unique constraint: each
+    row gets its own savepoint, so the conflicting ones are appended to
+    ``errors`` and the others are still inserted.
+    """
+    inserted = 0
+    with db.transaction():
+        for line, row in zip(lines, rows):
+            ok, result = db.add_user(commit=False, **row)
+            if ok:
+                inserted += 1
+            else:
+                errors.append((line, result))
+    return inserted
+
+
+def import_users_csv(db, path: str, chunk_size: int = CHUNK_SIZE, workers: int = None,
+                     access_levels=None) -> dict:
+    """
+    Import users from a CSV file.
+
+    Parameters
+    ----------
+    db : DBController
+        Controller used for validation queries and inserts.
+    path : str
+        CSV file with a header row.
+    chunk_size : int, optional
+        Rows validated, hashed and inserted per transaction.
+    workers : int, optional
+        Hashing processes. Defaults to the CPU count; ``1`` hashes in the
+        current process.
+    access_levels : iterable of str, optional
+        Roles rows may be given. Defaults to :func:`importable_roles`;
+        :data:`RESERVED_ROLES` are rejected either way.
+
+    Returns
+    -------
+    dict
+        ``rows`` read, ``imported`` count, ``errors`` as a list of
+        ``(line, message)``, elapsed ``seconds`` and ``rows_per_s``.
+
+    Raises
+    ------
+    ValueError
+        If the header lacks a required column.
+    """
+    workers = workers or os.cpu_count() or 1
+    access_levels = importable_roles() if access_levels is None else set(access_levels)
+    errors = []
+    seen_usernames, seen_emails = set(), set()
+    rows = imported = 0
+    start = time.perf_counter()
+
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        with open(path, newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or ())]
+            if missing:
+                raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+            # Data starts on line 2, after the header.
+            numbered = enumerate(reader, start=2)
+            while True:
+                chunk = list(islice(numbered, chunk_size))
+                if not chunk:
+                    break
+                rows += len(chunk)
+
+                valid = _validate_chunk(db, chunk, seen_usernames, seen_emails, access_levels, errors)
+                hashes = _hash_all([v[3] for v in valid], executor, workers)
+                users = [
+                    {
+                        "username": username,
+                        "email": email,
+                        "password_hash": password_hash,
+                        "access_level": access_level,
+                    }
+                    for (_, username, email, _, access_level), password_hash in zip(valid, hashes)
+                ]
+                try:
+                    with db.transaction():
+                        imported += db.add_users_bulk(users)
+                except IntegrityError:
+                    # Taken since find_taken ran; retry to report the rows.
+                    imported += _insert_rows(db, [v[0] for v in valid], users, errors)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    seconds = time.perf_counter() - start
+    errors.sort()
+    return {
+        "rows": rows,
+        "imported": imported,
+        "errors": errors,
+        "seconds": seconds,
+        "rows_per_s": rows / seconds if seconds else 0.0,
+    }
+
+
+def print_report(report: dict, max_errors: int = 20):
+    """
+    Print an import report to the console.
+
+    Parameters
+    ----------
+    report : dict
+        Result of :func:`import_users_csv`.
+    max_errors : int, optional
+        Maximum number of per-row errors to list.
+    """
+    print(f"Imported {report['imported']} of {report['rows']} rows "
+          f"in {report['seconds']:.2f}s ({report['rows_per_s']:.0f} rows/s).")
+    errors = report["errors"]
+    if errors:
+        print(f"{len(errors)} rows rejected:")
+        for line, message in errors[:max_errors]:
+            print(f"  line {line}: {message}")
+        if len(errors) > max_errors:
+            print(f"  ... and {len(errors) - max_errors} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import users from a CSV file.")
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    db = DBController()
+    try:
+        print_report(import_users_csv(db, args.path, args.chunk_size, args.workers), max_errors=100)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
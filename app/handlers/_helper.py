@@ -1,21 +1,70 @@
+PAGE_SIZE = 20
+SEARCH_LIMIT = 10
+
+
+def helper_paginate(fetch_page, render, page_size=PAGE_SIZE):
+    """
+    Print rows page by page using keyset pagination.
+
+    Only one page is held in memory at a time. After each full page the
+    operator may press ENTER to load the next one or type anything else
+    to stop listing.
+
+    Parameters
+    ----------
+    fetch_page : callable
+        Function accepting ``after_id`` and ``limit`` keyword arguments and
+        returning a list of objects ordered by an ``id`` attribute, e.g.
+        :meth:`DBController.list_users`.
+    render : callable
+        Function called with each row to print it.
+    page_size : int, optional
+        Number of rows fetched per page. Defaults to ``PAGE_SIZE``.
+
+    Returns
+    -------
+    int
+        Number of rows rendered.
+    """
+    after_id = 0
+    shown = 0
+
+    while True:
+        rows = fetch_page(after_id=after_id, limit=page_size)
+        for row in rows:
+            render(row)
+        shown += len(rows)
+
+        if len(rows) < page_size:
+            return shown
+
+        after_id = rows[-1].id
+        more = input("-- ENTER for more, any other key to stop listing -- ").strip()
+        if more:
+            return shown
+
+
 def helper_select_users(db, allow_multiple=True, exclude_ids=None):
     """
     Prompt the user to select one or more users from the database.
 
-    Displays all users except those listed in ``exclude_ids`` and accepts either
-    a single ID or multiple comma-separated IDs, depending on the value of
-    ``allow_multiple``. Returns a list of selected user IDs, or an empty list if
-    the input is invalid.
+    Works as a typeahead search: any text typed is treated as a prefix of a
+    username or email and the best matches (except those listed in
+    ``exclude_ids``) are shown through :meth:`DBController.search_users`.
+    Once the wanted users are on screen, the operator enters ``#`` followed
+    by either a single ID or multiple comma-separated IDs (``#12,15``),
+    depending on the value of ``allow_multiple``. Returns a list of selected
+    user IDs, or an empty list if the input is invalid.
 
     Parameters
     ----------
     db : Database
-        Database interface used to retrieve all users.
+        Database interface used to search users.
     allow_multiple : bool, optional
         If ``True`` (default), allows selecting multiple users via
         comma-separated input. If ``False``, only a single ID may be selected.
     exclude_ids : set[int], optional
-        A set of user IDs to exclude from the selection list. Defaults to an
+        A set of user IDs to exclude from the search results. Defaults to an
         empty set.
 
     Returns
@@ -26,32 +75,53 @@ def helper_select_users(db, allow_multiple=True, exclude_ids=None):
 
     Notes
     -----
-    - Non-numeric input results in an empty list.
-    - Excluded users are not shown in the selection menu.
+    - Input starting with ``#`` is read as the ID selection; anything else
+      is a new search, so names and emails starting with digits can be
+      searched too.
+    - Pressing ENTER without typing anything selects no users.
+    - Excluded users are not shown in the search results.
     """
     exclude_ids = exclude_ids or set()
 
     print("\n=== Select Users ===")
+    print("Type the start of a username or email to search, then # and the IDs to select.")
+
+    while True:
+        if allow_multiple:
+            text = input("Search, or enter # and user IDs separated by commas (#12,15): ").strip()
+        else:
+            text = input("Search, or enter # and a user ID (#12): ").strip()
+
+        if not text:
+            return []
+
+        if text.startswith("#"):
+            text = text[1:].strip()
+            break
+
+        # Over-fetch so that excluded users do not empty the result list.
+        matches = [
+            u for u in db.search_users(text, limit=SEARCH_LIMIT + len(exclude_ids))
+            if u.id not in exclude_ids
+        ][:SEARCH_LIMIT]
 
-    users = db.get_all_users()
-    for u in users:
-        if u.id not in exclude_ids:
-            print(f"[{u.id}] {u.username}")
+        if not matches:
+            print("No users found.")
+        for u in matches:
+            print(f"[{u.id}] {u.username} ({u.email})")
 
     if allow_multiple:
-        ids_str = input("Enter user IDs separated by commas: ").strip()
         try:
-            selected = [int(x) for x in ids_str.split(",") if x.strip()]
-        except:
+            selected = [int(x) for x in text.split(",") if x.strip()]
+        except ValueError:
             print("Invalid input.")
             return []
 
         return selected
 
     else:
-        uid = input("Enter user ID: ").strip()
-        if uid.isdigit():
-            return [int(uid)]
+        if text.isdigit():
+            return [int(text)]
         else:
             print("Invalid ID.")
             return []
@@ -4,8 +4,10 @@ import time
 import os
 import threading
 from app.handlers._helper import helper_select_users
+from db.changes import bus, Change, INSERT, UPDATE, DELETE
 
 CHATS_FILE = "./vars/dev/chats.xml"
+# Every write goes through write_xml, which publishes a db.changes.Change.
 RELOAD_INTERVAL = 0.5  # seconds
 
 def handle_create_chat(db, logged_user):
@@ -104,64 +106,29 @@ def create_chat_in_xml(name, participants, owner_username):
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     ET.SubElement(chat_elem, "latest_timestamp").text = now
 
-    try:
-        ET.indent(tree, space="  ", level=0)
-    except AttributeError:
-        def indent(elem, level=0):
-            i = "\n" + level*"  "
-            if len(elem):
-                if not elem.text or not elem.text.strip():
-                    elem.text = i + "  "
-                for child in elem:
-                    indent(child, level+1)
-                if not elem.tail or not elem.tail.strip():
-                    elem.tail = i
-            else:
-                if level and (not elem.tail or not elem.tail.strip()):
-                    elem.tail = i
-        indent(tree.getroot())
-
-    tree.write(CHATS_FILE, encoding="utf-8", xml_declaration=True)
-
-    
+    write_xml(tree, Change("chat", chat_id, INSERT, ("name", "owner", "participant", "latest_timestamp")))
 
 
-def write_xml(tree, file_path=CHATS_FILE):
+def write_xml(tree, change, file_path=CHATS_FILE):
     """
-    Write an XML tree to file with indentation.
+    Write an XML tree to file with indentation and announce the change.
 
-    Supports both Python <3.9 (manual indentation) and Python ≥3.9
-    using :func:`xml.etree.ElementTree.indent`.
+    Every chat write goes through here, so subscribers of
+    :data:`db.changes.bus` hear about each one exactly once, after the file
+    is saved.
 
     Parameters
     ----------
     tree : ElementTree
         Parsed XML tree to write.
+    change : Change
+        Change published on :data:`db.changes.bus` once the file is written.
     file_path : str, optional
         Destination path for the XML file. Defaults to ``CHATS_FILE``.
     """
-
-    """Grava o XML com indentação, compatível com Python <3.9 e >=3.9"""
-    try:
-        # Python 3.9+
-        ET.indent(tree, space="  ", level=0)
-    except AttributeError:
-        def indent(elem, level=0):
-            i = "\n" + level*"  "
-            if len(elem):
-                if not elem.text or not elem.text.strip():
-                    elem.text = i + "  "
-                for child in elem:
-                    indent(child, level+1)
-                if not elem.tail or not elem.tail.strip():
-                    elem.tail = i
-            else:
-                if level and (not elem.tail or not elem.tail.strip()):
-                    elem.tail = i
-        indent(tree.getroot())
-
+    ET.indent(tree, space="  ", level=0)
     tree.write(file_path, encoding="utf-8", xml_declaration=True)
-
+    bus.publish(change)
 
 
 def load_user_chats(logged_user):
@@ -404,8 +371,7 @@ def add_message_to_chat(logged_user, chat_id, content):
             else:
                 ET.SubElement(chat, "latest_timestamp").text = timestamp
             
-            ET.indent(tree, space="  ", level=0)
-            tree.write(CHATS_FILE)
+            write_xml(tree, Change("chat_message", chat_id, INSERT, ("sender", "content", "timestamp")))
             return True
     
     return False
@@ -560,8 +526,7 @@ def delete_chat(chat_id):
     
     if chat_to_delete is not None:
         root.remove(chat_to_delete)
-        ET.indent(tree, space="  ", level=0)
-        tree.write(CHATS_FILE)
+        write_xml(tree, Change("chat", chat_id, DELETE))
         return True
     
     return False
@@ -593,8 +558,7 @@ def edit_chat_name(chat_id, new_name):
     for chat in root.findall("chat"):
         if chat.get("id") == chat_id:
             chat.find("name").text = new_name
-            ET.indent(tree, space="  ", level=0)
-            tree.write(CHATS_FILE)
+            write_xml(tree, Change("chat", chat_id, UPDATE, ("name",)))
             return True
     return False
 
@@ -679,8 +643,7 @@ def add_participant_to_chat(chat_id, username):
     for chat in root.findall("chat"):
         if chat.get("id") == chat_id:
             ET.SubElement(chat, "participant").text = username
-            ET.indent(tree, space="  ", level=0)
-            tree.write(CHATS_FILE)
+            write_xml(tree, Change("chat_participant", (chat_id, username), INSERT))
             return True
     return False
 
@@ -713,7 +676,6 @@ def remove_participant_from_chat(chat_id, username):
             for p in chat.findall("participant"):
                 if p.text == username:
                     chat.remove(p)
-                    ET.indent(tree, space="  ", level=0)
-                    tree.write(CHATS_FILE)
+                    write_xml(tree, Change("chat_participant", (chat_id, username), DELETE))
                     return True
     return False
\ No newline at end of file
@@ -4,10 +4,9 @@ def handle_create_group(db, logged_user):
     """
     Create a new user group and optionally add members.
 
-    Prompts the user for a group name, creates the group with the
-    logged-in user as the owner, and allows selecting additional members
-    via :func:`helper_select_users`. Each selected user is then added to
-    the newly created group.
+    Prompts the user for a group name and for additional members via
+    :func:`helper_select_users`, then creates the group with the
+    logged-in user as the owner and adds the selected members.
 
     Parameters
     ----------
@@ -22,25 +21,32 @@ def handle_create_group(db, logged_user):
       is displayed and the operation terminates.
     - The owner is automatically excluded from the selectable member list.
     - Invalid or empty member selection results in no users being added.
+    - Members are chosen before anything is written, so no transaction is
+      held open while waiting for input.
+    - The group and all its members are committed together in one
+      :meth:`DBController.transaction`; if any step fails nothing is kept.
     """
 
     name = input("Group name: ").strip()
-    ok, group_or_msg = db.create_group(name, owner_id=logged_user.id)
-
-    if not ok:
-        print(group_or_msg)
+    member_ids = helper_select_users(db, allow_multiple=True, exclude_ids={logged_user.id}) or []
+
+    try:
+        with db.transaction():
+            ok, group_or_msg = db.create_group(name, owner_id=logged_user.id)
+            if not ok:
+                raise ValueError(group_or_msg)
+
+            for uid in member_ids:
+                ok, msg = db.add_user_to_group(uid, group_or_msg.id)
+                if not ok:
+                    # Leaving the block with an exception rolls the group back too.
+                    raise ValueError(msg)
+    except ValueError as e:
+        print(e)
         return
 
-    group = group_or_msg
-    print(f"\nGroup '{group.group_name}' created with you as owner.\n")
-
-    member_ids = helper_select_users(db, allow_multiple=True, exclude_ids={logged_user.id})
-
-    if not member_ids:
+    print(f"\nGroup '{name}' created with you as owner.\n")
+    if member_ids:
+        print(f"Added {len(member_ids)} members to the group.")
+    else:
         print("No members added.")
-        return
-
-    for uid in member_ids:
-        db.add_user_to_group(uid, group.id)
-
-    print(f"Added {len(member_ids)} members to the group.")
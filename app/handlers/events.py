@@ -1,5 +1,5 @@
-from datetime import datetime
-from app.handlers._helper import helper_select_users
+from datetime import datetime, timedelta
+from app.handlers._helper import helper_select_users, helper_paginate
 
 def handle_create_event(db, logged_user, permissions):
     """
@@ -29,6 +29,11 @@ def handle_create_event(db, logged_user, permissions):
     - If the date format is invalid, no event is created.
     - Attendee selection may return an empty list, which is allowed.
     - Actual creation occurs through :meth:`DBController.create_event`.
+    - Attendees are added with a single statement through
+      :meth:`DBController.add_users_to_event`.
+    - The event and all its attendees are committed together inside
+      :meth:`DBController.transaction`; if either step fails the block is
+      left with an exception, so nothing is committed.
     """
     if not permissions.has_permission(logged_user, "event.create"):
         print("You do not have permission to create events.")
@@ -51,17 +56,21 @@ def handle_create_event(db, logged_user, permissions):
     if attendee_ids is None:
         attendee_ids = []
 
-    ok, event_or_msg = db.create_event(name, description, event_date)
-    if not ok:
-        print("❌ Error creating event:", event_or_msg)
+    try:
+        with db.transaction():
+            ok, event_or_msg = db.create_event(name, description, event_date)
+            if not ok:
+                raise ValueError(event_or_msg)
+
+            ok, added = db.add_users_to_event(event_or_msg.id, attendee_ids)
+            if not ok:
+                # Leaving the block with an exception rolls the event back too.
+                raise ValueError(added)
+    except ValueError as e:
+        print("❌ Error creating event:", e)
         return
 
-    event = event_or_msg
-
-    for uid in attendee_ids:
-        db.add_user_to_event(uid, event.id)
-
-    print(f"✔ Event '{event.event_name}' created with {len(attendee_ids)} attendees.")
+    print(f"✔ Event '{name}' created with {added} attendees.")
 
 
 def handle_edit_event(db, event_id):
@@ -156,12 +165,36 @@ def handle_edit_event(db, event_id):
         else:
             print(f"Update failed: {result}")
 
+def _event_lister(db, fetch_page, shown_ids):
+    """
+    Build a page fetcher and row printer for event listings.
+
+    The fetcher wraps ``fetch_page`` and loads attendee counts for the whole
+    page with one :meth:`DBController.attendee_counts` query. The printer
+    records each event ID in ``shown_ids`` so the caller can validate later
+    selections.
+    """
+    counts = {}
+
+    def fetch(after_id, limit):
+        events = fetch_page(after_id=after_id, limit=limit)
+        counts.clear()
+        counts.update(db.attendee_counts(e.id for e in events))
+        return events
+
+    def render(e):
+        shown_ids.add(e.id)
+        print(f"[{e.id}] {e.event_name} | {e.event_time} | {e.description} | Attendees: {counts[e.id]}")
+
+    return fetch, render
+
+
 def handle_view_my_events(db, logged_user):
     """
     Display all events associated with the logged-in user.
 
     This function shows a list of events the user is attending or owning,
-    along with attendee details. The user may optionally select an event to edit.
+    along with attendee counts. The user may optionally select an event to edit.
 
     Parameters
     ----------
@@ -174,30 +207,23 @@ def handle_view_my_events(db, logged_user):
     Notes
     -----
     - If the user has no events, a message is shown and the function exits.
-    - Each event lists its name, date, description, and attendee list.
+    - Events are listed page by page through :func:`helper_paginate`.
+    - Each event lists its name, date, description, and attendee count.
     - The user may enter an event ID to access :func:`handle_edit_event`.
     - Only events belonging to the user can be edited.
     - Invalid or non-numeric IDs are rejected.
     """
     print("\n=== All Events ===")
 
-    events = db.get_events_from_user(logged_user.id)
+    shown_ids = set()
+    fetch, render = _event_lister(
+        db, lambda **page: db.list_user_events(logged_user.id, **page), shown_ids
+    )
 
-    if not events:
+    if not helper_paginate(fetch, render):
         print("No events exist.")
         return
 
-    for e in events:
-        print(f"\n[{e.id}] {e.event_name} | {e.event_time} | {e.description}")
-        print("Attendees:")
-
-        attendees = db.get_attendees_from_event(e.id)
-        if not attendees:
-            print("  (No attendees)")
-        else:
-            for u in attendees:
-                print(f"  - {u.username} ({u.email})")
-
 
     choice = input("\nEnter the ID of the event to edit, or press ENTER to go back: ").strip()
     if not choice:
@@ -209,13 +235,70 @@ def handle_view_my_events(db, logged_user):
         print("Invalid ID.")
         return
 
-    if event_id not in [e.id for e in events]:
+    if event_id not in shown_ids:
         print("You can only edit your own events.")
         return
 
     handle_edit_event(db, event_id)
 
 
+def handle_view_agenda(db, logged_user):
+    """
+    Display the logged-in user's weekly agenda.
+
+    Shows the events the user attends in the current week (Monday to
+    Sunday), grouped by day, followed by the next upcoming events after
+    that week. The user may move between weeks.
+
+    Parameters
+    ----------
+    db : DBController
+        Database controller used to query events by time range.
+
+    logged_user : User
+        The user whose agenda is displayed.
+
+    Notes
+    -----
+    - Only the displayed week is queried, through
+      :meth:`DBController.list_events_between`, so the size of the user's
+      event history does not affect this screen.
+    - ``N`` shows the next week, ``P`` the previous one, ENTER goes back.
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today - timedelta(days=today.weekday())
+
+    while True:
+        week_end = week_start + timedelta(days=7)
+        print(f"\n=== Agenda: {week_start:%Y-%m-%d} to {week_end - timedelta(days=1):%Y-%m-%d} ===")
+
+        events = db.list_events_between(week_start, week_end, user_id=logged_user.id)
+        if not events:
+            print("No events this week.")
+
+        current_day = None
+        for e in events:
+            day = e.event_time.date()
+            if day != current_day:
+                print(f"\n{day:%A, %Y-%m-%d}")
+                current_day = day
+            print(f"  {e.event_time:%H:%M}  [{e.id}] {e.event_name}")
+
+        upcoming = db.list_upcoming_events(5, user_id=logged_user.id, now=week_end)
+        if upcoming:
+            print("\nLater:")
+            for e in upcoming:
+                print(f"  {e.event_time:%Y-%m-%d %H:%M}  [{e.id}] {e.event_name}")
+
+        choice = input("\n[N] Next week  [P] Previous week  [ENTER] Back: ").strip().upper()
+        if choice == "N":
+            week_start = week_end
+        elif choice == "P":
+            week_start = week_start - timedelta(days=7)
+        else:
+            return
+
+
 def handle_view_all_events(db, logged_user):
     """
     Display every event in the system.
@@ -234,30 +317,21 @@ def handle_view_all_events(db, logged_user):
     Notes
     -----
     - If no events exist, the function exits immediately.
+    - Events are listed page by page through :func:`helper_paginate`.
     - For each event, the list displays name, date/time, description, 
-      and attendees.
+      and attendee count.
     - Selecting an event ID forwards the user to :func:`handle_edit_event`.
     - Invalid IDs or those outside the available list are rejected.
     """
     print("\n=== All Events ===")
 
-    events = db.get_all_events()
+    shown_ids = set()
+    fetch, render = _event_lister(db, db.list_events, shown_ids)
 
-    if not events:
+    if not helper_paginate(fetch, render):
         print("No events exist.")
         return
 
-    for e in events:
-        print(f"\n[{e.id}] {e.event_name} | {e.event_time} | {e.description}")
-        print("Attendees:")
-
-        attendees = db.get_attendees_from_event(e.id)
-        if not attendees:
-            print("  (No attendees)")
-        else:
-            for u in attendees:
-                print(f"  - {u.username} ({u.email})")
-
 
     choice = input("\nEnter the ID of the event to edit, or press ENTER to go back: ").strip()
     if not choice:
@@ -269,7 +343,7 @@ def handle_view_all_events(db, logged_user):
         print("Invalid ID.")
         return
 
-    if event_id not in [e.id for e in events]:
+    if event_id not in shown_ids:
         print("You can only edit your own events.")
         return
 
@@ -3,8 +3,9 @@ def handle_login(auth):
     Handle user login through console input.
 
     This function prompts the user to enter their username and password,
-    then delegates authentication to :meth:`AuthService.login`. The result
-    (either a `User` object or ``None``) is returned to the caller.
+    then delegates authentication to :meth:`AuthService.login`. On success
+    a login session is opened with :meth:`AuthService.create_session` and
+    its token is returned to the caller.
 
     Parameters
     ----------
@@ -13,24 +14,35 @@ def handle_login(auth):
 
     Returns
     -------
-    User or None
-        The authenticated user if login is successful, otherwise ``None``.
+    str or None
+        The session token if login is successful, otherwise ``None``.
 
     Notes
     -----
     - Leading and trailing whitespace is removed from all input fields.
     - Passwords are collected in plain text from console input.
+    - The caller resolves the token to the current user with
+      :meth:`AuthService.authenticate`.
     """
     username = input("Username: ").strip()
     password = input("Password: ").strip()
-    return auth.login(username, password)
+    user = auth.login(username, password)
+    return auth.create_session(user) if user else None
 
-def handle_logout():
+def handle_logout(auth=None, token=None):
     """
     Log out the current user.
 
-    This function displays a logout message and returns ``None`` to signal
-    that no user is currently authenticated.
+    This function ends the login session identified by ``token`` (if
+    any), displays a logout message and returns ``None`` to signal that
+    no user is currently authenticated.
+
+    Parameters
+    ----------
+    auth : AuthService, optional
+        The authentication service that owns the session.
+    token : str, optional
+        Session token returned by :func:`handle_login`.
 
     Returns
     -------
@@ -39,8 +51,10 @@ def handle_logout():
 
     Notes
     -----
-    - This function performs no cleanup beyond user feedback.
+    - The session is deleted, so the token cannot be reused.
     - The calling code should handle state reset if required.
     """
+    if auth is not None and token:
+        auth.end_session(token)
     print("Logging out...")
-    return None
\ No newline at end of file
+    return None
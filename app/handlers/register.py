@@ -1,3 +1,7 @@
+import os
+from app.bulk_import import import_users_csv, importable_roles, print_report
+
+
 def handle_register_user(auth):
     """
     Handle user registration through console input.
@@ -22,4 +26,38 @@ def handle_register_user(auth):
     username = input("Username: ").strip()
     email = input("Email: ").strip()
     password = input("Password: ").strip()
-    auth.register_user(username, email, password)
\ No newline at end of file
+    auth.register_user(username, email, password)
+
+def handle_import_users(db, permissions):
+    """
+    Import user accounts from a CSV file through console input.
+
+    Prompts for the path of a CSV file with ``username``, ``email`` and
+    ``password`` columns (``access_level`` optional) and runs
+    :func:`app.bulk_import.import_users_csv`, then prints the report.
+
+    Parameters
+    ----------
+    db : DBController
+        Database controller used for validation and inserts.
+    permissions : PermissionManager
+        Supplies the roles an imported user may be given.
+
+    Notes
+    -----
+    - Rows that fail validation are listed with their CSV line number;
+      all other rows are imported.
+    - ``access_level`` must be a current role other than ``root``.
+    """
+    print("=== Import Users ===")
+    path = input("CSV file path: ").strip()
+    if not os.path.isfile(path):
+        print("File not found.")
+        return
+
+    try:
+        report = import_users_csv(db, path, access_levels=importable_roles(permissions))
+    except ValueError as e:
+        print(e)
+        return
+    print_report(report)
@@ -1,12 +1,15 @@
 import json
+import os
+
+
 def handle_create_role(permissions, logged_user,ALL_PERMISSIONS,ROLES_JSON_FILE):
     """
     Create a new role and assign permissions to it.
 
     This function allows an authorized user to create a new role by specifying
-    a role name and selecting permissions from a predefined list. The role is
-    then written into a JSON file that stores all existing roles and their
-    respective permissions.
+    a role name, the existing roles it inherits from and the permissions it
+    adds on top of them. The role is then written into a JSON file that
+    stores all existing roles and their respective permissions.
 
     Parameters
     ----------
@@ -22,11 +25,14 @@ def handle_create_role(permissions, logged_user,ALL_PERMISSIONS,ROLES_JSON_FILE)
     Notes
     -----
     - Requires the ``role.create`` permission.
-    - Role names must not be empty.
-    - Permissions are selected via comma-separated numeric indexes.
+    - Role names must not be empty or already exist.
+    - Parent roles and permissions are selected via comma-separated numeric
+      indexes; either list may be empty, but not both.
     - Invalid selections will cause the function to cancel the operation.
     - If the roles file does not exist or is corrupted, a new structure is created.
-    - Writes the updated role list to the JSON file using ``json.dump``.
+    - Writes the updated role list to a temporary file that replaces the
+      roles file atomically, so a concurrent reload never reads half a file.
+    - Calls :meth:`PermissionManager.reload` so the role is usable at once.
     """
     if not permissions.has_permission(logged_user, "role.create"):
         print("You do not have permission to create roles.")
@@ -37,28 +43,31 @@ def handle_create_role(permissions, logged_user,ALL_PERMISSIONS,ROLES_JSON_FILE)
         print("Role name cannot be empty.")
         return
 
-    print("\nSelect permissions for this role (comma-separated numbers):")
-    for idx, perm in enumerate(ALL_PERMISSIONS, start=1):
-        print(f"[{idx}] {perm}")
-
-    selected = input("Your choice: ").strip()
-    if not selected:
-        print("No permissions selected. Role not created.")
+    existing_roles = list(permissions.role_masks)
+    if role_name in existing_roles:
+        print(f"Role '{role_name}' already exists.")
         return
 
-    try:
-        selected_indexes = [int(s) - 1 for s in selected.split(",")]
-    except ValueError:
+    print("\nSelect roles to inherit from (comma-separated numbers, ENTER for none):")
+    for idx, role in enumerate(existing_roles, start=1):
+        print(f"[{idx}] {role}")
+
+    parents = _select(input("Your choice: ").strip(), existing_roles)
+    if parents is None:
         print("Invalid selection.")
         return
 
-    new_perms = []
-    for i in selected_indexes:
-        if 0 <= i < len(ALL_PERMISSIONS):
-            new_perms.append(ALL_PERMISSIONS[i])
+    print("\nSelect additional permissions for this role (comma-separated numbers):")
+    for idx, perm in enumerate(ALL_PERMISSIONS, start=1):
+        print(f"[{idx}] {perm}")
+
+    new_perms = _select(input("Your choice: ").strip(), ALL_PERMISSIONS)
+    if new_perms is None:
+        print("Invalid selection.")
+        return
 
-    if not new_perms:
-        print("No valid permissions selected. Role not created.")
+    if not parents and not new_perms:
+        print("No roles or permissions selected. Role not created.")
         return
 
     try:
@@ -67,12 +76,37 @@ def handle_create_role(permissions, logged_user,ALL_PERMISSIONS,ROLES_JSON_FILE)
     except (FileNotFoundError, json.JSONDecodeError):
         data = {"roles": []}
 
-    data["roles"].append({
-        "name": role_name,
-        "permissions": new_perms
-    })
+    role = {"name": role_name}
+    if parents:
+        role["inherits"] = parents
+    role["permissions"] = new_perms
+    data["roles"].append(role)
 
-    with open(ROLES_JSON_FILE, "w") as f:
+    tmp_path = f"{ROLES_JSON_FILE}.tmp"
+    with open(tmp_path, "w") as f:
         json.dump(data, f, indent=4)
+    os.replace(tmp_path, ROLES_JSON_FILE)
+
+    inherited = f", inheriting from {parents}" if parents else ""
+    print(f"Role '{role_name}' created with permissions: {new_perms}{inherited}")
+
+    try:
+        permissions.reload(force=True)
+    except (OSError, ValueError) as e:
+        print(f"Roles not reloaded: {e}")
+
 
-    print(f"Role '{role_name}' created with permissions: {new_perms}")
\ No newline at end of file
+def _select(selected, options):
+    """
+    Map comma-separated 1-based indexes to ``options``.
+
+    Out-of-range indexes are skipped and duplicates dropped. Returns an
+    empty list for empty input and ``None`` if an index is not a number.
+    """
+    if not selected:
+        return []
+    try:
+        indexes = [int(s) - 1 for s in selected.split(",")]
+    except ValueError:
+        return None
+    return list(dict.fromkeys(options[i] for i in indexes if 0 <= i < len(options)))
@@ -1,9 +1,12 @@
+from app.handlers._helper import helper_paginate
+
+
 def handle_view_all_groups(db, logged_user, permissions):
     """
     Display all groups in the system (admin-level view).
 
     This function lists every group registered in the database, showing its
-    ID, name, owner, and current members. If the user has the required
+    ID, name, owner, and member count. If the user has the required
     permission, they may choose a group ID to open the detailed group
     management menu via :func:`handle_view_group`.
 
@@ -20,6 +23,11 @@ def handle_view_all_groups(db, logged_user, permissions):
     -----
     - Requires the ``group.view_all`` permission.
     - If no groups exist, a message is displayed.
+    - Groups are listed page by page through :func:`helper_paginate`.
+    - Groups come from :meth:`DBController.list_groups`, which joins the
+      owner's username, and member counts from one
+      :meth:`DBController.member_counts` query per page; member lists are
+      never loaded here.
     - Invalid input returns immediately.
     - Uses :func:`handle_view_group` for deeper group management.
     """
@@ -28,17 +36,22 @@ def handle_view_all_groups(db, logged_user, permissions):
         return
 
     print("\n=== All Groups (Admin) ===")
-    groups = db.get_all_groups()
-    if not groups:
+
+    counts = {}
+
+    def fetch_groups(after_id, limit):
+        groups = db.list_groups(after_id=after_id, limit=limit)
+        counts.clear()
+        counts.update(db.member_counts(g.id for g in groups))
+        return groups
+
+    def show(g):
+        print(f"[{g.id}] {g.group_name} | Owner: {g.owner_name or '(No owner)'} | Members: {counts[g.id]}")
+
+    if not helper_paginate(fetch_groups, show):
         print("No groups available.")
         return
 
-    for g in groups:
-        members = db.get_users_from_group(g.id)
-        member_list = ", ".join(u.username for u in members) if members else "(No members)"
-        owner = db.get_user_by_id(g.owner_id).username if g.owner_id else "(No owner)"
-        print(f"[{g.id}] {g.group_name} | Owner: {owner} | Members: {member_list}")
-
     choice = input("\nEnter the ID of the group to manage, or press ENTER to go back: ").strip()
     if not choice:
         return
@@ -86,13 +99,12 @@ def handle_view_group(db, group_id, logged_user=None,permissions=None):
         return
 
     print(f"\n=== Group: {group.group_name} ===")
-    users = db.get_users_from_group(group_id)
-    if not users:
+    print("Members:")
+    if not helper_paginate(
+        lambda **page: db.list_group_members(group_id, **page),
+        lambda u: print(f" - [{u.id}] {u.username} ({u.email})")
+    ):
         print("(No members)")
-    else:
-        print("Members:")
-        for u in users:
-            print(f" - [{u.id}] {u.username} ({u.email})")
 
     is_owner = logged_user and group.owner_id == logged_user.id
 
@@ -123,10 +135,8 @@ def handle_manage_my_groups(db, logged_user):
     """
     Display all groups the logged user belongs to (owner or member).
 
-    The function aggregates:
-    - groups created by the user,
-    - groups where the user is a member,
-    removing duplicates.
+    Groups created by the user and groups where the user is a member are
+    fetched together, each once, by :meth:`DBController.list_user_groups`.
 
     The user may choose a group ID to open the detailed view using
     :func:`handle_view_group`.
@@ -141,26 +151,22 @@ def handle_manage_my_groups(db, logged_user):
     Notes
     -----
     - If the user is not part of any group, the function returns immediately.
+    - Member counts are fetched with one :meth:`DBController.member_counts` query.
     - Validates group selection input.
     - Delegates deeper management to :func:`handle_view_group`.
     """
     print("\n=== My Groups ===")
-    groups_owner = db.get_groups_by_owner(logged_user.id)
-    groups_member = db.get_groups_by_member(logged_user.id)
-
-    groups_dict = {g.id: g for g in groups_owner + groups_member}
-    groups = list(groups_dict.values())
+    groups = db.list_user_groups(logged_user.id)
 
     if not groups:
         print("You are not part of any groups.")
         return
 
+    counts = db.member_counts(g.id for g in groups)
     for g in groups:
-        members = db.get_users_from_group(g.id)
-        member_list = ", ".join(u.username for u in members) if members else "(No members)"
-        owner = db.get_user_by_id(g.owner_id).username if g.owner_id else "(No owner)"
         role = "Owner" if g.owner_id == logged_user.id else "Member"
-        print(f"[{g.id}] {g.group_name} | Owner: {owner} | Members: {member_list} | Your role: {role}")
+        print(f"[{g.id}] {g.group_name} | Owner: {g.owner_name or '(No owner)'} "
+              f"| Members: {counts[g.id]} | Your role: {role}")
 
     choice = input("\nEnter the ID of the group to manage, or press ENTER to go back: ").strip()
     if not choice:
@@ -187,8 +193,8 @@ def handle_edit_group(db, group_id):
 
     Notes
     -----
-    - The new name must not be empty.
-    - Automatically commits the change to the database.
+    - The new name must not be empty or already used by another group.
+    - Saved through :meth:`DBController.update_group_name`.
     - If the group does not exist, the function returns immediately.
     """
     group = db.get_group_by_id(group_id)
@@ -203,8 +209,10 @@ def handle_edit_group(db, group_id):
         print("Group name cannot be empty.")
         return
 
-    group.group_name = new_name
-    db.session.commit()
+    ok, result = db.update_group_name(group_id, new_name)
+    if not ok:
+        print(result)
+        return
     print("Group name updated.")
 
 def handle_manage_group_members(db, group_id):
@@ -224,7 +232,7 @@ def handle_manage_group_members(db, group_id):
 
     Notes
     -----
-    - Displays current members and all users.
+    - Displays current members and all users, page by page.
     - Marks existing members with ``*``.
     - Input is validated before performing operations.
     - Uses:
@@ -238,22 +246,34 @@ def handle_manage_group_members(db, group_id):
 
     print(f"\n=== Manage Members for Group: {group.group_name} ===")
 
-    current_members = db.get_users_from_group(group_id)
-    current_ids = {u.id for u in current_members}
-
     print("\nCurrent members:")
-    if not current_members:
+    if not helper_paginate(
+        lambda **page: db.list_group_members(group_id, **page),
+        lambda u: print(f" - [{u.id}] {u.username}")
+    ):
         print("  (No members)")
-    else:
-        for u in current_members:
-            print(f" - [{u.id}] {u.username}")
 
-    print("\nAll users:")
-    users = db.get_all_users()
-    for u in users:
-        mark = "*" if u.id in current_ids else " "
+    member_ids = set()
+
+    def fetch_users(after_id, limit):
+        # Members of the listed range are, at most, the next ``limit`` members
+        # after ``after_id``, so one extra page query marks the whole page.
+        users = db.list_users(after_id=after_id, limit=limit)
+        member_ids.clear()
+        if users:
+            member_ids.update(
+                u.id for u in db.list_group_members(group_id, after_id=after_id, limit=limit)
+                if u.id <= users[-1].id
+            )
+        return users
+
+    def show(u):
+        mark = "*" if u.id in member_ids else " "
         print(f"{mark} [{u.id}] {u.username}")
 
+    print("\nAll users:")
+    helper_paginate(fetch_users, show)
+
     print("\n[1] Add user to group")
     print("[2] Remove user from group")
     print("[9] Back")
@@ -1,4 +1,5 @@
 from app.handlers.edit_users import handle_edit_user
+from app.handlers._helper import helper_paginate
 def handle_view_all_users(db, auth, permissions, logged_user):
     """
     Display all users and optionally allow editing a selected user.
@@ -25,11 +26,14 @@ def handle_view_all_users(db, auth, permissions, logged_user):
     - If the user does not have permission, only the list is displayed.
     - If input is empty or invalid, the function returns without editing.
     - Editing is delegated to :func:`app.handlers.edit_users.handle_edit_user`.
+    - Users are listed page by page through :func:`helper_paginate`, as
+      :class:`db.views.UserView` snapshots from :meth:`DBController.list_users`.
     """
     print("\n=== Users ===")
-    users = db.get_all_users()
-    for u in users:
-        print(f"[{u.id}] {u.username} | {u.email} | {u.access_level}")
+    helper_paginate(
+        db.list_users,
+        lambda u: print(f"[{u.id}] {u.username} | {u.email} | {u.access_level}")
+    )
 
     if permissions.has_permission(logged_user, "user.edit_all"):
         choice = input("\nEnter the ID of the user you want to edit, or press ENTER to go back: ").strip()
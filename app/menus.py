@@ -21,21 +21,20 @@ from datetime import datetime
 from math import perm
 from app.handlers.chats import chat_selection_loop, handle_create_chat
 from app.handlers.login import handle_login, handle_logout
-from app.handlers.register import handle_register_user
+from app.handlers.register import handle_register_user, handle_import_users
 from app.handlers.view_users import handle_view_all_users
 from app.handlers.create_group import handle_create_group
 from app.handlers.view_group import handle_view_all_groups, handle_manage_my_groups, handle_view_group, handle_edit_group, handle_manage_group_members
 from app.handlers.roles import handle_create_role
-from app.handlers.events import handle_create_event, handle_view_my_events, handle_view_all_events, handle_edit_event
+from app.handlers.events import handle_create_event, handle_view_my_events, handle_view_all_events, handle_edit_event, handle_view_agenda
 from app.handlers.check_user import handle_view_profile
+from db.config import get_config
+from db.instrumentation import profiler
 import os
-import json
 import inspect
 
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-with open(os.path.join(BASE_DIR, "vars/dev/vars.json")) as file:
-    config_data = json.load(file)
+config_data = get_config()
 ALL_PERMISSIONS = config_data["ALL_PERMISSIONS"]
 ROLES_JSON_FILE = config_data["ROLES_JSON_FILE"]
 
@@ -60,9 +59,6 @@ def build_dynamic_menu_from_features(logged_user, permissions):
     list[tuple]
         List of tuples in the form ``(function_name, label, permission)``.
     """
-    with open("./vars/dev/vars.json", "r") as file:
-        config_data = json.load(file)
-
     implemented_features = config_data["IMPLEMENTED_FEATURES"]
 
     menu = []
@@ -94,27 +90,26 @@ def build_submenu(group, logged_user, permissions):
     logged_user : object
         The currently authenticated user.
     permissions : object
-        Permission manager used to verify access.
+        Permission manager used to verify access. The user's permission
+        mask is computed once and each entry is a single bit test.
 
     Returns
     -------
     list[tuple]
         Submenu entries, each a tuple ``(function_name, label, permission)``.
     """
-    with open("./vars/dev/vars.json", "r") as file:
-        config_data = json.load(file)
-
     implemented_features = config_data["IMPLEMENTED_FEATURES"]
     group_features = implemented_features.get(group, {})
 
     submenu = []
     add = submenu.append
+    granted = permissions.permissions_for(logged_user)
 
     for function, frontend_name in group_features.items():
 
         permission = config_data["PERMISSION_MAP"].get(function)
 
-        if permission is None or permissions.has_permission(logged_user, permission):
+        if permission is None or permissions.allows(granted, permission):
             add((function, frontend_name, permission))
 
     add(("back", "Back", None))
@@ -145,7 +140,10 @@ def menu_loop(auth, db, permissions):
 
     Displays the top-level menu, handles user input, navigates through
     submenus, and dispatches handler functions with appropriate
-    arguments. Login/logout updates the session state.
+    arguments. Login opens a session and only its token is kept; the
+    current user is resolved from it on every iteration through
+    :meth:`AuthService.authenticate` (a cache lookup), so role changes
+    and expiry take effect without logging in again.
 
     Parameters
     ----------
@@ -156,10 +154,14 @@ def menu_loop(auth, db, permissions):
     permissions : object
         Permission manager controlling user access.
     """
-    logged_user = None
+    token = None
 
     while True:
         os.system("cls")
+        logged_user = auth.authenticate(token) if token else None
+        if token and logged_user is None:
+            print("Your session has expired. Please log in again.")
+            token = None
         menu = build_dynamic_menu_from_features(logged_user, permissions)
         print_menu(menu, title="MAIN MENU")
 
@@ -176,17 +178,20 @@ def menu_loop(auth, db, permissions):
         selected_function, label, _ = menu[choice_idx]
 
         if selected_function == "handle_login":
-            logged_user = handle_login(auth)
+            token = handle_login(auth)
             continue
         elif selected_function == "handle_logout":
-            logged_user = handle_logout()
+            token = handle_logout(auth, token)
             continue
         elif selected_function == "exit":
+            if token:
+                auth.end_session(token)
             print("Exiting...")
             return
 
         if selected_function in config_data["IMPLEMENTED_FEATURES"]:
             while True:
+                logged_user = auth.authenticate(token) if token else None
                 submenu = build_submenu(selected_function, logged_user, permissions)
                 print_menu(submenu, title=f"{label.upper()} MENU")
 
@@ -204,6 +209,9 @@ def menu_loop(auth, db, permissions):
 
                 if sub_function == "back":
                     break
+                elif sub_function == "handle_logout":
+                    token = handle_logout(auth, token)
+                    break
                 elif sub_function in globals():
                     call_handler(
                         globals()[sub_function],
@@ -221,7 +229,9 @@ def call_handler(func, **possible_args):
     Call a handler function by passing only the parameters it accepts.
 
     Uses :mod:`inspect` to match keyword arguments from ``possible_args``
-    to the function’s signature.
+    to the function’s signature. The call runs inside
+    :meth:`QueryProfiler.profile`, so every SQL statement it issues is
+    counted and summarised per handler (see :mod:`db.instrumentation`).
 
     Parameters
     ----------
@@ -241,4 +251,5 @@ def call_handler(func, **possible_args):
         name: value for name, value in possible_args.items()
         if name in sig.parameters
     }
-    return func(**accepted)
+    with profiler.profile(func.__name__):
+        return func(**accepted)
@@ -9,12 +9,139 @@ corresponding to one of these roles.
 
 Main features:
 - Load role-to-permission mappings from a JSON configuration file.
-- Quickly check whether a user has a specific permission.
+- Every permission of ``ALL_PERMISSIONS`` (``vars/dev/vars.json``) gets
+  one bit; each role is compiled once into an integer mask.
+- Wildcard grants: ``"*"`` grants every permission and ``"group.*"`` (or
+  any name ending in ``*``) every permission with that prefix. They are
+  expanded at load time, so checks never match patterns.
+- Roles may list parent roles in ``"inherits"``. The transitive closure
+  is computed at load time (cycles and unknown parents are rejected), so
+  an inherited permission costs nothing at check time.
+- Checking a permission is a single ``AND`` of two integers.
+- The roles file is reloaded when its modification time changes (checked
+  at most every ``ROLES_RELOAD_SECONDS``) or on :meth:`PermissionManager.reload`.
+  A new file is fully parsed and validated before the compiled table is
+  swapped in with one assignment, so a check sees either the old table or
+  the new one, never a mix; an invalid file keeps the old table.
 - Simple integration with authentication and menu subsystems.
 """
 
 import json
 import os
+import time
+
+from db.config import get_config
+
+RELOAD_INTERVAL = get_config().get("ROLES_RELOAD_SECONDS", 2.0)
+
+
+def build_registry(all_permissions) -> dict:
+    """
+    Assign one bit to each permission name.
+
+    Parameters
+    ----------
+    all_permissions : iterable of str
+        Known permission names, in a stable order. Duplicates are ignored.
+
+    Returns
+    -------
+    dict
+        Mapping of permission name to its bit (``1 << index``).
+    """
+    return {name: 1 << index for index, name in enumerate(dict.fromkeys(all_permissions))}
+
+
+def compile_grants(grants, registry: dict) -> int:
+    """
+    Compile a list of granted permission names and patterns into a mask.
+
+    Parameters
+    ----------
+    grants : iterable of str
+        Permission names, ``"*"``, or prefixes ending in ``*``.
+    registry : dict
+        Result of :func:`build_registry`.
+
+    Returns
+    -------
+    int
+        Bitwise OR of every granted permission.
+
+    Raises
+    ------
+    ValueError
+        If a name is not registered or a pattern matches no permission.
+    """
+    mask = 0
+    for grant in grants:
+        if grant.endswith("*"):
+            prefix = grant[:-1]
+            matched = [bit for name, bit in registry.items() if name.startswith(prefix)]
+            if not matched:
+                raise ValueError(f"Permission pattern matches nothing: {grant!r}")
+            for bit in matched:
+                mask |= bit
+        elif grant in registry:
+            mask |= registry[grant]
+        else:
+            raise ValueError(f"Unknown permission: {grant!r}")
+    return mask
+
+
+def resolve_inheritance(direct: dict, parents: dict) -> dict:
+    """
+    Fold every role's ancestors into its mask.
+
+    Each role is resolved once, after its parents, with an iterative
+    depth-first walk, so the cost is linear in roles plus ``inherits``
+    links and deep chains cannot hit the recursion limit.
+
+    Parameters
+    ----------
+    direct : dict
+        Role name to the mask of its own grants.
+    parents : dict
+        Role name to the list of role names it inherits from.
+
+    Returns
+    -------
+    dict
+        Role name to the mask of its own and all inherited grants, in the
+        order of ``direct``.
+
+    Raises
+    ------
+    ValueError
+        If a role inherits an unknown role or inheritance forms a cycle.
+    """
+    resolved = {}
+    for start in direct:
+        if start in resolved:
+            continue
+        path, on_path = [start], {start}
+        stack = [(start, iter(parents[start]))]
+        while stack:
+            name, pending = stack[-1]
+            for parent in pending:
+                if parent not in direct:
+                    raise ValueError(f"Role {name!r} inherits unknown role {parent!r}")
+                if parent in on_path:
+                    cycle = path[path.index(parent):] + [parent]
+                    raise ValueError(f"Role inheritance cycle: {' -> '.join(cycle)}")
+                if parent not in resolved:
+                    path.append(parent)
+                    on_path.add(parent)
+                    stack.append((parent, iter(parents[parent])))
+                    break
+            else:
+                stack.pop()
+                on_path.discard(path.pop())
+                mask = direct[name]
+                for parent in parents[name]:
+                    mask |= resolved[parent]
+                resolved[name] = mask
+    return {name: resolved[name] for name in direct}
 
 
 class PermissionManager:
@@ -22,18 +149,19 @@ class PermissionManager:
     Manage user role permissions loaded from a JSON file.
 
     The JSON structure is expected to contain a top-level `"roles"`
-    key, with each role defining a `"name"` and a list of `"permissions"`.
-    Example::
+    key, with each role defining a `"name"`, a list of `"permissions"`
+    and, optionally, a list of roles it `"inherits"` from. Example::
 
         {
             "roles": [
-                { "name": "user", "permissions": ["view_profile"] },
-                { "name": "admin", "permissions": ["edit_users", "delete_users"] }
+                { "name": "user", "permissions": ["user.view", "group.view"] },
+                { "name": "admin", "inherits": ["user"], "permissions": ["user.*", "group.*"] }
             ]
         }
     """
 
-    def __init__(self, json_path="roles.json"):
+    def __init__(self, json_path="roles.json", all_permissions=None,
+                 reload_interval: float = RELOAD_INTERVAL):
         """
         Initialize the permission manager and load role definitions.
 
@@ -41,25 +169,155 @@ class PermissionManager:
         ----------
         json_path : str, optional
             Path to the roles JSON file. Defaults to ``"roles.json"``.
+        all_permissions : list of str, optional
+            Permission registry. Defaults to ``ALL_PERMISSIONS`` from
+            ``vars/dev/vars.json``.
+        reload_interval : float or None, optional
+            Minimum seconds between two modification-time checks of the
+            roles file. ``None`` disables automatic reloading.
 
         Raises
         ------
         FileNotFoundError
             If the roles file does not exist.
         ValueError
-            If the JSON structure is missing the required ``roles`` field.
+            If the JSON structure is missing the required ``roles`` field,
+            a role grants an unknown permission, or role inheritance
+            refers to an unknown role or forms a cycle.
         """
         if not os.path.exists(json_path):
             raise FileNotFoundError(f"Permission file not found: {json_path}")
 
-        with open(json_path, "r", encoding="utf-8") as f:
+        if all_permissions is None:
+            all_permissions = get_config()["ALL_PERMISSIONS"]
+
+        self.json_path = json_path
+        self.reload_interval = reload_interval
+        self.last_error = None
+        self._signature = None
+        self._next_check = 0.0
+
+        # Map: permission -> bit, role_name -> mask. The registry never
+        # changes; ``role_masks`` is replaced as a whole on reload.
+        self.registry = build_registry(all_permissions)
+        self.role_masks = {}
+        self.reload(force=True)
+
+    def _compile(self) -> dict:
+        with open(self.json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
         if "roles" not in data:
             raise ValueError("Invalid roles file: missing 'roles' key.")
 
-        # Map: role_name -> set(permissions)
-        self.roles = {role["name"]: set(role["permissions"]) for role in data["roles"]}
+        direct, parents = {}, {}
+        for role in data["roles"]:
+            if not isinstance(role, dict) or not isinstance(role.get("name"), str) \
+                    or not isinstance(role.get("permissions"), list) \
+                    or not isinstance(role.get("inherits", []), list):
+                raise ValueError(f"Invalid role entry: {role!r}")
+            direct[role["name"]] = compile_grants(role["permissions"], self.registry)
+            parents[role["name"]] = role.get("inherits", [])
+        return resolve_inheritance(direct, parents)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Reload the roles file if it changed since the last load.
+
+        The file is parsed and every role compiled before the table is
+        swapped, so on error the current roles stay in effect.
+
+        Parameters
+        ----------
+        force : bool, optional
+            Reload even if the modification time and size are unchanged.
+
+        Returns
+        -------
+        bool
+            ``True`` if a new table was swapped in.
+
+        Raises
+        ------
+        OSError
+            If the file cannot be read.
+        ValueError
+            If the file is not valid JSON, has no ``roles`` key, grants an
+            unknown permission or has invalid inheritance.
+        """
+        stat = os.stat(self.json_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if not force and signature == self._signature:
+            return False
+        role_masks = self._compile()
+        self.role_masks = role_masks
+        self._signature = signature
+        self.last_error = None
+        return True
+
+    def _check_reload(self):
+        if self.reload_interval is None:
+            return
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.reload_interval
+        try:
+            self.reload()
+        except (OSError, ValueError) as error:
+            # A file caught mid-write fails here and is retried next time.
+            if str(error) != str(self.last_error):
+                print(f"Roles file not reloaded: {error}")
+            self.last_error = error
+
+    @property
+    def roles(self) -> dict:
+        """
+        Map of role name to the set of permission names it grants,
+        with wildcards expanded.
+        """
+        return {name: set(self.names(mask)) for name, mask in self.role_masks.items()}
+
+    def bit(self, permission: str) -> int:
+        """
+        Return the bit of ``permission``, or ``0`` if it is not registered
+        (so nobody holds it).
+        """
+        return self.registry.get(permission, 0)
+
+    def names(self, mask: int) -> list:
+        """
+        Return the permission names set in ``mask``, in registry order.
+        """
+        return [name for name, bit in self.registry.items() if mask & bit]
+
+    def permissions_for(self, user) -> int:
+        """
+        Return the permission mask of a user.
+
+        Compute it once per login (or menu redraw) and test entries with
+        :meth:`allows` to skip the role lookup on every check.
+
+        Parameters
+        ----------
+        user : object or None
+            A user object expected to have an ``access_level`` attribute.
+
+        Returns
+        -------
+        int
+            Mask of the user's role; ``0`` for ``None`` or an unknown role.
+        """
+        if user is None:
+            return 0
+        self._check_reload()
+        return self.role_masks.get(user.access_level, 0)
+
+    def allows(self, mask: int, permission: str) -> bool:
+        """
+        Check a permission against a mask from :meth:`permissions_for`.
+        """
+        return bool(mask & self.registry.get(permission, 0))
 
     def has_permission(self, user, permission: str) -> bool:
         """
@@ -78,12 +336,4 @@ class PermissionManager:
         bool
             ``True`` if the user has the given permission, otherwise ``False``.
         """
-        if user is None:
-            return False
-
-        role = user.access_level
-
-        if role not in self.roles:
-            return False
-
-        return permission in self.roles[role]
+        return self.allows(self.permissions_for(user), permission)
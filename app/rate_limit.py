@@ -0,0 +1,138 @@
+"""
+Rate Limiting
+=============
+
+In-memory token buckets used to throttle login attempts before any
+database query or password hash is spent on them.
+
+Each key (a username, a client address...) owns a bucket holding up to
+``capacity`` tokens that refills at ``refill_per_second``. An attempt
+takes one token and is rejected when the bucket is empty. Buckets live
+in an :class:`db.cache.LRUCache`, so checking a key is O(1) and a flood
+of distinct keys only evicts the least recently seen buckets instead of
+growing memory. An evicted bucket starts full again, which is harmless
+for keys that have not been seen for a while.
+
+Login thresholds live in ``vars/dev/vars.json`` under ``LOGIN_THROTTLE``::
+
+    "LOGIN_THROTTLE": {
+        "enabled": true,
+        "max_keys": 10000,
+        "username": {"capacity": 5, "refill_per_second": 0.1},
+        "source": {"capacity": 20, "refill_per_second": 1.0}
+    }
+"""
+
+import time
+
+from db.cache import LRUCache, MISSING
+from db.config import get_config
+
+LOGIN_THROTTLE = get_config().get("LOGIN_THROTTLE", {})
+
+
+class TokenBucketLimiter:
+    """
+    Token bucket per key, with counters for allowed and rejected attempts.
+
+    Not thread-safe; like the caches of :mod:`db.cache`, each service owns
+    its own instance.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float,
+                 max_keys: int = 10000, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+        capacity : float
+            Largest burst of attempts allowed for one key.
+        refill_per_second : float
+            Tokens given back to each bucket per second.
+        max_keys : int, optional
+            Maximum number of buckets kept. Defaults to ``10000``.
+        clock : callable, optional
+            Returns the current time in seconds. Defaults to
+            :func:`time.monotonic`.
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.allowed = 0
+        self.rejected = 0
+        self._buckets = LRUCache(max_keys)
+        self._clock = clock
+
+    def allow(self, key) -> bool:
+        """
+        Take one token from the bucket of ``key``.
+
+        Returns
+        -------
+        bool
+            ``True`` if the attempt may proceed, ``False`` if the bucket
+            is empty.
+        """
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is MISSING:
+            bucket = [self.capacity, now]
+            self._buckets.put(key, bucket)
+        else:
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_per_second)
+            bucket[1] = now
+
+        if bucket[0] < 1:
+            self.rejected += 1
+            return False
+        bucket[0] -= 1
+        self.allowed += 1
+        return True
+
+    def retry_after(self, key) -> float:
+        """
+        Return the seconds until ``key`` gets its next token (``0`` if it has one).
+        """
+        bucket = self._buckets.get(key)
+        if bucket is MISSING:
+            return 0.0
+        tokens = bucket[0] + (self._clock() - bucket[1]) * self.refill_per_second
+        if tokens >= 1:
+            return 0.0
+        return (1 - tokens) / self.refill_per_second if self.refill_per_second else float("inf")
+
+    def reset(self, key):
+        """
+        Forget the bucket of ``key``, giving it a full burst again.
+        """
+        self._buckets.invalidate(key)
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the limiter counters.
+
+        :returns: ``{"allowed", "rejected", "keys", "max_keys"}``.
+        """
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "keys": len(self._buckets),
+            "max_keys": self._buckets.maxsize,
+        }
+
+
+def login_limiters(config: dict = LOGIN_THROTTLE):
+    """
+    Build the username and source limiters described by ``config``.
+
+    Returns
+    -------
+    tuple
+        ``(by_username, by_source)``, or ``(None, None)`` when throttling
+        is disabled.
+    """
+    if not config.get("enabled", True):
+        return None, None
+    max_keys = config.get("max_keys", 10000)
+    username = {"capacity": 5, "refill_per_second": 0.1, **config.get("username", {})}
+    source = {"capacity": 20, "refill_per_second": 1.0, **config.get("source", {})}
+    return (TokenBucketLimiter(max_keys=max_keys, **username),
+            TokenBucketLimiter(max_keys=max_keys, **source))
@@ -0,0 +1,7 @@
+"""
+Benchmarks for the data layer.
+
+Each module in this package is runnable with ``python -m benchmarks.<name>``
+from the project root and works against throw-away SQLite files, never
+against ``db/app.db``.
+"""
@@ -0,0 +1,68 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import os
+import tempfile
+import time
+
+from db.engine import ensure_schema
+from db.pragmas import install_pragmas
+
+
+def temp_db_url(name: str) -> str:
+    """
+    Return a SQLite URL for a fresh file in the system temp directory.
+
+    Any previous file (and its WAL/SHM companions) with the same name is
+    removed first.
+    """
+    path = os.path.join(tempfile.gettempdir(), f"tp1_bench_{name}.db")
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return f"sqlite:///{path}"
+
+
+def make_session_factory(url: str, profile: str = None):
+    """
+    Create an engine for ``url`` with a pragma profile and empty schema.
+
+    Returns
+    -------
+    tuple
+        ``(engine, sessionmaker)``.
+    """
+    engine = create_engine(url, echo=False)
+    install_pragmas(engine, profile)
+    ensure_schema(engine)
+    return engine, sessionmaker(bind=engine)
+
+
+def timed(func, *args, **kwargs):
+    """
+    Run ``func`` once and return ``(result, elapsed_seconds)``.
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def make_async_session_factory(url: str, profile: str = None):
+    """
+    Create an ``aiosqlite`` engine for the SQLite ``url``.
+
+    The schema must already exist (see :func:`make_session_factory`).
+
+    Returns
+    -------
+    tuple
+        ``(async_engine, async_sessionmaker)``.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1), echo=False)
+    install_pragmas(engine.sync_engine, profile)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
@@ -0,0 +1,128 @@
+"""
+Compare sync and async DBController throughput on a mixed workload.
+
+Each worker performs ``--ops`` operations: mostly user/event lookups with
+a share of writes (new users and events). The sync variant runs workers
+on threads with one :class:`DBController` each; the async variant runs
+them as asyncio tasks with one :class:`AsyncDBController` each. Usage::
+
+    python -m benchmarks.async_throughput --workers 8 --ops 500 --write-ratio 0.2
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import argparse
+import asyncio
+import random
+import time
+
+from db.db_controller import DBController
+from db.async_db_controller import AsyncDBController
+from benchmarks._common import temp_db_url, make_session_factory, make_async_session_factory
+
+SEED_USERS = 1000
+
+
+def plan(worker: int, ops: int, write_ratio: float):
+    """
+    Return a deterministic list of ``(kind, arg)`` operations for a worker.
+    """
+    rng = random.Random(worker)
+    steps = []
+    for i in range(ops):
+        if rng.random() < write_ratio:
+            kind = rng.choice(("add_user", "create_event"))
+            steps.append((kind, f"w{worker}_{i}"))
+        else:
+            steps.append((rng.choice(("get_user_by_id", "get_users_page")), rng.randint(1, SEED_USERS)))
+    return steps
+
+
+def run_sync_step(db, kind, arg):
+    if kind == "add_user":
+        db.add_user(arg, f"{arg}@example.com", "x")
+    elif kind == "create_event":
+        db.create_event(arg, "bench", datetime.now())
+    elif kind == "get_user_by_id":
+        db.get_user_by_id(arg)
+    else:
+        db.get_users_page(after_id=arg, limit=20)
+
+
+async def run_async_step(db, kind, arg):
+    if kind == "add_user":
+        await db.add_user(arg, f"{arg}@example.com", "x")
+    elif kind == "create_event":
+        await db.create_event(arg, "bench", datetime.now())
+    elif kind == "get_user_by_id":
+        await db.get_user_by_id(arg)
+    else:
+        await db.get_users_page(after_id=arg, limit=20)
+
+
+def bench_sync(Session, plans):
+    def worker(steps):
+        db = DBController(session_factory=Session, user_cache_size=0)
+        for kind, arg in steps:
+            run_sync_step(db, kind, arg)
+        db.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(plans)) as pool:
+        list(pool.map(worker, plans))
+    return time.perf_counter() - start
+
+
+async def bench_async(AsyncSession, plans):
+    async def worker(steps):
+        db = AsyncDBController(session_factory=AsyncSession, user_cache_size=0)
+        for kind, arg in steps:
+            await run_async_step(db, kind, arg)
+        await db.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(steps) for steps in plans))
+    return time.perf_counter() - start
+
+
+def seed(Session):
+    db = DBController(session_factory=Session)
+    for i in range(SEED_USERS):
+        db.add_user(f"seed{i}", f"seed{i}@example.com", "x")
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=300)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--profile", default=None)
+    args = parser.parse_args()
+
+    total = args.workers * args.ops
+    results = {}
+
+    for mode in ("sync", "async"):
+        url = temp_db_url(f"async_{mode}")
+        engine, Session = make_session_factory(url, args.profile)
+        seed(Session)
+        plans = [plan(w, args.ops, args.write_ratio) for w in range(args.workers)]
+
+        if mode == "sync":
+            elapsed = bench_sync(Session, plans)
+        else:
+            async_engine, AsyncSession = make_async_session_factory(url, args.profile)
+            elapsed = asyncio.run(bench_async(AsyncSession, plans))
+            asyncio.run(async_engine.dispose())
+        engine.dispose()
+        results[mode] = total / elapsed
+
+    print(f"{'mode':<6} {'ops/s':>10}  ({args.workers} workers x {args.ops} ops, "
+          f"{args.write_ratio:.0%} writes)")
+    for mode, ops_s in results.items():
+        print(f"{mode:<6} {ops_s:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measure per-call overhead of the controller's point lookups.
+
+Compares the legacy ``session.query(...).filter_by(...).first()`` form,
+which builds a new ORM query on every call, with the pre-built
+``select()`` statements used by :class:`DBController`. The user cache is
+disabled so every call reaches the database, and all rows stay in the
+session's identity map, so the numbers are dominated by statement
+construction, compilation-cache lookup and result handling rather than
+I/O. Usage::
+
+    python -m benchmarks.lookups --rows 500 --rounds 5
+"""
+
+import argparse
+from datetime import datetime
+
+from db.db_controller import DBController
+from db.schema import User, Group, Event, UsersInGroups
+from benchmarks._common import temp_db_url, make_session_factory, timed
+
+
+def seed(db: DBController, rows: int):
+    """
+    Insert ``rows`` users, groups and events, each user a member of one group.
+    """
+    with db.transaction():
+        for i in range(rows):
+            ok, user = db.add_user(f"user{i}", f"user{i}@example.com", "x")
+            ok, group = db.create_group(f"group{i}", owner_id=user.id)
+            db.session.add(UsersInGroups(user_id=user.id, group_id=group.id))
+            db.create_event(f"event{i}", "", datetime.now())
+
+
+def legacy_lookups(session, ids):
+    """
+    The lookups as they were written before the statements were pre-built.
+    """
+    for i in ids:
+        session.query(User).filter_by(id=i).first()
+        session.query(User).filter_by(username=f"user{i - 1}").first()
+        session.query(Group).filter_by(id=i).first()
+        session.query(Event).filter_by(id=i).first()
+        session.query(UsersInGroups).filter_by(user_id=i, group_id=i).first()
+
+
+def prebuilt_lookups(db: DBController, ids):
+    """
+    The same lookups through the controller's pre-built statements.
+    """
+    for i in ids:
+        db.get_user_by_id(i)
+        db.get_user_by_username(f"user{i - 1}")
+        db.get_group_by_id(i)
+        db.get_event_by_id(i)
+        db.is_member(i, i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine, Session = make_session_factory(temp_db_url("lookups"))
+    db = DBController(session_factory=Session, user_cache_size=0)
+    seed(db, args.rows)
+    ids = range(1, args.rows + 1)
+    calls = 5 * args.rows
+
+    # Warm up both paths so the compiled-SQL cache and identity map are full.
+    legacy_lookups(db.session, ids)
+    prebuilt_lookups(db, ids)
+
+    legacy = min(timed(legacy_lookups, db.session, ids)[1] for _ in range(args.rounds))
+    prebuilt = min(timed(prebuilt_lookups, db, ids)[1] for _ in range(args.rounds))
+
+    print(f"{'path':<10} {'us/call':>10}")
+    print(f"{'legacy':<10} {legacy / calls * 1e6:>10.1f}")
+    print(f"{'prebuilt':<10} {prebuilt / calls * 1e6:>10.1f}")
+    print(f"speedup: {legacy / prebuilt:.2f}x")
+
+    db.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
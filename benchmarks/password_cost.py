@@ -0,0 +1,110 @@
+"""
+Pick the password hashing cost for a target login latency.
+
+For scrypt, ``n`` is doubled from ``2**10`` and each setting is timed
+with :func:`db.passwords.verify_password`; the largest ``n`` whose median
+stays within ``--target-ms`` is suggested. For PBKDF2 the iteration count
+is scaled linearly from a calibration run and then measured.
+
+It then fires ``--logins`` concurrent verifications at the suggested
+cost through pools of 1 to ``--workers`` threads, to show what a burst
+of logins costs with each ``PASSWORD_HASHING.workers`` setting.
+
+Usage::
+
+    python -m benchmarks.password_cost --target-ms 100 --workers 4
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import statistics
+
+from db.passwords import hash_password, verify_password, SCRYPT_PARAMS
+from benchmarks._common import timed
+
+PASSWORD = "correct horse battery staple"
+
+
+def verify_ms(stored: str, repeat: int) -> float:
+    """
+    Return the median time, in milliseconds, to verify ``PASSWORD``.
+    """
+    return statistics.median(timed(verify_password, PASSWORD, stored)[1] for _ in range(repeat)) * 1e3
+
+
+def pick_scrypt(target_ms: float, repeat: int):
+    """
+    Return ``(params, ms)`` for the largest scrypt ``n`` within the target.
+    """
+    r, p = SCRYPT_PARAMS["r"], SCRYPT_PARAMS["p"]
+    best = None
+    n = 2 ** 10
+    while True:
+        ms = verify_ms(hash_password(PASSWORD, "scrypt", n=n, r=r, p=p), repeat)
+        print(f"  scrypt n={n:<8} {ms:>8.1f} ms")
+        if ms > target_ms:
+            break
+        best = ({"n": n, "r": r, "p": p}, ms)
+        n *= 2
+    return best or ({"n": 2 ** 10, "r": r, "p": p}, ms)
+
+
+def pick_pbkdf2(target_ms: float, repeat: int):
+    """
+    Return ``(iterations, ms)`` scaled to the target latency.
+    """
+    probe = 100000
+    ms = verify_ms(hash_password(PASSWORD, "pbkdf2_sha256", iterations=probe), repeat)
+    iterations = max(1000, int(probe * target_ms / ms) // 1000 * 1000)
+    ms = verify_ms(hash_password(PASSWORD, "pbkdf2_sha256", iterations=iterations), repeat)
+    print(f"  pbkdf2 iterations={iterations:<8} {ms:>8.1f} ms")
+    return iterations, ms
+
+
+def burst(stored: str, logins: int, workers: int):
+    """
+    Verify ``logins`` passwords through a pool of ``workers`` threads.
+
+    Returns
+    -------
+    tuple
+        ``(total_seconds, logins_per_second)``.
+    """
+    with ThreadPoolExecutor(workers) as pool:
+        _, elapsed = timed(lambda: list(pool.map(verify_password, [PASSWORD] * logins, [stored] * logins)))
+    return elapsed, logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    parser.add_argument("--algorithm", choices=("scrypt", "pbkdf2_sha256"), default="scrypt")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"target: {args.target_ms:.0f} ms per verification")
+    if args.algorithm == "scrypt":
+        params, ms = pick_scrypt(args.target_ms, args.repeat)
+        stored = hash_password(PASSWORD, "scrypt", **params)
+        config = {"algorithm": "scrypt", "scrypt": params}
+    else:
+        iterations, ms = pick_pbkdf2(args.target_ms, args.repeat)
+        stored = hash_password(PASSWORD, "pbkdf2_sha256", iterations=iterations)
+        config = {"algorithm": "pbkdf2_sha256", "pbkdf2_iterations": iterations}
+
+    print(f"\n{'workers':>7} {'burst ms':>9} {'logins/s':>9}")
+    workers = 1
+    while workers <= args.workers:
+        elapsed, rate = burst(stored, args.logins, workers)
+        print(f"{workers:>7} {elapsed * 1e3:>9.0f} {rate:>9.1f}")
+        workers *= 2
+
+    print(f"\nsuggested PASSWORD_HASHING ({ms:.1f} ms per login):")
+    print(json.dumps(config, indent=4))
+
+
+if __name__ == "__main__":
+    main()
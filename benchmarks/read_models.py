@@ -0,0 +1,87 @@
+"""
+Compare ORM listings with the slotted read models of :mod:`db.views`.
+
+Seeds ``--rows`` users and, for both ``get_users_page`` (ORM objects) and
+``list_users`` (:class:`db.views.UserView` snapshots), measures:
+
+- the time to walk every page of users,
+- the memory held by one list of all users (``tracemalloc`` peak),
+- the time to read the list again after a ``commit()``, which expires
+  every ORM object and refreshes each one with its own ``SELECT``.
+
+Usage::
+
+    python -m benchmarks.read_models --rows 20000 --page-size 50
+"""
+
+import argparse
+import tracemalloc
+
+from db.db_controller import DBController
+from db.seed import seed_synthetic
+from benchmarks._common import temp_db_url, make_session_factory, timed
+
+
+def walk_pages(fetch_page, page_size):
+    """
+    Fetch every page through ``fetch_page`` and return the row count.
+    """
+    after_id = rows = 0
+    while True:
+        page = fetch_page(after_id=after_id, limit=page_size)
+        rows += len(page)
+        if len(page) < page_size:
+            return rows
+        after_id = page[-1].id
+
+
+def held_bytes(load):
+    """
+    Return the peak traced memory while ``load()`` builds its result.
+    """
+    tracemalloc.start()
+    result = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def read_after_commit(db, users):
+    """
+    Commit, then touch one attribute of every listed user.
+    """
+    db.commit()
+    return sum(len(u.username) for u in users)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    engine, Session = make_session_factory(temp_db_url("read_models"))
+    seed_synthetic(users=args.rows, engine=engine)
+    paths = {"orm": "get_users_page", "views": "list_users"}
+
+    print(f"{'path':<6} {'walk ms':>9} {'held KiB':>9} {'post-commit ms':>15}")
+    for name, method in paths.items():
+        db = DBController(session_factory=Session)
+        fetch = getattr(db, method)
+
+        walk = min(timed(walk_pages, fetch, args.page_size)[1] for _ in range(3))
+        db.session.expunge_all()
+        held = held_bytes(lambda: fetch(limit=args.rows))
+        db.session.expunge_all()
+        users = fetch(limit=args.rows)
+        _, post_commit = timed(read_after_commit, db, users)
+
+        print(f"{name:<6} {walk * 1e3:>9.1f} {held / 1024:>9.0f} {post_commit * 1e3:>15.1f}")
+        db.close()
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Compare the SQLite pragma profiles defined in ``vars.json``.
+
+Runs the same workload through :class:`DBController` once per profile:
+single-row committed inserts (the pattern used by every handler) followed
+by point lookups. Usage::
+
+    python -m benchmarks.sqlite_profiles --rows 2000
+"""
+
+import argparse
+
+from db.db_controller import DBController
+from db.config import get_config
+from benchmarks._common import temp_db_url, make_session_factory, timed
+
+
+def run_profile(profile: str, rows: int) -> dict:
+    """
+    Benchmark one profile and return its throughput numbers.
+    """
+    engine, Session = make_session_factory(temp_db_url(f"profile_{profile}"), profile)
+    db = DBController(session_factory=Session)
+
+    def inserts():
+        for i in range(rows):
+            db.add_user(f"user{i}", f"user{i}@example.com", "x")
+
+    def lookups():
+        for i in range(1, rows + 1):
+            db.get_user_by_id(i)
+
+    _, write_s = timed(inserts)
+    db.session.expire_all()
+    _, read_s = timed(lookups)
+
+    db.close()
+    engine.dispose()
+    return {
+        "profile": profile,
+        "commits_per_s": rows / write_s,
+        "lookups_per_s": rows / read_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--profiles", nargs="*", default=list(get_config()["SQLITE_PROFILES"]))
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'commits/s':>12} {'lookups/s':>12}")
+    for profile in args.profiles:
+        r = run_profile(profile, args.rows)
+        print(f"{r['profile']:<10} {r['commits_per_s']:>12.0f} {r['lookups_per_s']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure application cold start.
+
+Spawns fresh interpreters that perform what ``main_app.main`` does before
+showing the first menu (imports, ``init_db``, controller, auth service and
+permission manager) plus one user lookup. Two medians are reported: the
+total wall time of the process, and the application's own share, measured
+inside the process after SQLAlchemy itself has been imported (that import
+alone dominates the total and is outside our control). The database is
+initialized once beforehand, so the numbers reflect a normal restart
+rather than first-time creation. Usage::
+
+    python -m benchmarks.startup --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPET = """
+import time
+import sqlalchemy.orm
+start = time.perf_counter()
+import main_app
+main_app.initializer.init_db()
+from db.db_controller import DBController
+db = DBController()
+auth = main_app.AuthService(db)
+permissions = main_app.PermissionManager("./vars/dev/permissions.json")
+db.get_user_by_id(1)
+db.close()
+print("APP_STARTUP", time.perf_counter() - start)
+"""
+
+
+def run_once() -> tuple:
+    """
+    Run one cold start.
+
+    Returns
+    -------
+    tuple
+        ``(total_seconds, app_seconds)``.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", SNIPPET],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    total = time.perf_counter() - start
+    marker = [line for line in proc.stdout.splitlines() if line.startswith("APP_STARTUP")]
+    return total, float(marker[-1].split()[1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    run_once()  # make sure the database exists and is stamped
+    samples = [run_once() for _ in range(args.runs)]
+    total = statistics.median(s[0] for s in samples)
+    app = statistics.median(s[1] for s in samples)
+    print(f"cold start over {args.runs} runs: total median {total * 1000:.1f} ms, "
+          f"application (after SQLAlchemy import) median {app * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Data layer benchmark suite with regression gates.
+
+For every dataset size, a fresh database is filled by
+:func:`db.seed.seed_synthetic` (``size`` users, ``size / 20`` groups,
+``size / 2`` events). The suite then measures:
+
+- each public :class:`DBController` method: p50/p99 latency and the
+  number of SQL statements per call;
+- handler flows replayed through the real handlers with scripted input:
+  view all groups, create an event with 200 attendees, view my events.
+
+Mutators run with ``commit=False`` and are rolled back after each call,
+so they measure the statements and flush, not the fsync, and leave the
+dataset unchanged. Usage::
+
+    python -m benchmarks.suite --sizes 1000 100000 --save baseline.json
+    python -m benchmarks.suite --sizes 1000 100000 --compare baseline.json --threshold 0.5
+
+With ``--compare`` the process exits with status 1 when any case's p50
+grows by more than ``--threshold`` (and by more than ``--min-delta-ms``)
+or when it issues more statements per call than in the baseline.
+Baselines are machine-specific; compare only runs from the same host.
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from unittest import mock
+import argparse
+import io
+import json
+import random
+import sys
+import time
+
+from sqlalchemy import select
+
+from db.db_controller import DBController
+from db.schema import User, Group, Event
+from db.instrumentation import QueryProfiler
+from db.seed import seed_synthetic
+from db.config import get_config
+from app.permissions import PermissionManager
+from app.handlers.view_group import handle_view_all_groups
+from app.handlers.events import handle_create_event, handle_view_my_events
+from benchmarks._common import temp_db_url, make_session_factory
+
+SAMPLE_SIZE = 100
+FLOW_ATTENDEES = 200
+
+# Methods that manage the session rather than query data.
+NOT_BENCHMARKED = {"transaction", "commit", "rollback", "close", "user_cache_stats"}
+
+
+class Sample:
+    """
+    Deterministic IDs drawn from the seeded dataset, cycled by iteration.
+    """
+
+    def __init__(self, db: DBController, rng: random.Random):
+        ids = lambda column: db.session.scalars(select(column).order_by(column)).all()
+        self.all_user_ids = ids(User.id)
+        self.user_ids = rng.sample(self.all_user_ids, min(SAMPLE_SIZE, len(self.all_user_ids)))
+        self.usernames = [db.get_user_by_id(uid).username for uid in self.user_ids]
+        self.emails = [db.get_user_by_id(uid).email for uid in self.user_ids]
+        group_ids = ids(Group.id)
+        self.group_ids = rng.sample(group_ids, min(SAMPLE_SIZE, len(group_ids)))
+        event_ids = ids(Event.id)
+        self.event_ids = rng.sample(event_ids, min(SAMPLE_SIZE, len(event_ids)))
+        self.session_hashes = [f"bench-session-{uid}" for uid in self.user_ids]
+        with db.transaction():
+            for uid, token_hash in zip(self.user_ids, self.session_hashes):
+                db.create_session(uid, token_hash, datetime(2100, 1, 1))
+        db.session.expunge_all()
+        db.user_cache.clear()
+
+    def user(self, i):
+        return self.user_ids[i % len(self.user_ids)]
+
+    def group(self, i):
+        return self.group_ids[i % len(self.group_ids)]
+
+    def event(self, i):
+        return self.event_ids[i % len(self.event_ids)]
+
+
+def method_cases(s: Sample):
+    """
+    Return ``(method_name, call, mutates)`` tuples; ``call(db, i)`` runs
+    the method once for iteration ``i``.
+    """
+    when = datetime(2025, 6, 1)
+    return [
+        ("get_user_by_id", lambda db, i: db.get_user_by_id(s.user(i)), False),
+        ("get_user_by_username", lambda db, i: db.get_user_by_username(s.usernames[i % len(s.usernames)]), False),
+        ("get_user_by_email", lambda db, i: db.get_user_by_email(s.emails[i % len(s.emails)]), False),
+        ("has_users", lambda db, i: db.has_users(), False),
+        ("find_taken", lambda db, i: db.find_taken(s.usernames, s.emails), False),
+        ("get_all_users", lambda db, i: db.get_all_users(), False),
+        ("get_users_page", lambda db, i: db.get_users_page(after_id=s.user(i)), False),
+        ("search_users", lambda db, i: db.search_users(s.usernames[i % len(s.usernames)][:5]), False),
+        ("get_group_by_id", lambda db, i: db.get_group_by_id(s.group(i)), False),
+        ("get_all_groups", lambda db, i: db.get_all_groups(), False),
+        ("get_groups_page", lambda db, i: db.get_groups_page(after_id=s.group(i)), False),
+        ("get_users_from_group", lambda db, i: db.get_users_from_group(s.group(i)), False),
+        ("is_member", lambda db, i: db.is_member(s.user(i), s.group(i)), False),
+        ("count_group_members", lambda db, i: db.count_group_members(s.group(i)), False),
+        ("member_counts", lambda db, i: db.member_counts(s.group_ids), False),
+        ("get_group_members_page", lambda db, i: db.get_group_members_page(s.group(i)), False),
+        ("get_groups_from_user", lambda db, i: db.get_groups_from_user(s.user(i)), False),
+        ("get_groups_by_owner", lambda db, i: db.get_groups_by_owner(s.user(i)), False),
+        ("get_groups_by_member", lambda db, i: db.get_groups_by_member(s.user(i)), False),
+        ("get_events_from_user", lambda db, i: db.get_events_from_user(s.user(i)), False),
+        ("get_user_events_page", lambda db, i: db.get_user_events_page(s.user(i)), False),
+        ("get_all_events", lambda db, i: db.get_all_events(), False),
+        ("get_events_page", lambda db, i: db.get_events_page(after_id=s.event(i)), False),
+        ("get_events_between", lambda db, i: db.get_events_between(
+            when, when + timedelta(days=7), user_id=s.user(i)), False),
+        ("get_upcoming_events", lambda db, i: db.get_upcoming_events(user_id=s.user(i), now=when), False),
+        ("get_event_by_id", lambda db, i: db.get_event_by_id(s.event(i)), False),
+        ("get_attendees_from_event", lambda db, i: db.get_attendees_from_event(s.event(i)), False),
+        ("count_event_attendees", lambda db, i: db.count_event_attendees(s.event(i)), False),
+        ("attendee_counts", lambda db, i: db.attendee_counts(s.event_ids), False),
+        ("list_users", lambda db, i: db.list_users(after_id=s.user(i)), False),
+        ("list_group_members", lambda db, i: db.list_group_members(s.group(i)), False),
+        ("list_groups", lambda db, i: db.list_groups(after_id=s.group(i)), False),
+        ("list_user_groups", lambda db, i: db.list_user_groups(s.user(i)), False),
+        ("list_events", lambda db, i: db.list_events(after_id=s.event(i)), False),
+        ("list_user_events", lambda db, i: db.list_user_events(s.user(i)), False),
+        ("list_events_between", lambda db, i: db.list_events_between(
+            when, when + timedelta(days=7), user_id=s.user(i)), False),
+        ("list_upcoming_events", lambda db, i: db.list_upcoming_events(user_id=s.user(i), now=when), False),
+        ("get_session", lambda db, i: db.get_session(s.session_hashes[i % len(s.session_hashes)]), False),
+        ("create_session", lambda db, i: db.create_session(
+            s.user(i), f"bench-new-{i}", when, commit=False), True),
+        ("delete_session", lambda db, i: db.delete_session(
+            s.session_hashes[i % len(s.session_hashes)], commit=False), True),
+        ("add_user", lambda db, i: db.add_user(f"bench{i}", f"bench{i}@example.com", "x", commit=False), True),
+        ("add_users_bulk", lambda db, i: db.add_users_bulk([
+            {"username": f"bulk{i}_{n}", "email": f"bulk{i}_{n}@example.com",
+             "password_hash": "x", "access_level": "user"}
+            for n in range(100)
+        ], commit=False), True),
+        ("update_user", lambda db, i: db.update_user(
+            s.user(i), {"email": f"changed{i}@example.com"}, commit=False), True),
+        ("create_group", lambda db, i: db.create_group(f"bench{i}", s.user(i), commit=False), True),
+        ("add_user_to_group", lambda db, i: db.add_user_to_group(
+            s.user(i), s.group(i + 1), commit=False), True),
+        ("update_group_name", lambda db, i: db.update_group_name(s.group(i), f"renamed{i}", commit=False), True),
+        ("remove_user_from_group", lambda db, i: db.remove_user_from_group(
+            s.user(i), s.group(i), commit=False), True),
+        ("delete_group", lambda db, i: db.delete_group(s.group(i), commit=False), True),
+        ("create_event", lambda db, i: db.create_event(f"bench{i}", "", when, commit=False), True),
+        ("add_user_to_event", lambda db, i: db.add_user_to_event(s.user(i), s.event(i + 1), commit=False), True),
+        ("add_users_to_event", lambda db, i: db.add_users_to_event(
+            s.event(i + 1), s.user_ids[:50], commit=False), True),
+        ("update_event", lambda db, i: db.update_event(s.event(i), {"description": "changed"}, commit=False), True),
+        ("set_event_attendees", lambda db, i: db.set_event_attendees(
+            s.event(i), s.user_ids[:50], commit=False), True),
+        ("delete_event", lambda db, i: db.delete_event(s.event(i), commit=False), True),
+    ]
+
+
+def _scripted_input(answers: dict):
+    """
+    Build an ``input`` replacement answering by prompt text.
+
+    ``answers`` maps a prompt substring to the reply; unknown prompts get
+    an empty reply (ENTER, i.e. "go back").
+    """
+    def fake_input(prompt=""):
+        for fragment, reply in answers.items():
+            if fragment in prompt:
+                return reply
+        return ""
+    return fake_input
+
+
+def flow_cases(s: Sample, root, permissions):
+    """
+    Return ``(flow_name, call, mutates)`` tuples replaying real handlers.
+    """
+    attendees = "#" + ",".join(str(uid) for uid in s.all_user_ids[:FLOW_ATTENDEES])
+
+    def run(handler, answers, *args):
+        with mock.patch("builtins.input", _scripted_input(answers)), redirect_stdout(io.StringIO()):
+            handler(*args)
+
+    return [
+        ("flow:view_all_groups", lambda db, i: run(
+            handle_view_all_groups, {"ENTER for more": "q"}, db, root, permissions), False),
+        ("flow:create_event_200_attendees", lambda db, i: run(
+            handle_create_event,
+            {"Event name": f"flow{i}", "Description": "flow", "Event date": "2025-06-01 18:00",
+             "Search": attendees},
+            db, root, permissions), True),
+        ("flow:view_my_events", lambda db, i: run(
+            handle_view_my_events, {"ENTER for more": "q"}, db, db.get_user_by_id(s.user(i))), False),
+    ]
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def measure(db, call, mutates, profiler, name, iterations, budget):
+    """
+    Time ``call`` and count its statements.
+
+    Statements are counted on one cold call (empty user cache and identity
+    map) so cached paths do not hide queries; latency is then measured on
+    the warm controller, as the application would run it.
+
+    Returns
+    -------
+    dict
+        ``iterations``, ``p50_ms``, ``p99_ms`` and ``queries`` (per call).
+    """
+    def once(i):
+        start = time.perf_counter()
+        call(db, i)
+        elapsed = time.perf_counter() - start
+        if mutates:
+            db.rollback()
+        return elapsed
+
+    db.user_cache.clear()
+    db.session.expunge_all()
+    with profiler.profile(name) as profile:
+        call(db, 0)
+    if mutates:
+        db.rollback()
+
+    once(0)  # warm-up
+    samples = []
+    deadline = time.perf_counter() + budget
+    for i in range(1, iterations + 1):
+        samples.append(once(i))
+        if len(samples) >= 5 and time.perf_counter() > deadline:
+            break
+
+    return {
+        "iterations": len(samples),
+        "p50_ms": _percentile(samples, 0.50) * 1000,
+        "p99_ms": _percentile(samples, 0.99) * 1000,
+        "queries": profile.queries,
+    }
+
+
+def run_size(size: int, iterations: int, budget: float, seed: int) -> dict:
+    """
+    Seed a database of ``size`` users and benchmark every case on it.
+    """
+    engine, Session = make_session_factory(temp_db_url(f"suite_{size}"))
+    start = time.perf_counter()
+    seed_synthetic(users=size, groups=max(size // 20, 1), events=max(size // 2, 1),
+                   seed=seed, engine=engine)
+    print(f"\n== {size} users (seeded in {time.perf_counter() - start:.1f}s) ==")
+
+    db = DBController(session_factory=Session)
+    ok, root = db.add_user("bench_root", "bench_root@example.com", "x", access_level="root")
+    root_id = root.id
+    sample = Sample(db, random.Random(seed))
+    root = db.get_user_by_id(root_id)
+    permissions = PermissionManager(get_config()["ROLES_JSON_FILE"])
+    profiler = QueryProfiler(log_file=None)
+
+    cases = method_cases(sample)
+    covered = {name for name, _, _ in cases}
+    public = {
+        name for name in dir(DBController)
+        if not name.startswith("_") and callable(getattr(DBController, name))
+    }
+    missing = sorted(public - covered - NOT_BENCHMARKED)
+    if missing:
+        print(f"warning: not benchmarked: {', '.join(missing)}")
+
+    results = {}
+    print(f"{'case':<34} {'iters':>6} {'p50 ms':>9} {'p99 ms':>9} {'queries':>8}")
+    for name, call, mutates in cases + flow_cases(sample, root, permissions):
+        r = measure(db, call, mutates, profiler, name, iterations, budget)
+        results[name] = r
+        print(f"{name:<34} {r['iterations']:>6} {r['p50_ms']:>9.3f} {r['p99_ms']:>9.3f} {r['queries']:>8}")
+
+    db.close()
+    engine.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """
+    Return human-readable regressions of ``results`` against ``baseline``.
+
+    Sizes or cases missing from either side are skipped.
+    """
+    regressions = []
+    for size, cases in results.items():
+        for name, new in cases.items():
+            old = baseline.get(size, {}).get(name)
+            if old is None:
+                continue
+            delta = new["p50_ms"] - old["p50_ms"]
+            if delta > old["p50_ms"] * threshold and delta > min_delta_ms:
+                regressions.append(
+                    f"{size}/{name}: p50 {old['p50_ms']:.3f} -> {new['p50_ms']:.3f} ms"
+                )
+            if new["queries"] > old["queries"]:
+                regressions.append(
+                    f"{size}/{name}: queries {old['queries']} -> {new['queries']}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--iterations", type=int, default=200, help="Maximum timed calls per case.")
+    parser.add_argument("--budget", type=float, default=0.5, help="Seconds per case before stopping early.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON file to check the results against.")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed relative p50 growth.")
+    parser.add_argument("--min-delta-ms", type=float, default=0.2, help="Ignore p50 growth below this.")
+    args = parser.parse_args()
+
+    results = {str(size): run_size(size, args.iterations, args.budget, args.seed) for size in args.sizes}
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.compare}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,971 @@
+"""
+Asynchronous database controller mirroring :class:`DBController` on top of
+SQLAlchemy's asyncio extension. It shares the ORM models from
+:mod:`db.schema` and exposes the same method names as coroutines, so an
+asyncio front end (chat hub, local API server) can use the data layer
+without blocking its event loop.
+
+Requires the ``aiosqlite`` driver (``pip install aiosqlite``).
+"""
+
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from contextlib import asynccontextmanager
+from datetime import datetime
+from inspect import isawaitable
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents, UserSession
+from .config import get_config
+from .engine import get_engine
+from .pragmas import install_pragmas
+from .cache import LRUCache, MISSING
+from .changes import Change, PendingChanges, INSERT, UPDATE, DELETE, bus
+from .views import UserView, GroupView, EventView, select_users, select_groups, select_events, to_views
+from .db_controller import USER_CACHE_SIZE
+from .statements import (
+    USER_BY_ID, USER_BY_USERNAME, USER_BY_EMAIL, HAS_USERS, GROUP_BY_ID, EVENT_BY_ID,
+    IS_MEMBER, COUNT_GROUP_MEMBERS, COUNT_EVENT_ATTENDEES, SESSION_USER,
+    USER_FIELDS, GROUP_FIELDS, MEMBER_FIELDS, EVENT_FIELDS, ATTENDEE_FIELDS, SESSION_FIELDS,
+    USER_VIOLATIONS, GROUP_VIOLATIONS, is_foreign_key_violation, violation_message,
+    add_attendees, attended_by, groups_of,
+)
+
+_session_factory = None
+
+
+def get_async_session_factory():
+    """
+    Return the shared ``async_sessionmaker``, creating the engine on first use.
+
+    The engine is created lazily so that importing this module does not
+    require ``aiosqlite`` until an async controller is actually built.
+    Sessions use ``expire_on_commit=False`` because expired attributes
+    cannot be refreshed implicitly outside an awaitable context.
+    """
+    global _session_factory
+    if _session_factory is None:
+        # The sync engine owns schema creation; make sure it has run.
+        get_engine()
+        url = get_config()["DB_URL"].replace("sqlite://", "sqlite+aiosqlite://", 1)
+        engine = create_async_engine(url, echo=False)
+        install_pragmas(engine.sync_engine)
+        _session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    return _session_factory
+
+
+class AsyncDBController:
+    """
+    Asyncio counterpart of :class:`db.db_controller.DBController`.
+
+    Every data method is a coroutine with the same name, parameters
+    (including ``commit=``) and return values as its synchronous twin, and
+    :meth:`transaction` is an ``async with`` block. Relationship collections are
+    never lazy-loaded; methods that return related rows run explicit
+    queries instead. One controller owns one ``AsyncSession`` and must not
+    be shared between concurrently running tasks.
+    """
+
+    def __init__(self, session_factory=None, user_cache_size=USER_CACHE_SIZE, change_bus=None):
+        """
+        Initialize a new ``AsyncSession`` for database operations.
+
+        :param session_factory: Optional ``async_sessionmaker``. Defaults to
+            :func:`get_async_session_factory`.
+        :param int user_cache_size: Capacity of the read-through user cache.
+        :param change_bus: :class:`~db.changes.ChangeBus` receiving this
+            controller's changes on commit. Defaults to :data:`db.changes.bus`.
+        """
+        self.session = (session_factory or get_async_session_factory())()
+        self.user_cache = LRUCache(user_cache_size)
+        self._transaction_depth = 0
+        self.change_bus = change_bus or bus
+        self._changes = PendingChanges(self.change_bus, self.session.sync_session)
+        self._unsubscribe = self.change_bus.subscribe(self._on_user_change, entities=("user",))
+
+    # -----------------------------
+    # TRANSACTIONS
+    # -----------------------------
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Run several mutators as one atomic unit with a single commit.
+
+        Inside the block every mutator only flushes; the commit happens
+        once when the outermost block exits, and any exception rolls back
+        everything done in the block. Nested blocks join the outer one.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                await self.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            await self.commit()
+
+    async def _commit(self, commit=True):
+        """
+        Commit, or only flush when deferred or inside :meth:`transaction`.
+        """
+        if commit and self._transaction_depth == 0:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+
+    async def commit(self):
+        """
+        Commit changes left pending by mutators called with ``commit=False``.
+        """
+        await self.session.commit()
+
+    async def rollback(self):
+        """
+        Discard pending changes, queued change events and the user cache.
+        """
+        await self.session.rollback()
+        self.user_cache.clear()
+
+    async def _first(self, stmt, params=None):
+        return (await self.session.execute(stmt, params)).scalars().first()
+
+    async def _write(self, apply, commit=True, change=None):
+        """
+        Apply a change in a ``SAVEPOINT`` and commit, relying on database
+        constraints.
+
+        A violation only rolls back the savepoint, so objects already
+        loaded stay usable (a full rollback would expire them, and expired
+        attributes cannot be refreshed implicitly under asyncio). Unless
+        deferred (``commit=False`` or inside :meth:`transaction`), the
+        session is committed either way so no write lock is left held.
+
+        :param apply: Callable staging the change on the session; it may
+            return an awaitable, which is awaited inside the savepoint.
+        :param bool commit: As for the public mutators.
+        :param change: Optional callable returning the
+            :class:`~db.changes.Change` to publish after the commit.
+        :returns: ``None`` on success, or the :class:`IntegrityError`.
+        """
+        conn = await self.session.connection()
+        if conn.dialect.name == "sqlite":
+            raw = await conn.get_raw_connection()
+            if not raw.dbapi_connection.driver_connection.in_transaction:
+                # See DBController._write: a SAVEPOINT outside a transaction
+                # would commit on RELEASE.
+                await conn.exec_driver_sql("BEGIN")
+
+        error = None
+        try:
+            async with self.session.begin_nested():
+                result = apply()
+                if isawaitable(result):
+                    await result
+        except IntegrityError as e:
+            error = e
+        else:
+            if change:
+                self._changes.add(change())
+        if commit and self._transaction_depth == 0:
+            await self.session.commit()
+        return error
+
+    async def _all(self, stmt):
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    # -----------------------------
+    # USERS
+    # -----------------------------
+
+    async def add_user(self, username: str, email: str, password_hash: str, access_level="user", commit: bool = True):
+        """
+        Create and persist a new user.
+
+        :returns: ``(True, User)`` on success, otherwise ``(False, message)``.
+        :rtype: tuple
+        """
+        user = User(
+            username=username,
+            email=email,
+            password_hash=password_hash,
+            access_level=access_level,
+            created_at=datetime.now()
+        )
+
+        error = await self._write(
+            lambda: self.session.add(user), commit,
+            lambda: Change("user", user.id, INSERT, USER_FIELDS),
+        )
+        if error:
+            return False, violation_message(error, USER_VIOLATIONS)
+        self._invalidate_user(user.id, username)
+        return True, user
+
+    def _invalidate_user(self, user_id, *usernames):
+        """
+        Drop cached lookups for a user id and any of its usernames.
+        """
+        self.user_cache.invalidate(("id", user_id), *(("username", u) for u in usernames))
+
+    def _on_user_change(self, change: Change):
+        # Both lookups of a user are tagged with its ID; bulk inserts
+        # (no ID) cannot make anything stale, since misses are not cached.
+        if change.id is not None:
+            self.user_cache.invalidate_tag(change.id)
+
+    async def get_user_by_username(self, username: str):
+        """
+        Retrieve a user by username, served from :attr:`user_cache`.
+
+        :returns: User object or ``None``.
+        """
+        key = ("username", username)
+        user = self.user_cache.get(key)
+        if user is MISSING:
+            user = await self._first(USER_BY_USERNAME, {"username": username})
+            if user is not None:
+                self.user_cache.put(key, user, tags=(user.id,))
+                self.user_cache.put(("id", user.id), user, tags=(user.id,))
+        return user
+
+    async def get_user_by_email(self, email: str):
+        """
+        Retrieve a user by email.
+
+        :returns: User object or ``None``.
+        """
+        return await self._first(USER_BY_EMAIL, {"email": email})
+
+    async def get_user_by_id(self, user_id: int):
+        """
+        Retrieve a user by database ID, served from :attr:`user_cache`.
+
+        :returns: User object or ``None``.
+        """
+        key = ("id", user_id)
+        user = self.user_cache.get(key)
+        if user is MISSING:
+            user = await self._first(USER_BY_ID, {"user_id": user_id})
+            if user is not None:
+                self.user_cache.put(key, user, tags=(user.id,))
+                self.user_cache.put(("username", user.username), user, tags=(user.id,))
+        return user
+
+    def user_cache_stats(self):
+        """
+        Return hit/miss counters of the user lookup cache.
+
+        :rtype: dict
+        """
+        return self.user_cache.stats()
+
+    async def has_users(self) -> bool:
+        """
+        Check whether at least one user exists, without loading any.
+
+        :rtype: bool
+        """
+        return await self.session.scalar(HAS_USERS)
+
+    async def find_taken(self, usernames, emails):
+        """
+        Return which of the given usernames and emails are already in use.
+
+        :returns: ``(taken_usernames, taken_emails)``.
+        :rtype: tuple[set, set]
+        """
+        usernames, emails = set(usernames), set(emails)
+        taken_usernames = set(await self._all(
+            select(User.username).where(User.username.in_(usernames))
+        )) if usernames else set()
+        taken_emails = set(await self._all(
+            select(User.email).where(User.email.in_(emails))
+        )) if emails else set()
+        return taken_usernames, taken_emails
+
+    async def add_users_bulk(self, rows, commit: bool = True) -> int:
+        """
+        Insert many users with one ``executemany`` statement and commit.
+
+        :returns: Number of inserted users.
+        :rtype: int
+        """
+        if not rows:
+            return 0
+        now = datetime.now()
+        rows = [{"created_at": now, **row} for row in rows]
+        await self.session.execute(insert(User), rows)
+        self._changes.add(Change("user", None, INSERT, USER_FIELDS))
+        await self._commit(commit)
+        return len(rows)
+
+    async def get_all_users(self):
+        """
+        Get all user entries.
+
+        :rtype: list
+        """
+        return await self._all(select(User))
+
+    async def get_users_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Get one page of users ordered by ID (keyset pagination).
+
+        :rtype: list
+        """
+        return await self._all(
+            select(User).where(User.id > after_id).order_by(User.id).limit(limit)
+        )
+
+    async def search_users(self, prefix: str, limit: int = 10):
+        """
+        Find users whose username or email starts with ``prefix``.
+
+        See :meth:`DBController.search_users` for the index strategy.
+
+        :rtype: list
+        """
+        if not prefix:
+            return []
+
+        upper = prefix + "\U0010ffff"
+        matches = {}
+        for column in (User.username, User.email):
+            rows = await self._all(
+                select(User)
+                .where(column >= prefix, column < upper)
+                .order_by(column)
+                .limit(limit)
+            )
+            for user in rows:
+                matches[user.id] = user
+
+        return sorted(matches.values(), key=lambda u: u.username)[:limit]
+
+    async def update_user(self, user_id: int, updates: dict, commit: bool = True):
+        """
+        Update fields of an existing user.
+
+        :returns: ``(True, user)`` on success, otherwise ``(False, message)``.
+        :rtype: tuple
+        """
+        user = await self.get_user_by_id(user_id)
+        if not user:
+            return False, "User not found."
+
+        for key in updates:
+            if not hasattr(user, key):
+                return False, f"Invalid field: {key}"
+
+        old_username = user.username
+
+        def apply():
+            for key, value in updates.items():
+                setattr(user, key, value)
+
+        error = await self._write(apply, commit, lambda: Change("user", user_id, UPDATE, tuple(updates)))
+        if error:
+            # The savepoint rollback expired the user; reload it while awaiting.
+            await self.session.refresh(user)
+            return False, violation_message(error, USER_VIOLATIONS)
+        self._invalidate_user(user_id, old_username, updates.get("username", old_username))
+        return True, user
+
+    # -----------------------------
+    # GROUPS
+    # -----------------------------
+
+    async def get_group_by_id(self, group_id: int):
+        """
+        Retrieve a group by ID.
+
+        :returns: Group object or ``None``.
+        """
+        return await self._first(GROUP_BY_ID, {"group_id": group_id})
+
+    async def get_all_groups(self):
+        """
+        Retrieve all groups.
+
+        :rtype: list
+        """
+        return await self._all(select(Group))
+
+    async def get_groups_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of groups ordered by ID (keyset pagination).
+
+        :rtype: list
+        """
+        return await self._all(
+            select(Group).where(Group.id > after_id).order_by(Group.id).limit(limit)
+        )
+
+    async def create_group(self, group_name: str, owner_id: int = None, commit: bool = True):
+        """
+        Create a new group.
+
+        :returns: ``(True, Group)`` or ``(False, message)``.
+        :rtype: tuple
+        """
+        group = Group(
+            group_name=group_name,
+            owner_id=owner_id,
+            created_at=datetime.now()
+        )
+
+        error = await self._write(
+            lambda: self.session.add(group), commit,
+            lambda: Change("group", group.id, INSERT, GROUP_FIELDS),
+        )
+        if error:
+            return False, violation_message(error, GROUP_VIOLATIONS)
+        return True, group
+
+    async def add_user_to_group(self, user_id: int, group_id: int, commit: bool = True):
+        """
+        Add a user to a group.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        :rtype: tuple
+        """
+        link = UsersInGroups(user_id=user_id, group_id=group_id)
+        error = await self._write(
+            lambda: self.session.add(link), commit,
+            lambda: Change("group_member", (group_id, user_id), INSERT, MEMBER_FIELDS),
+        )
+        if error:
+            if is_foreign_key_violation(error):
+                return False, "User not found." if not await self.get_user_by_id(user_id) else "Group not found."
+            return False, "User already in this group."
+
+        return True, "User added to group."
+
+    async def get_users_from_group(self, group_id: int):
+        """
+        Retrieve users that belong to a specific group.
+
+        :returns: List of users or ``None`` if the group does not exist.
+        """
+        if not await self.get_group_by_id(group_id):
+            return None
+        return await self._all(
+            select(User)
+            .join(UsersInGroups, UsersInGroups.user_id == User.id)
+            .where(UsersInGroups.group_id == group_id)
+        )
+
+    async def is_member(self, user_id: int, group_id: int) -> bool:
+        """
+        Check group membership with an ``EXISTS`` query.
+
+        :rtype: bool
+        """
+        return await self.session.scalar(IS_MEMBER, {"user_id": user_id, "group_id": group_id})
+
+    async def count_group_members(self, group_id: int) -> int:
+        """
+        Count the members of a group without loading them.
+
+        :rtype: int
+        """
+        return await self.session.scalar(COUNT_GROUP_MEMBERS, {"group_id": group_id})
+
+    async def member_counts(self, group_ids) -> dict:
+        """
+        Count members of several groups with one ``GROUP BY`` query.
+
+        :rtype: dict
+        """
+        group_ids = set(group_ids)
+        counts = dict.fromkeys(group_ids, 0)
+        if group_ids:
+            result = await self.session.execute(
+                select(UsersInGroups.group_id, func.count())
+                .where(UsersInGroups.group_id.in_(group_ids))
+                .group_by(UsersInGroups.group_id)
+            )
+            counts.update(result.all())
+        return counts
+
+    async def get_group_members_page(self, group_id: int, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of a group's members ordered by user ID.
+
+        :rtype: list
+        """
+        return await self._all(
+            select(User)
+            .join(UsersInGroups, UsersInGroups.user_id == User.id)
+            .where(UsersInGroups.group_id == group_id, User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+        )
+
+    async def get_groups_from_user(self, user_id: int):
+        """
+        Retrieve groups that a user belongs to.
+
+        :returns: List of groups or ``None`` if the user does not exist.
+        """
+        if not await self.get_user_by_id(user_id):
+            return None
+        return await self.get_groups_by_member(user_id)
+
+    async def update_group_name(self, group_id, new_name, commit: bool = True):
+        """
+        Rename a group.
+
+        :returns: ``(True, group)`` or ``(False, message)``.
+        """
+        group = await self.get_group_by_id(group_id)
+        if not group:
+            return False, "Group not found."
+
+        error = await self._write(
+            lambda: setattr(group, "group_name", new_name), commit,
+            lambda: Change("group", group_id, UPDATE, ("group_name",)),
+        )
+        if error:
+            await self.session.refresh(group)
+            return False, violation_message(error, GROUP_VIOLATIONS)
+        return True, group
+
+    async def remove_user_from_group(self, user_id, group_id, commit: bool = True):
+        """
+        Remove a user from a group.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        result = await self.session.execute(
+            delete(UsersInGroups)
+            .where(UsersInGroups.user_id == user_id, UsersInGroups.group_id == group_id)
+        )
+
+        if result.rowcount == 0:
+            return False, "User is not in this group."
+
+        self._changes.add(Change("group_member", (group_id, user_id), DELETE))
+        await self._commit(commit)
+        return True, "User removed from group."
+
+    async def delete_group(self, group_id, commit: bool = True):
+        """
+        Delete a group and its membership links.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        result = await self.session.execute(delete(Group).where(Group.id == group_id))
+        if result.rowcount == 0:
+            return False, "Group not found."
+
+        self._changes.add(Change("group", group_id, DELETE))
+        await self._commit(commit)
+
+        return True, "Group deleted successfully."
+
+    async def get_groups_by_owner(self, owner_id):
+        """
+        Retrieve groups that belong to a specific owner.
+
+        :rtype: list
+        """
+        return await self._all(select(Group).where(Group.owner_id == owner_id))
+
+    async def get_groups_by_member(self, user_id):
+        """
+        Retrieve groups a user is a member of.
+
+        :rtype: list
+        """
+        return await self._all(
+            select(Group)
+            .join(UsersInGroups, UsersInGroups.group_id == Group.id)
+            .where(UsersInGroups.user_id == user_id)
+        )
+
+    # -----------------------------
+    # EVENTS
+    # -----------------------------
+
+    async def create_event(self, event_name: str, description: str, event_time, commit: bool = True):
+        """
+        Create a new event.
+
+        :returns: ``(True, Event)``.
+        """
+        event = Event(
+            event_name=event_name,
+            description=description,
+            event_time=event_time
+        )
+        self.session.add(event)
+        await self.session.flush()
+        self._changes.add(Change("event", event.id, INSERT, EVENT_FIELDS))
+        await self._commit(commit)
+        return True, event
+
+    async def add_user_to_event(self, user_id: int, event_id: int, commit: bool = True):
+        """
+        Add a user as an event attendee.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        link = UsersAttendingEvents(user_id=user_id, event_id=event_id)
+        error = await self._write(
+            lambda: self.session.add(link), commit,
+            lambda: Change("event_attendee", (event_id, user_id), INSERT, ATTENDEE_FIELDS),
+        )
+        if error:
+            if is_foreign_key_violation(error):
+                return False, "User not found." if not await self.get_user_by_id(user_id) else "Event not found."
+            return False, "User already attending."
+
+        return True, "User added to event."
+
+    async def add_users_to_event(self, event_id: int, user_ids, commit: bool = True):
+        """
+        Add many attendees to an event with a single statement; unknown,
+        duplicate and already attending user IDs are skipped.
+
+        :returns: ``(True, added_count)`` or ``(False, message)``.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return True, 0
+
+        added = []
+
+        async def apply():
+            added.append((await self.session.execute(add_attendees(event_id, user_ids))).rowcount)
+
+        error = await self._write(apply, commit, lambda: Change("event", event_id, UPDATE, ("attendees",)))
+        if error:
+            return False, "Event not found."
+        return True, added[0]
+
+    async def get_events_from_user(self, user_id: int):
+        """
+        Retrieve events associated with a user.
+
+        :returns: List of events or ``None`` if the user does not exist.
+        """
+        if not await self.get_user_by_id(user_id):
+            return None
+        return await self._all(
+            select(Event)
+            .join(UsersAttendingEvents, UsersAttendingEvents.event_id == Event.id)
+            .where(UsersAttendingEvents.user_id == user_id)
+        )
+
+    async def get_user_events_page(self, user_id: int, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of the events a user attends, ordered by event ID.
+
+        :rtype: list
+        """
+        return await self._all(
+            select(Event)
+            .join(UsersAttendingEvents, UsersAttendingEvents.event_id == Event.id)
+            .where(UsersAttendingEvents.user_id == user_id, Event.id > after_id)
+            .order_by(Event.id)
+            .limit(limit)
+        )
+
+    async def get_all_events(self):
+        """
+        Retrieve all events.
+
+        :rtype: list
+        """
+        return await self._all(select(Event))
+
+    async def get_events_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of events ordered by ID (keyset pagination).
+
+        :rtype: list
+        """
+        return await self._all(
+            select(Event).where(Event.id > after_id).order_by(Event.id).limit(limit)
+        )
+
+    async def get_events_between(self, start, end, user_id: int = None):
+        """
+        Retrieve events scheduled in ``[start, end)``, ordered by time.
+
+        :rtype: list
+        """
+        stmt = attended_by(
+            select(Event).where(Event.event_time >= start, Event.event_time < end), user_id
+        )
+        return await self._all(stmt.order_by(Event.event_time, Event.id))
+
+    async def get_upcoming_events(self, limit: int = 10, user_id: int = None, now=None):
+        """
+        Retrieve the next ``limit`` events scheduled at or after ``now``.
+
+        :rtype: list
+        """
+        stmt = attended_by(select(Event).where(Event.event_time >= (now or datetime.now())), user_id)
+        return await self._all(stmt.order_by(Event.event_time, Event.id).limit(limit))
+
+    async def update_event(self, event_id: int, updates: dict, commit: bool = True):
+        """
+        Update an event's fields.
+
+        :returns: ``(True, event)`` or ``(False, message)``.
+        """
+        event = await self.get_event_by_id(event_id)
+        if not event:
+            return False, "Event not found."
+
+        # Check every key first, so a bad one leaves nothing dirty in the session.
+        for key in updates:
+            if not hasattr(event, key):
+                return False, f"Invalid field: {key}"
+
+        for key, value in updates.items():
+            setattr(event, key, value)
+
+        self._changes.add(Change("event", event_id, UPDATE, tuple(updates)))
+        await self._commit(commit)
+        return True, event
+
+    async def get_event_by_id(self, event_id: int):
+        """
+        Retrieve an event by ID.
+
+        :returns: Event object or ``None``.
+        """
+        return await self._first(EVENT_BY_ID, {"event_id": event_id})
+
+    async def get_attendees_from_event(self, event_id: int):
+        """
+        Get all users attending a specific event.
+
+        :returns: List of attendees or ``None`` if the event does not exist.
+        """
+        if not await self.get_event_by_id(event_id):
+            return None
+
+        return await self._all(
+            select(User)
+            .join(UsersAttendingEvents, UsersAttendingEvents.user_id == User.id)
+            .where(UsersAttendingEvents.event_id == event_id)
+        )
+
+    async def count_event_attendees(self, event_id: int) -> int:
+        """
+        Count the attendees of an event without loading them.
+
+        :rtype: int
+        """
+        return await self.session.scalar(COUNT_EVENT_ATTENDEES, {"event_id": event_id})
+
+    async def attendee_counts(self, event_ids) -> dict:
+        """
+        Count attendees of several events with one ``GROUP BY`` query.
+
+        :rtype: dict
+        """
+        event_ids = set(event_ids)
+        counts = dict.fromkeys(event_ids, 0)
+        if event_ids:
+            result = await self.session.execute(
+                select(UsersAttendingEvents.event_id, func.count())
+                .where(UsersAttendingEvents.event_id.in_(event_ids))
+                .group_by(UsersAttendingEvents.event_id)
+            )
+            counts.update(result.all())
+        return counts
+
+    async def set_event_attendees(self, event_id: int, new_attendee_ids: list[int], commit: bool = True):
+        """
+        Replace all attendees of an event; unknown and duplicate user IDs
+        are ignored.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        if not await self.session.get(Event, event_id):
+            return False, "Event not found."
+
+        await self.session.execute(
+            delete(UsersAttendingEvents).where(UsersAttendingEvents.event_id == event_id)
+        )
+        if new_attendee_ids:
+            await self.session.execute(add_attendees(event_id, new_attendee_ids))
+
+        self._changes.add(Change("event", event_id, UPDATE, ("attendees",)))
+        await self._commit(commit)
+        return True, "Attendees updated successfully."
+
+    async def delete_event(self, event_id: int, commit: bool = True):
+        """
+        Delete an event.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        result = await self.session.execute(delete(Event).where(Event.id == event_id))
+        if result.rowcount == 0:
+            return False, "Event not found."
+
+        self._changes.add(Change("event", event_id, DELETE))
+        await self._commit(commit)
+        return True, "Event deleted."
+
+    # -----------------------------
+    # SESSIONS
+    # -----------------------------
+
+    async def create_session(self, user_id: int, token_hash: str, expires_at, commit: bool = True):
+        """
+        Store a login session.
+
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        row = UserSession(
+            token_hash=token_hash,
+            user_id=user_id,
+            created_at=datetime.now(),
+            expires_at=expires_at
+        )
+        error = await self._write(
+            lambda: self.session.add(row), commit,
+            lambda: Change("session", token_hash, INSERT, SESSION_FIELDS),
+        )
+        if error:
+            return False, "User not found." if is_foreign_key_violation(error) else "Session already exists."
+        return True, "Session created."
+
+    async def get_session(self, token_hash: str, now=None):
+        """
+        Resolve a live session to its user.
+
+        :returns: ``(UserView, expires_at)`` or ``None``.
+        """
+        row = (await self.session.execute(
+            SESSION_USER, {"token_hash": token_hash, "now": now or datetime.now()}
+        )).first()
+        if row is None:
+            return None
+        return UserView(*row[:-1]), row[-1]
+
+    async def delete_session(self, token_hash: str, commit: bool = True) -> bool:
+        """
+        Delete a session (logout).
+
+        :rtype: bool
+        """
+        result = await self.session.execute(delete(UserSession).where(UserSession.token_hash == token_hash))
+        if result.rowcount == 0:
+            return False
+        self._changes.add(Change("session", token_hash, DELETE))
+        await self._commit(commit)
+        return True
+
+    # -----------------------------
+    # READ MODELS
+    # -----------------------------
+
+    async def _views(self, view, stmt):
+        return to_views(view, await self.session.execute(stmt))
+
+    async def list_users(self, after_id: int = 0, limit: int = 50) -> list[UserView]:
+        """
+        Get one page of users as :class:`~db.views.UserView` snapshots.
+
+        :rtype: list
+        """
+        return await self._views(
+            UserView, select_users().where(User.id > after_id).order_by(User.id).limit(limit)
+        )
+
+    async def list_group_members(self, group_id: int, after_id: int = 0, limit: int = 50) -> list[UserView]:
+        """
+        Get one page of a group's members as :class:`~db.views.UserView` snapshots.
+
+        :rtype: list
+        """
+        return await self._views(
+            UserView,
+            select_users()
+            .join(UsersInGroups, UsersInGroups.user_id == User.id)
+            .where(UsersInGroups.group_id == group_id, User.id > after_id)
+            .order_by(User.id)
+            .limit(limit),
+        )
+
+    async def list_groups(self, after_id: int = 0, limit: int = 50) -> list[GroupView]:
+        """
+        Get one page of groups as :class:`~db.views.GroupView` snapshots.
+
+        :rtype: list
+        """
+        return await self._views(
+            GroupView, select_groups().where(Group.id > after_id).order_by(Group.id).limit(limit)
+        )
+
+    async def list_user_groups(self, user_id: int) -> list[GroupView]:
+        """
+        Get the groups a user owns or is a member of, ordered by ID.
+
+        :rtype: list
+        """
+        return await self._views(GroupView, select_groups().where(groups_of(user_id)).order_by(Group.id))
+
+    async def list_events(self, after_id: int = 0, limit: int = 50) -> list[EventView]:
+        """
+        Get one page of events as :class:`~db.views.EventView` snapshots.
+
+        :rtype: list
+        """
+        return await self._views(
+            EventView, select_events().where(Event.id > after_id).order_by(Event.id).limit(limit)
+        )
+
+    async def list_user_events(self, user_id: int, after_id: int = 0, limit: int = 50) -> list[EventView]:
+        """
+        Get one page of the events a user attends as :class:`~db.views.EventView` snapshots.
+
+        :rtype: list
+        """
+        return await self._views(
+            EventView,
+            attended_by(select_events().where(Event.id > after_id), user_id)
+            .order_by(Event.id)
+            .limit(limit),
+        )
+
+    async def list_events_between(self, start, end, user_id: int = None) -> list[EventView]:
+        """
+        Snapshot version of :meth:`get_events_between`.
+
+        :rtype: list
+        """
+        stmt = select_events().where(Event.event_time >= start, Event.event_time < end)
+        return await self._views(EventView, attended_by(stmt, user_id).order_by(Event.event_time, Event.id))
+
+    async def list_upcoming_events(self, limit: int = 10, user_id: int = None, now=None) -> list[EventView]:
+        """
+        Snapshot version of :meth:`get_upcoming_events`.
+
+        :rtype: list
+        """
+        stmt = select_events().where(Event.event_time >= (now or datetime.now()))
+        return await self._views(
+            EventView, attended_by(stmt, user_id).order_by(Event.event_time, Event.id).limit(limit)
+        )
+
+    async def close(self):
+        """
+        Close the active database session and leave the change bus.
+
+        Safe to call more than once.
+        """
+        self._unsubscribe()
+        self._changes.close()
+        await self.session.close()
@@ -0,0 +1,173 @@
+"""
+Bounded in-process caches used by the data layer.
+
+Provides a small least-recently-used mapping with hit/miss counters, and
+a variant whose entries also expire after a time-to-live. Entries may
+carry tags (e.g. the ID of the row they were built from), so everything
+derived from one row is dropped by key, without scanning the cache. They are not
+thread-safe; each :class:`DBController` (or :class:`app.auth.AuthService`)
+owns its own instance, mirroring the one-session-per-controller model.
+"""
+
+from collections import OrderedDict
+import time
+
+MISSING = object()
+
+
+class LRUCache:
+    """
+    Least-recently-used cache with a fixed number of entries.
+
+    ``None`` is a valid cached value; :data:`MISSING` marks a miss.
+    Entries stored with ``tags`` can be dropped together with
+    :meth:`invalidate_tag`; the tag index follows evictions, so it never
+    outgrows the cache.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of entries kept before evicting the least
+            recently used one. Defaults to ``1024``.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        # tag -> keys, and key -> tags for the entries stored with tags.
+        self._tagged = {}
+        self._key_tags = {}
+
+    def get(self, key, default=MISSING):
+        """
+        Return the cached value for ``key`` and mark it as recently used.
+
+        Returns ``default`` (:data:`MISSING` when omitted) on a miss.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value, tags=()):
+        """
+        Store ``value`` under ``key``, evicting the oldest entry if full.
+
+        ``tags`` replace any tags the key had before.
+        """
+        self._untag(key)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+        if len(self._data) > self.maxsize:
+            self._untag(self._data.popitem(last=False)[0])
+
+    def _untag(self, key):
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tagged[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tagged[tag]
+
+    def _drop(self, key):
+        self._data.pop(key, None)
+        self._untag(key)
+
+    def invalidate(self, *keys):
+        """
+        Drop the given keys from the cache; unknown keys are ignored.
+        """
+        for key in keys:
+            self._drop(key)
+
+    def invalidate_tag(self, *tags):
+        """
+        Drop every entry stored with any of ``tags``; unknown tags are ignored.
+        """
+        for tag in tags:
+            for key in list(self._tagged.get(tag, ())):
+                self._drop(key)
+
+    def clear(self):
+        """
+        Drop every entry. Counters are kept.
+        """
+        self._data.clear()
+        self._tagged.clear()
+        self._key_tags.clear()
+
+    def stats(self) -> dict:
+        """
+        Return a snapshot of the cache counters.
+
+        :returns: ``{"hits", "misses", "size", "maxsize"}``.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """
+    :class:`LRUCache` whose entries also expire a fixed time after being
+    stored. Expired entries count as misses and are dropped when read.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+        ttl : float
+            Default lifetime of an entry, in seconds.
+        maxsize : int, optional
+            Maximum number of entries. Defaults to ``1024``.
+        clock : callable, optional
+            Returns the current time in seconds. Defaults to
+            :func:`time.monotonic`.
+        """
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self._clock = clock
+
+    def get(self, key, default=MISSING):
+        """
+        Return the live value for ``key``, or ``default`` when missing or expired.
+        """
+        entry = super().get(key)
+        if entry is MISSING:
+            return default
+        expires, value = entry
+        if expires <= self._clock():
+            self._drop(key)
+            self.hits -= 1
+            self.misses += 1
+            return default
+        return value
+
+    def put(self, key, value, ttl: float = None, tags=()):
+        """
+        Store ``value`` for ``ttl`` seconds (default: :attr:`ttl`).
+        """
+        super().put(key, (self._clock() + (self.ttl if ttl is None else ttl), value), tags)
+
+    def __contains__(self, key):
+        return self.get(key) is not MISSING
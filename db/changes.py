@@ -0,0 +1,242 @@
+"""
+Change Bus
+==========
+
+In-process publish/subscribe channel for data changes, so caches can
+invalidate exactly what changed instead of expiring on a timer.
+
+Every mutator of :class:`db.db_controller.DBController` (and of the async
+controller) and every write of :mod:`app.handlers.chats` publishes a
+:class:`Change`. Database changes are queued per session and only
+published after the session commits; a rollback drops them, so
+subscribers never see changes that did not happen.
+
+The bus can also append each change to a JSON-lines file that other
+processes poll with :func:`read_log`. Configuration lives in
+``vars/dev/vars.json`` under ``CHANGE_LOG``::
+
+    "CHANGE_LOG": {
+        "enabled": false,
+        "log_file": "./vars/dev/changes.jsonl"
+    }
+
+Entities and their ``id``:
+
+- ``"user"``, ``"group"``, ``"event"``: the row ID (``None`` for a bulk
+  insert whose IDs are not read back).
+- ``"group_member"``: ``(group_id, user_id)``.
+- ``"event_attendee"``: ``(event_id, user_id)``.
+- ``"chat"``, ``"chat_message"``: the chat ID.
+- ``"chat_participant"``: ``(chat_id, username)``.
+- ``"session"``: the token hash.
+
+Replacing an event's attendee list, or adding many attendees at once,
+publishes an ``"event"`` update with the field ``"attendees"``.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy import event
+from .config import get_config
+import json
+import os
+import threading
+
+CHANGE_LOG = get_config().get("CHANGE_LOG", {})
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """
+    One changed row (or chat element).
+
+    ``fields`` names the columns that were set; it is empty for deletes.
+    """
+
+    entity: str
+    id: object
+    op: str
+    fields: tuple = ()
+
+
+class ChangeBus:
+    """
+    Dispatch :class:`Change` objects to subscribers, optionally mirroring
+    them to an append-only log.
+
+    Subscribers run synchronously on the publishing thread, right after the
+    commit. They must be quick, must not raise, and must not use the
+    publishing session (it is between transactions at that point).
+    """
+
+    def __init__(self, log_file=None):
+        """
+        Parameters
+        ----------
+        log_file : str, optional
+            JSON-lines file receiving one line per change. If ``None``,
+            changes are only delivered in-process.
+        """
+        self.log_file = log_file
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback, entities=None):
+        """
+        Call ``callback(change)`` for every published change.
+
+        Parameters
+        ----------
+        callback : callable
+            Receives one :class:`Change` at a time.
+        entities : iterable of str, optional
+            Only deliver changes to these entities. Defaults to all.
+
+        Returns
+        -------
+        callable
+            Function that removes the subscription.
+        """
+        entry = (callback, frozenset(entities) if entities else None)
+        with self._lock:
+            self._subscribers = [*self._subscribers, entry]
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = [s for s in self._subscribers if s is not entry]
+
+        return unsubscribe
+
+    def publish(self, *changes):
+        """
+        Deliver ``changes`` to the subscribers and append them to the log.
+        """
+        if not changes:
+            return
+        # Subscribing replaces the list, so iterating a snapshot needs no lock.
+        for callback, entities in self._subscribers:
+            for change in changes:
+                if entities is None or change.entity in entities:
+                    callback(change)
+        if self.log_file:
+            self._write(changes)
+
+    def _write(self, changes):
+        stamp = datetime.now().isoformat(sep=" ")
+        pid = os.getpid()
+        lines = "".join(
+            json.dumps({
+                "time": stamp,
+                "pid": pid,
+                "entity": c.entity,
+                "id": c.id,
+                "op": c.op,
+                "fields": c.fields,
+            }) + "\n"
+            for c in changes
+        )
+        # One write per batch in append mode keeps lines from different
+        # processes from interleaving.
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class PendingChanges:
+    """
+    Changes made through one session, held until it commits.
+
+    The queue is published by the session's ``after_commit`` event. When
+    the outermost transaction ends any other way (rollback, close),
+    ``after_transaction_end`` drops what is left. Savepoints are ignored:
+    rolling one back fires ``after_rollback`` but must not discard the
+    changes already made in the enclosing transaction.
+    """
+
+    def __init__(self, bus: ChangeBus, session):
+        """
+        Parameters
+        ----------
+        bus : ChangeBus
+            Bus receiving the changes on commit.
+        session : sqlalchemy.orm.Session
+            Session whose transactions the queue follows (for an
+            ``AsyncSession``, its ``sync_session``).
+        """
+        self.bus = bus
+        self.session = session
+        self._queue = []
+        self._closed = False
+        event.listen(session, "after_commit", self._publish)
+        event.listen(session, "after_transaction_end", self._discard)
+
+    def add(self, *changes):
+        """
+        Queue changes until the next commit.
+        """
+        self._queue.extend(changes)
+
+    def _publish(self, session):
+        queue, self._queue = self._queue, []
+        self.bus.publish(*queue)
+
+    def _discard(self, session, transaction):
+        if transaction.parent is None:
+            self._queue.clear()
+
+    def close(self):
+        """
+        Drop queued changes and stop following the session.
+
+        Calling it again is a no-op.
+        """
+        self._queue.clear()
+        if self._closed:
+            return
+        self._closed = True
+        event.remove(self.session, "after_commit", self._publish)
+        event.remove(self.session, "after_transaction_end", self._discard)
+
+
+def read_log(log_file: str, offset: int = 0):
+    """
+    Read the changes appended to a change log since ``offset``.
+
+    A trailing line still being written is left for the next call.
+
+    Parameters
+    ----------
+    log_file : str
+        File written by a :class:`ChangeBus`.
+    offset : int, optional
+        Byte offset returned by the previous call (``0`` to start).
+
+    Returns
+    -------
+    tuple
+        ``(changes, offset)``: a list of :class:`Change` and the offset to
+        pass next time.
+    """
+    if not os.path.exists(log_file):
+        return [], offset
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    complete = data[:data.rfind(b"\n") + 1]
+    changes = []
+    for line in complete.splitlines():
+        record = json.loads(line)
+        record_id = record["id"]
+        changes.append(Change(
+            record["entity"],
+            tuple(record_id) if isinstance(record_id, list) else record_id,
+            record["op"],
+            tuple(record["fields"]),
+        ))
+    return changes, offset + len(complete)
+
+
+bus = ChangeBus(log_file=CHANGE_LOG.get("log_file") if CHANGE_LOG.get("enabled") else None)
@@ -0,0 +1,30 @@
+"""
+Application Configuration
+=========================
+
+Single, lazily-loaded view of ``vars/dev/vars.json``. Every module that
+needs configuration calls :func:`get_config` instead of opening the file
+itself, so the JSON is parsed at most once per process.
+"""
+
+from functools import lru_cache
+import json
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIG_FILE = os.path.join(BASE_DIR, "vars/dev/vars.json")
+
+
+@lru_cache(maxsize=None)
+def get_config() -> dict:
+    """
+    Load and cache the project configuration.
+
+    Returns
+    -------
+    dict
+        Parsed contents of ``vars/dev/vars.json``. Callers must treat it
+        as read-only since the same object is shared process-wide.
+    """
+    with open(CONFIG_FILE, encoding="utf-8") as file:
+        return json.load(file)
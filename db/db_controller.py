@@ -4,14 +4,27 @@ and events. This module abstracts SQLAlchemy interactions and exposes a
 simple API for authentication systems, group management, and event handling.
 """
 
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from contextlib import contextmanager
 from datetime import datetime
-from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents
-from .init_db import DB_URL
-
-engine = create_engine(DB_URL, echo=False)
-Session = sessionmaker(bind=engine)
+from sqlalchemy import delete, func, insert, inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents, UserSession
+from .views import (
+    UserView, GroupView, EventView, select_users, select_groups, select_events, to_views
+)
+from .engine import get_session_factory
+from .cache import LRUCache, MISSING
+from .changes import Change, PendingChanges, INSERT, UPDATE, DELETE, bus
+from .statements import (
+    USER_BY_ID, USER_BY_USERNAME, USER_BY_EMAIL, HAS_USERS, GROUP_BY_ID, EVENT_BY_ID,
+    IS_MEMBER, COUNT_GROUP_MEMBERS, COUNT_EVENT_ATTENDEES, SESSION_USER,
+    USER_FIELDS, GROUP_FIELDS, MEMBER_FIELDS, EVENT_FIELDS, ATTENDEE_FIELDS, SESSION_FIELDS,
+    USER_VIOLATIONS, GROUP_VIOLATIONS, is_foreign_key_violation, violation_message,
+    add_attendees, attended_by, groups_of,
+)
+
+USER_CACHE_SIZE = 1024
 
 
 class DBController:
@@ -20,17 +33,162 @@ class DBController:
     models and sessions to perform user, group, and event operations.
     """
 
-    def __init__(self):
+    def __init__(self, session_factory=None, user_cache_size=USER_CACHE_SIZE, change_bus=None):
         """
         Initialize a new SQLAlchemy session for database operations.
+
+        :param session_factory: Optional ``sessionmaker`` to draw the session
+            from (e.g. one bound to a benchmark database). Defaults to
+            :func:`db.engine.get_session_factory`.
+        :param int user_cache_size: Capacity of the read-through user cache.
+        :param change_bus: :class:`~db.changes.ChangeBus` receiving this
+            controller's changes on commit. Defaults to :data:`db.changes.bus`.
+        """
+        self.session = (session_factory or get_session_factory())()
+        # Keys are ("id", user_id) and ("username", username); values are
+        # User objects (misses are not cached), both tagged with the user ID.
+        self.user_cache = LRUCache(user_cache_size)
+        self._transaction_depth = 0
+        self.change_bus = change_bus or bus
+        self._changes = PendingChanges(self.change_bus, self.session)
+        # Own writes invalidate the cache directly (before commit); the
+        # subscription catches users changed by other controllers.
+        self._unsubscribe = self.change_bus.subscribe(self._on_user_change, entities=("user",))
+
+    # -----------------------------
+    # TRANSACTIONS
+    # -----------------------------
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several mutators as one atomic unit with a single commit.
+
+        Inside the block every mutator only flushes (so generated IDs are
+        available); the commit happens once when the outermost block exits.
+        Any exception rolls back everything done in the block. Nested
+        blocks join the outer one.
+
+        Example::
+
+            with db.transaction():
+                ok, event = db.create_event(name, description, when)
+                for uid in attendee_ids:
+                    db.add_user_to_event(uid, event.id)
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        except Exception:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.rollback()
+            raise
+        self._transaction_depth -= 1
+        if self._transaction_depth == 0:
+            self.commit()
+
+    def _commit(self, commit=True):
+        """
+        Commit, or only flush when deferred or inside :meth:`transaction`.
+        """
+        if commit and self._transaction_depth == 0:
+            self.session.commit()
+        else:
+            self.session.flush()
+
+    def _write(self, apply, commit=True, change=None, keep=None):
+        """
+        Apply a change and write it, relying on database constraints.
+
+        A standalone write (committed at once, with nothing else pending)
+        is flushed and committed directly; on a constraint violation the
+        session is rolled back, which undoes only this change. Inside
+        :meth:`transaction`, with ``commit=False`` or after earlier writes
+        left pending, the flush runs in a ``SAVEPOINT`` instead, so a
+        violation does not undo the earlier work. Either way no write lock
+        is left held when the caller wanted a commit.
+
+        :param apply: Callable staging the change on the session.
+        :param bool commit: As for the public mutators.
+        :param change: Optional callable returning the
+            :class:`~db.changes.Change` to publish, called after a
+            successful flush so generated IDs are available.
+        :param keep: Optional ORM object whose loaded attributes survive
+            the commit, so callers reading it do not trigger a refresh.
+        :returns: ``None`` on success, or the :class:`IntegrityError`.
+        """
+        conn = self.session.connection()
+        sqlite = conn.dialect.name == "sqlite"
+        # The sqlite3 module only opens a transaction before DML, so an
+        # open one means uncommitted writes. Other drivers cannot tell.
+        pending = conn.connection.dbapi_connection.in_transaction if sqlite else True
+        deferred = not commit or self._transaction_depth > 0
+
+        if not pending and not deferred:
+            try:
+                apply()
+                self.session.flush()
+            except IntegrityError as e:
+                self.session.rollback()
+                return e
+            if change:
+                self._changes.add(change())
+            self._commit_keeping(keep)
+            return None
+
+        if sqlite and not pending:
+            # A SAVEPOINT issued outside a transaction would become the
+            # transaction and its RELEASE would commit, breaking
+            # transaction() atomicity.
+            conn.exec_driver_sql("BEGIN")
+
+        error = None
+        try:
+            with self.session.begin_nested():
+                apply()
+        except IntegrityError as e:
+            error = e
+        else:
+            if change:
+                self._changes.add(change())
+        if not deferred:
+            self._commit_keeping(None if error else keep)
+        return error
+
+    def _commit_keeping(self, obj=None):
+        """
+        Commit, then restore the loaded attributes of ``obj`` (which the
+        commit expires) without querying. They match what was just written.
         """
-        self.session = Session()
+        loaded = None
+        if obj is not None:
+            state = inspect(obj)
+            loaded = {key: state.dict[key] for key in state.mapper.column_attrs.keys() if key in state.dict}
+        self.session.commit()
+        if loaded:
+            for key, value in loaded.items():
+                set_committed_value(obj, key, value)
+
+    def commit(self):
+        """
+        Commit changes left pending by mutators called with ``commit=False``.
+        """
+        self.session.commit()
+
+    def rollback(self):
+        """
+        Discard pending changes and the user cache, which may hold rows
+        that were never committed. Queued change events are dropped too.
+        """
+        self.session.rollback()
+        self.user_cache.clear()
 
     # -----------------------------
     # USERS
     # -----------------------------
 
-    def add_user(self, username: str, email: str, password_hash: str, access_level="user"):
+    def add_user(self, username: str, email: str, password_hash: str, access_level="user", commit: bool = True):
         """
         Create and persist a new user.
 
@@ -38,15 +196,11 @@ class DBController:
         :param str email: User's email address.
         :param str password_hash: Pre-hashed password.
         :param str access_level: Permission role (default: ``"user"``).
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, User)`` on success, otherwise ``(False, message)``.
         :rtype: tuple
         """
-        if self.session.query(User).filter_by(username=username).first():
-            return False, "Username already exists."
-
-        if self.session.query(User).filter_by(email=email).first():
-            return False, "Email already exists."
-
         user = User(
             username=username,
             email=email,
@@ -55,19 +209,55 @@ class DBController:
             created_at=datetime.now()
         )
 
-        self.session.add(user)
-        self.session.commit()
+        error = self._write(
+            lambda: self.session.add(user), commit,
+            lambda: Change("user", user.id, INSERT, USER_FIELDS), keep=user,
+        )
+        if error:
+            return False, violation_message(error, USER_VIOLATIONS)
+        self._invalidate_user(user.id, username)
         return True, user
 
+    def _one(self, stmt, **params):
+        """
+        Execute a pre-built single-entity lookup.
+
+        :param stmt: One of the module-level ``select()`` statements.
+        :param params: Values for its bound parameters.
+        :returns: The first matching object or ``None``.
+        """
+        return self.session.execute(stmt, params).scalars().first()
+
+    def _invalidate_user(self, user_id, *usernames):
+        """
+        Drop cached lookups for a user id and any of its usernames.
+        """
+        self.user_cache.invalidate(("id", user_id), *(("username", u) for u in usernames))
+
+    def _on_user_change(self, change: Change):
+        # Both lookups of a user are tagged with its ID; bulk inserts
+        # (no ID) cannot make anything stale, since misses are not cached.
+        if change.id is not None:
+            self.user_cache.invalidate_tag(change.id)
+
     def get_user_by_username(self, username: str):
         """
         Retrieve a user by username.
 
+        Found users are served from :attr:`user_cache`; misses always
+        query, since another process may have added the user since.
+
         :param str username: Username to query.
         :returns: User object or ``None``.
         """
-        print(self.session.query(User).filter_by(username=username).first())
-        return self.session.query(User).filter_by(username=username).first()
+        key = ("username", username)
+        user = self.user_cache.get(key)
+        if user is MISSING:
+            user = self._one(USER_BY_USERNAME, username=username)
+            if user is not None:
+                self.user_cache.put(key, user, tags=(user.id,))
+                self.user_cache.put(("id", user.id), user, tags=(user.id,))
+        return user
 
     def get_user_by_email(self, email: str):
         """
@@ -76,16 +266,88 @@ class DBController:
         :param str email: Email address.
         :returns: User object or ``None``.
         """
-        return self.session.query(User).filter_by(email=email).first()
+        return self._one(USER_BY_EMAIL, email=email)
 
     def get_user_by_id(self, user_id: int):
         """
         Retrieve a user by database ID.
 
+        Found users are served from :attr:`user_cache`; misses always
+        query, since another process may have added the user since.
+
         :param int user_id: User ID.
         :returns: User object or ``None``.
         """
-        return self.session.query(User).filter_by(id=user_id).first()
+        key = ("id", user_id)
+        user = self.user_cache.get(key)
+        if user is MISSING:
+            user = self._one(USER_BY_ID, user_id=user_id)
+            if user is not None:
+                self.user_cache.put(key, user, tags=(user.id,))
+                self.user_cache.put(("username", user.username), user, tags=(user.id,))
+        return user
+
+    def user_cache_stats(self):
+        """
+        Return hit/miss counters of the user lookup cache.
+
+        :returns: Dictionary with ``hits``, ``misses``, ``size`` and ``maxsize``.
+        :rtype: dict
+        """
+        return self.user_cache.stats()
+
+    def has_users(self) -> bool:
+        """
+        Check whether at least one user exists, without loading any.
+
+        :rtype: bool
+        """
+        return self.session.scalar(HAS_USERS)
+
+    def find_taken(self, usernames, emails):
+        """
+        Return which of the given usernames and emails are already in use.
+
+        Each list is checked with a single ``IN`` query against the unique
+        indexes, so callers can validate a whole batch at once.
+
+        :param usernames: Iterable of candidate usernames.
+        :param emails: Iterable of candidate emails.
+        :returns: ``(taken_usernames, taken_emails)``.
+        :rtype: tuple[set, set]
+        """
+        usernames, emails = set(usernames), set(emails)
+        taken_usernames = set(
+            self.session.scalars(select(User.username).where(User.username.in_(usernames)))
+        ) if usernames else set()
+        taken_emails = set(
+            self.session.scalars(select(User.email).where(User.email.in_(emails)))
+        ) if emails else set()
+        return taken_usernames, taken_emails
+
+    def add_users_bulk(self, rows, commit: bool = True) -> int:
+        """
+        Insert many users with one ``executemany`` statement.
+
+        Rows are not validated here; check them with :meth:`find_taken`
+        first.
+
+        :param rows: List of dicts with ``username``, ``email``,
+            ``password_hash`` and ``access_level`` (``created_at`` is
+            filled in when missing).
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
+        :returns: Number of inserted users.
+        :rtype: int
+        """
+        if not rows:
+            return 0
+        now = datetime.now()
+        rows = [{"created_at": now, **row} for row in rows]
+        self.session.execute(insert(User), rows)
+        self._changes.add(Change("user", None, INSERT, USER_FIELDS))
+        self._commit(commit)
+        return len(rows)
 
     def get_all_users(self):
         """
@@ -95,34 +357,86 @@ class DBController:
         :rtype: list
         """
         return self.session.query(User).all()
+
+    def get_users_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Get one page of users ordered by ID (keyset pagination).
+
+        :param int after_id: Return only users with an ID greater than this
+            (the last ID of the previous page, ``0`` for the first page).
+        :param int limit: Maximum number of users to return.
+        :returns: List of :class:`User` objects.
+        :rtype: list
+        """
+        return (
+            self.session.query(User)
+            .filter(User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+            .all()
+        )
     
-    def update_user(self, user_id: int, updates: dict):
+    def search_users(self, prefix: str, limit: int = 10):
+        """
+        Find users whose username or email starts with ``prefix``.
+
+        Each column is searched with a range scan (``col >= prefix AND
+        col < prefix + U+10FFFF``) so SQLite seeks directly into the unique
+        indexes on ``username`` and ``email`` instead of scanning the table.
+        Matching is case-sensitive.
+
+        :param str prefix: Beginning of a username or email.
+        :param int limit: Maximum number of users to return.
+        :returns: Up to ``limit`` users ordered by username.
+        :rtype: list
+        """
+        if not prefix:
+            return []
+
+        upper = prefix + "\U0010ffff"
+        matches = {}
+        for column in (User.username, User.email):
+            rows = (
+                self.session.query(User)
+                .filter(column >= prefix, column < upper)
+                .order_by(column)
+                .limit(limit)
+                .all()
+            )
+            for user in rows:
+                matches[user.id] = user
+
+        return sorted(matches.values(), key=lambda u: u.username)[:limit]
+    
+    def update_user(self, user_id: int, updates: dict, commit: bool = True):
         """
         Update fields of an existing user.
 
         :param int user_id: User ID.
         :param dict updates: Mapping of field names to new values.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, user)`` on success, otherwise ``(False, message)``.
         :rtype: tuple
         """
         user = self.get_user_by_id(user_id)
         if not user:
             return False, "User not found."
-        
-        if "username" in updates:
-            if self.session.query(User).filter_by(username=updates["username"]).first():
-                return False, "Username already exists."
-        if "email" in updates:
-            if self.session.query(User).filter_by(email=updates["email"]).first():
-                return False, "Email already exists."
 
-        for key, value in updates.items():
-            if hasattr(user, key):
-                setattr(user, key, value)
-            else:
+        for key in updates:
+            if not hasattr(user, key):
                 return False, f"Invalid field: {key}"
 
-        self.session.commit()
+        old_username = user.username
+
+        def apply():
+            for key, value in updates.items():
+                setattr(user, key, value)
+
+        error = self._write(apply, commit, lambda: Change("user", user_id, UPDATE, tuple(updates)), keep=user)
+        if error:
+            return False, violation_message(error, USER_VIOLATIONS)
+        self._invalidate_user(user_id, old_username, updates.get("username", old_username))
         return True, user
 
     # -----------------------------
@@ -136,7 +450,7 @@ class DBController:
         :param int group_id: Group identifier.
         :returns: Group object or ``None``.
         """
-        return self.session.query(Group).filter_by(id=group_id).first()
+        return self._one(GROUP_BY_ID, group_id=group_id)
 
     def get_all_groups(self):
         """
@@ -147,58 +461,70 @@ class DBController:
         """
         return self.session.query(Group).all()
 
-    def create_group(self, group_name: str, owner_id: int = None):
+    def get_groups_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of groups ordered by ID (keyset pagination).
+
+        :param int after_id: Last group ID of the previous page (``0`` first).
+        :param int limit: Maximum number of groups to return.
+        :returns: List of groups.
+        :rtype: list
+        """
+        return (
+            self.session.query(Group)
+            .filter(Group.id > after_id)
+            .order_by(Group.id)
+            .limit(limit)
+            .all()
+        )
+
+    def create_group(self, group_name: str, owner_id: int = None, commit: bool = True):
         """
         Create a new group.
 
         :param str group_name: Name of the group.
         :param int owner_id: Optional ID of the group's owner.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, Group)`` or ``(False, message)``.
         :rtype: tuple
         """
-        if self.session.query(Group).filter_by(group_name=group_name).first():
-            return False, "Group name already exists."
-        
         group = Group(
             group_name=group_name,
             owner_id=owner_id,
             created_at=datetime.now()
         )
 
-        self.session.add(group)
-        self.session.commit()
+        error = self._write(
+            lambda: self.session.add(group), commit,
+            lambda: Change("group", group.id, INSERT, GROUP_FIELDS), keep=group,
+        )
+        if error:
+            return False, violation_message(error, GROUP_VIOLATIONS)
         return True, group
 
-    def add_user_to_group(self, user_id: int, group_id: int):
+    def add_user_to_group(self, user_id: int, group_id: int, commit: bool = True):
         """
         Add a user to a group.
 
         :param int user_id: User identifier.
         :param int group_id: Group identifier.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, message)`` or ``(False, message)``.
         :rtype: tuple
         """
-        user = self.get_user_by_id(user_id)
-        group = self.session.query(Group).filter_by(id=group_id).first()
-
-        if not user:
-            return False, "User not found."
-        if not group:
-            return False, "Group not found."
-
-        exists = (
-            self.session.query(UsersInGroups)
-            .filter_by(user_id=user_id, group_id=group_id)
-            .first()
+        link = UsersInGroups(user_id=user_id, group_id=group_id)
+        error = self._write(
+            lambda: self.session.add(link), commit,
+            lambda: Change("group_member", (group_id, user_id), INSERT, MEMBER_FIELDS),
         )
-
-        if exists:
+        if error:
+            if is_foreign_key_violation(error):
+                # Only the failure path pays for finding out which ID was wrong.
+                return False, "User not found." if not self.get_user_by_id(user_id) else "Group not found."
             return False, "User already in this group."
 
-        link = UsersInGroups(user_id=user_id, group_id=group_id)
-        self.session.add(link)
-        self.session.commit()
-
         return True, "User added to group."
 
     def get_users_from_group(self, group_id: int):
@@ -208,9 +534,65 @@ class DBController:
         :param int group_id: Group identifier.
         :returns: List of users or ``None``.
         """
-        group = self.session.query(Group).filter_by(id=group_id).first()
+        group = self._one(GROUP_BY_ID, group_id=group_id)
         return group.users if group else None
 
+    def is_member(self, user_id: int, group_id: int) -> bool:
+        """
+        Check group membership with an ``EXISTS`` query on the link table.
+
+        :param int user_id: User identifier.
+        :param int group_id: Group identifier.
+        :rtype: bool
+        """
+        return self.session.scalar(IS_MEMBER, {"user_id": user_id, "group_id": group_id})
+
+    def count_group_members(self, group_id: int) -> int:
+        """
+        Count the members of a group without loading them.
+
+        :param int group_id: Group identifier.
+        :rtype: int
+        """
+        return self.session.scalar(COUNT_GROUP_MEMBERS, {"group_id": group_id})
+
+    def member_counts(self, group_ids) -> dict:
+        """
+        Count members of several groups with one ``GROUP BY`` query.
+
+        :param group_ids: Iterable of group identifiers.
+        :returns: Mapping ``group_id -> member count`` (``0`` for empty or
+            unknown groups).
+        :rtype: dict
+        """
+        group_ids = set(group_ids)
+        counts = dict.fromkeys(group_ids, 0)
+        if group_ids:
+            counts.update(self.session.execute(
+                select(UsersInGroups.group_id, func.count())
+                .where(UsersInGroups.group_id.in_(group_ids))
+                .group_by(UsersInGroups.group_id)
+            ).all())
+        return counts
+
+    def get_group_members_page(self, group_id: int, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of a group's members ordered by user ID.
+
+        :param int group_id: Group identifier.
+        :param int after_id: Last user ID of the previous page (``0`` first).
+        :param int limit: Maximum number of users to return.
+        :returns: List of users.
+        """
+        return (
+            self.session.query(User)
+            .join(UsersInGroups, UsersInGroups.user_id == User.id)
+            .filter(UsersInGroups.group_id == group_id, User.id > after_id)
+            .order_by(User.id)
+            .limit(limit)
+            .all()
+        )
+
     def get_groups_from_user(self, user_id: int):
         """
         Retrieve groups that a user belongs to.
@@ -221,57 +603,68 @@ class DBController:
         user = self.get_user_by_id(user_id)
         return user.groups if user else None
     
-    def update_group_name(self, group_id, new_name):
+    def update_group_name(self, group_id, new_name, commit: bool = True):
         """
         Rename a group.
 
         :param int group_id: Group identifier.
         :param str new_name: New group name.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, group)`` or ``(False, message)``.
         """
         group = self.get_group_by_id(group_id)
         if not group:
             return False, "Group not found."
 
-        group.group_name = new_name
-        self.session.commit()
+        error = self._write(
+            lambda: setattr(group, "group_name", new_name), commit,
+            lambda: Change("group", group_id, UPDATE, ("group_name",)), keep=group,
+        )
+        if error:
+            return False, violation_message(error, GROUP_VIOLATIONS)
         return True, group
     
-    def remove_user_from_group(self, user_id, group_id):
+    def remove_user_from_group(self, user_id, group_id, commit: bool = True):
         """
         Remove a user from a group.
 
         :param int user_id: User identifier.
         :param int group_id: Group identifier.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, message)`` or ``(False, message)``.
         """
-        link = (
-            self.session.query(UsersInGroups)
-            .filter_by(user_id=user_id, group_id=group_id)
-            .first()
+        result = self.session.execute(
+            delete(UsersInGroups)
+            .where(UsersInGroups.user_id == user_id, UsersInGroups.group_id == group_id)
         )
 
-        if not link:
+        if result.rowcount == 0:
             return False, "User is not in this group."
 
-        self.session.delete(link)
-        self.session.commit()
+        self._changes.add(Change("group_member", (group_id, user_id), DELETE))
+        self._commit(commit)
         return True, "User removed from group."
 
-    def delete_group(self, group_id):
+    def delete_group(self, group_id, commit: bool = True):
         """
         Delete a group and its membership links.
 
+        Issues a single ``DELETE``; membership rows are removed by the
+        database through ``ON DELETE CASCADE``.
+
         :param int group_id: Group identifier.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, message)`` or ``(False, message)``.
         """
-        group = self.session.query(Group).filter_by(id=group_id).first()
-        if not group:
+        result = self.session.execute(delete(Group).where(Group.id == group_id))
+        if result.rowcount == 0:
             return False, "Group not found."
 
-        self.session.query(UsersInGroups).filter_by(group_id=group_id).delete()
-        self.session.delete(group)
-        self.session.commit()
+        self._changes.add(Change("group", group_id, DELETE))
+        self._commit(commit)
 
         return True, "Group deleted successfully."
 
@@ -302,13 +695,15 @@ class DBController:
     # EVENTS
     # -----------------------------
 
-    def create_event(self, event_name: str, description: str, event_time):
+    def create_event(self, event_name: str, description: str, event_time, commit: bool = True):
         """
         Create a new event.
 
         :param str event_name: Title of the event.
         :param str description: Event description.
         :param datetime event_time: Scheduled time.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, Event)``.
         """
         event = Event(
@@ -317,32 +712,63 @@ class DBController:
             event_time=event_time
         )
         self.session.add(event)
-        self.session.commit()
+        self.session.flush()
+        self._changes.add(Change("event", event.id, INSERT, EVENT_FIELDS))
+        self._commit(commit)
         return True, event
 
-    def add_user_to_event(self, user_id: int, event_id: int):
+    def add_user_to_event(self, user_id: int, event_id: int, commit: bool = True):
         """
         Add a user as an event attendee.
 
         :param int user_id: User identifier.
         :param int event_id: Event identifier.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, message)`` or ``(False, message)``.
         """
-        exists = (
-            self.session.query(UsersAttendingEvents)
-            .filter_by(user_id=user_id, event_id=event_id)
-            .first()
+        link = UsersAttendingEvents(user_id=user_id, event_id=event_id)
+        error = self._write(
+            lambda: self.session.add(link), commit,
+            lambda: Change("event_attendee", (event_id, user_id), INSERT, ATTENDEE_FIELDS),
         )
-
-        if exists:
+        if error:
+            if is_foreign_key_violation(error):
+                return False, "User not found." if not self.get_user_by_id(user_id) else "Event not found."
             return False, "User already attending."
 
-        link = UsersAttendingEvents(user_id=user_id, event_id=event_id)
-        self.session.add(link)
-        self.session.commit()
-
         return True, "User added to event."
 
+    def add_users_to_event(self, event_id: int, user_ids, commit: bool = True):
+        """
+        Add many attendees to an event with a single statement.
+
+        Unknown and duplicate user IDs, and users already attending, are
+        skipped. Publishes one ``"event"`` change with the field
+        ``"attendees"``.
+
+        :param int event_id: Event identifier.
+        :param user_ids: Iterable of user IDs.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
+        :returns: ``(True, added_count)`` or ``(False, message)``.
+        :rtype: tuple
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return True, 0
+
+        added = []
+        error = self._write(
+            lambda: added.append(self.session.execute(add_attendees(event_id, user_ids)).rowcount),
+            commit,
+            lambda: Change("event", event_id, UPDATE, ("attendees",)),
+        )
+        if error:
+            # Users are filtered by the SELECT, so only the event can be missing.
+            return False, "Event not found."
+        return True, added[0]
+
     def get_events_from_user(self, user_id: int):
         """
         Retrieve events associated with a user.
@@ -352,6 +778,24 @@ class DBController:
         """
         user = self.get_user_by_id(user_id)
         return user.events if user else None
+
+    def get_user_events_page(self, user_id: int, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of the events a user attends, ordered by event ID.
+
+        :param int user_id: User identifier.
+        :param int after_id: Last event ID of the previous page (``0`` first).
+        :param int limit: Maximum number of events to return.
+        :returns: List of events.
+        """
+        return (
+            self.session.query(Event)
+            .join(UsersAttendingEvents, UsersAttendingEvents.event_id == Event.id)
+            .filter(UsersAttendingEvents.user_id == user_id, Event.id > after_id)
+            .order_by(Event.id)
+            .limit(limit)
+            .all()
+        )
     
     def get_all_events(self):
         """
@@ -360,26 +804,76 @@ class DBController:
         :returns: List of events.
         """
         return self.session.query(Event).all()
+
+    def get_events_page(self, after_id: int = 0, limit: int = 50):
+        """
+        Retrieve one page of events ordered by ID (keyset pagination).
+
+        :param int after_id: Last event ID of the previous page (``0`` first).
+        :param int limit: Maximum number of events to return.
+        :returns: List of events.
+        """
+        return (
+            self.session.query(Event)
+            .filter(Event.id > after_id)
+            .order_by(Event.id)
+            .limit(limit)
+            .all()
+        )
     
-    def update_event(self, event_id: int, updates: dict):
+    def get_events_between(self, start, end, user_id: int = None):
+        """
+        Retrieve events scheduled in ``[start, end)``, ordered by time.
+
+        Uses the index on ``events.event_time``; when ``user_id`` is given,
+        results are restricted to events that user attends.
+
+        :param datetime start: Inclusive lower bound.
+        :param datetime end: Exclusive upper bound.
+        :param int user_id: Optional attendee filter.
+        :returns: List of events.
+        """
+        stmt = attended_by(
+            select(Event).where(Event.event_time >= start, Event.event_time < end), user_id
+        )
+        return list(self.session.scalars(stmt.order_by(Event.event_time, Event.id)))
+
+    def get_upcoming_events(self, limit: int = 10, user_id: int = None, now=None):
+        """
+        Retrieve the next ``limit`` events scheduled at or after ``now``.
+
+        :param int limit: Maximum number of events to return.
+        :param int user_id: Optional attendee filter.
+        :param datetime now: Reference time (default: current time).
+        :returns: List of events ordered by time.
+        """
+        stmt = attended_by(select(Event).where(Event.event_time >= (now or datetime.now())), user_id)
+        return list(self.session.scalars(stmt.order_by(Event.event_time, Event.id).limit(limit)))
+    
+    def update_event(self, event_id: int, updates: dict, commit: bool = True):
         """
         Update an event's fields.
 
         :param int event_id: Event identifier.
         :param dict updates: Field/value mappings.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, event)`` or ``(False, message)``.
         """
-        event = self.session.query(Event).filter_by(id=event_id).first()
+        event = self._one(EVENT_BY_ID, event_id=event_id)
         if not event:
             return False, "Event not found."
-        
-        for key, value in updates.items():
-            if hasattr(event, key):
-                setattr(event, key, value)
-            else:
+
+        # Check every key first, so a bad one leaves nothing dirty in the session.
+        for key in updates:
+            if not hasattr(event, key):
                 return False, f"Invalid field: {key}"
 
-        self.session.commit()
+        for key, value in updates.items():
+            setattr(event, key, value)
+
+        self._changes.add(Change("event", event_id, UPDATE, tuple(updates)))
+        self._commit(commit)
         return True, event
     
     def get_event_by_id(self, event_id: int):
@@ -389,7 +883,7 @@ class DBController:
         :param int event_id: Event identifier.
         :returns: Event object or ``None``.
         """
-        return self.session.query(Event).filter_by(id=event_id).first()
+        return self._one(EVENT_BY_ID, event_id=event_id)
     
     def get_attendees_from_event(self, event_id: int):
         """
@@ -410,39 +904,267 @@ class DBController:
         )
         return attendees
     
-    def set_event_attendees(self, event_id: int, new_attendee_ids: list[int]):
+    def count_event_attendees(self, event_id: int) -> int:
+        """
+        Count the attendees of an event without loading them.
+
+        :param int event_id: Event identifier.
+        :rtype: int
+        """
+        return self.session.scalar(COUNT_EVENT_ATTENDEES, {"event_id": event_id})
+
+    def attendee_counts(self, event_ids) -> dict:
+        """
+        Count attendees of several events with one ``GROUP BY`` query.
+
+        :param event_ids: Iterable of event identifiers.
+        :returns: Mapping ``event_id -> attendee count``.
+        :rtype: dict
+        """
+        event_ids = set(event_ids)
+        counts = dict.fromkeys(event_ids, 0)
+        if event_ids:
+            counts.update(self.session.execute(
+                select(UsersAttendingEvents.event_id, func.count())
+                .where(UsersAttendingEvents.event_id.in_(event_ids))
+                .group_by(UsersAttendingEvents.event_id)
+            ).all())
+        return counts
+
+    def set_event_attendees(self, event_id: int, new_attendee_ids: list[int], commit: bool = True):
         """
         Replace all attendees of an event.
 
+        Unknown and duplicate user IDs are ignored.
+
         :param int event_id: Event identifier.
         :param list[int] new_attendee_ids: User IDs to assign.
-        :returns: ``(True, message)``.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
+        :returns: ``(True, message)`` or ``(False, message)``.
         """
-        self.session.query(UsersAttendingEvents).filter_by(event_id=event_id).delete()
+        if not self.session.get(Event, event_id):
+            return False, "Event not found."
 
-        for uid in new_attendee_ids:
-            self.session.add(UsersAttendingEvents(user_id=uid, event_id=event_id))
+        self.session.execute(delete(UsersAttendingEvents).where(UsersAttendingEvents.event_id == event_id))
+        if new_attendee_ids:
+            self.session.execute(add_attendees(event_id, new_attendee_ids))
 
-        self.session.commit()
+        self._changes.add(Change("event", event_id, UPDATE, ("attendees",)))
+        self._commit(commit)
         return True, "Attendees updated successfully."
 
-    def delete_event(self, event_id: int):
+    def delete_event(self, event_id: int, commit: bool = True):
         """
         Delete an event.
 
+        Issues a single ``DELETE``; attendee rows are removed by the
+        database through ``ON DELETE CASCADE``.
+
         :param int event_id: Event identifier.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
         :returns: ``(True, message)`` or ``(False, message)``.
         """
-        event = self.get_event_by_id(event_id)
-        if not event:
+        result = self.session.execute(delete(Event).where(Event.id == event_id))
+        if result.rowcount == 0:
             return False, "Event not found."
 
-        self.session.delete(event)
-        self.session.commit()
+        self._changes.add(Change("event", event_id, DELETE))
+        self._commit(commit)
         return True, "Event deleted."
 
+    # -----------------------------
+    # SESSIONS
+    # -----------------------------
+
+    def create_session(self, user_id: int, token_hash: str, expires_at, commit: bool = True):
+        """
+        Store a login session.
+
+        :param int user_id: Authenticated user.
+        :param str token_hash: Hex SHA-256 of the session token.
+        :param datetime expires_at: End of validity.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
+        :returns: ``(True, message)`` or ``(False, message)``.
+        """
+        row = UserSession(
+            token_hash=token_hash,
+            user_id=user_id,
+            created_at=datetime.now(),
+            expires_at=expires_at
+        )
+        error = self._write(
+            lambda: self.session.add(row), commit,
+            lambda: Change("session", token_hash, INSERT, SESSION_FIELDS),
+        )
+        if error:
+            return False, "User not found." if is_foreign_key_violation(error) else "Session already exists."
+        return True, "Session created."
+
+    def get_session(self, token_hash: str, now=None):
+        """
+        Resolve a live session to its user with one indexed query.
+
+        :param str token_hash: Hex SHA-256 of the session token.
+        :param datetime now: Reference time (default: current time).
+        :returns: ``(UserView, expires_at)``, or ``None`` if the session is
+            unknown or expired.
+        """
+        row = self.session.execute(
+            SESSION_USER, {"token_hash": token_hash, "now": now or datetime.now()}
+        ).first()
+        if row is None:
+            return None
+        return UserView(*row[:-1]), row[-1]
+
+    def delete_session(self, token_hash: str, commit: bool = True) -> bool:
+        """
+        Delete a session (logout).
+
+        :param str token_hash: Hex SHA-256 of the session token.
+        :param bool commit: Commit immediately (default). If ``False``, or
+            inside :meth:`transaction`, changes are only flushed.
+        :returns: ``True`` if a session was deleted.
+        """
+        result = self.session.execute(delete(UserSession).where(UserSession.token_hash == token_hash))
+        if result.rowcount == 0:
+            return False
+        self._changes.add(Change("session", token_hash, DELETE))
+        self._commit(commit)
+        return True
+
+    # -----------------------------
+    # READ MODELS
+    # -----------------------------
+    # Column-only queries returning the immutable snapshots of db.views.
+    # Nothing is added to the session, so these rows are never expired by
+    # a commit; use them for listings and the ORM getters for edits.
+
+    def _views(self, view, stmt):
+        return to_views(view, self.session.execute(stmt))
+
+    def list_users(self, after_id: int = 0, limit: int = 50) -> list[UserView]:
+        """
+        Get one page of users as :class:`~db.views.UserView` snapshots.
+
+        :param int after_id: Last user ID of the previous page (``0`` first).
+        :param int limit: Maximum number of users to return.
+        :rtype: list
+        """
+        return self._views(
+            UserView, select_users().where(User.id > after_id).order_by(User.id).limit(limit)
+        )
+
+    def list_group_members(self, group_id: int, after_id: int = 0, limit: int = 50) -> list[UserView]:
+        """
+        Get one page of a group's members as :class:`~db.views.UserView` snapshots.
+
+        :param int group_id: Group identifier.
+        :param int after_id: Last user ID of the previous page (``0`` first).
+        :param int limit: Maximum number of users to return.
+        :rtype: list
+        """
+        return self._views(
+            UserView,
+            select_users()
+            .join(UsersInGroups, UsersInGroups.user_id == User.id)
+            .where(UsersInGroups.group_id == group_id, User.id > after_id)
+            .order_by(User.id)
+            .limit(limit),
+        )
+
+    def list_groups(self, after_id: int = 0, limit: int = 50) -> list[GroupView]:
+        """
+        Get one page of groups as :class:`~db.views.GroupView` snapshots.
+
+        The owner's username comes from the same query, so no per-row
+        user lookup is needed to display it.
+
+        :param int after_id: Last group ID of the previous page (``0`` first).
+        :param int limit: Maximum number of groups to return.
+        :rtype: list
+        """
+        return self._views(
+            GroupView, select_groups().where(Group.id > after_id).order_by(Group.id).limit(limit)
+        )
+
+    def list_user_groups(self, user_id: int) -> list[GroupView]:
+        """
+        Get the groups a user owns or is a member of, ordered by ID.
+
+        Replaces the :meth:`get_groups_by_owner` plus
+        :meth:`get_groups_by_member` pair with one query that returns each
+        group once.
+
+        :param int user_id: User identifier.
+        :rtype: list
+        """
+        return self._views(GroupView, select_groups().where(groups_of(user_id)).order_by(Group.id))
+
+    def list_events(self, after_id: int = 0, limit: int = 50) -> list[EventView]:
+        """
+        Get one page of events as :class:`~db.views.EventView` snapshots.
+
+        :param int after_id: Last event ID of the previous page (``0`` first).
+        :param int limit: Maximum number of events to return.
+        :rtype: list
+        """
+        return self._views(
+            EventView, select_events().where(Event.id > after_id).order_by(Event.id).limit(limit)
+        )
+
+    def list_user_events(self, user_id: int, after_id: int = 0, limit: int = 50) -> list[EventView]:
+        """
+        Get one page of the events a user attends as :class:`~db.views.EventView` snapshots.
+
+        :param int user_id: User identifier.
+        :param int after_id: Last event ID of the previous page (``0`` first).
+        :param int limit: Maximum number of events to return.
+        :rtype: list
+        """
+        return self._views(
+            EventView,
+            attended_by(select_events().where(Event.id > after_id), user_id)
+            .order_by(Event.id)
+            .limit(limit),
+        )
+
+    def list_events_between(self, start, end, user_id: int = None) -> list[EventView]:
+        """
+        Snapshot version of :meth:`get_events_between`.
+
+        :param datetime start: Inclusive lower bound.
+        :param datetime end: Exclusive upper bound.
+        :param int user_id: Optional attendee filter.
+        :rtype: list
+        """
+        stmt = select_events().where(Event.event_time >= start, Event.event_time < end)
+        return self._views(EventView, attended_by(stmt, user_id).order_by(Event.event_time, Event.id))
+
+    def list_upcoming_events(self, limit: int = 10, user_id: int = None, now=None) -> list[EventView]:
+        """
+        Snapshot version of :meth:`get_upcoming_events`.
+
+        :param int limit: Maximum number of events to return.
+        :param int user_id: Optional attendee filter.
+        :param datetime now: Reference time (default: current time).
+        :rtype: list
+        """
+        stmt = select_events().where(Event.event_time >= (now or datetime.now()))
+        return self._views(
+            EventView, attended_by(stmt, user_id).order_by(Event.event_time, Event.id).limit(limit)
+        )
+
     def close(self):
         """
-        Close the active database session.
+        Close the active database session and leave the change bus.
+
+        Changes still waiting for a commit are discarded. It is
+        safe to call more than once (``AuthService.close`` already closes
+        the controller it wraps).
         """
+        self._unsubscribe()
+        self._changes.close()
         self.session.close()
@@ -0,0 +1,143 @@
+"""
+Engine Factory
+==============
+
+Creates the application's single SQLAlchemy engine on first use and makes
+sure the schema exists. Schema creation is skipped entirely when the
+version stamp stored in the SQLite ``user_version`` header matches
+:data:`db.schema.SCHEMA_VERSION`, so a normal restart costs one pragma
+read instead of a reflection query per table.
+
+Main features:
+- Lazily created engine and ``sessionmaker`` shared by the whole process.
+- Pragma profile installed before the first connection is opened.
+- Version-stamped schema creation (``PRAGMA user_version``).
+- Unique indexes added by a later schema version are only created once
+  the existing rows satisfy them; otherwise startup stops and names the
+  maintenance command that fixes the data.
+"""
+
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.orm import sessionmaker
+from .config import get_config
+from .pragmas import install_pragmas
+from .schema import Base, SCHEMA_VERSION
+
+_engine = None
+_session_factory = None
+
+# Command that removes the duplicates blocking a unique index, by index name.
+DEDUPE_COMMANDS = {
+    "ix_groups_group_name": "python -m db.maintenance dedupe-group-names",
+}
+
+
+def find_duplicates(conn, index) -> list:
+    """
+    Return up to five key values that occur more than once for ``index``.
+
+    Rows with a ``NULL`` key are ignored, as unique indexes allow them.
+    """
+    columns = list(index.columns)
+    stmt = (
+        select(*columns)
+        .where(*(c.is_not(None) for c in columns))
+        .group_by(*columns)
+        .having(func.count() > 1)
+        .limit(5)
+    )
+    return [tuple(row) for row in conn.execute(stmt)]
+
+
+def _check_unique_indexes(engine):
+    """
+    Raise before creating a unique index that existing rows would violate.
+    """
+    with engine.connect() as conn:
+        existing_tables = set(inspect(conn).get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            present = {ix["name"] for ix in inspect(conn).get_indexes(table.name)}
+            for index in table.indexes:
+                if not index.unique or index.name in present:
+                    continue
+                duplicates = find_duplicates(conn, index)
+                if duplicates:
+                    values = ", ".join(repr(d[0] if len(d) == 1 else d) for d in duplicates)
+                    fix = DEDUPE_COMMANDS.get(index.name, "remove the duplicates")
+                    raise RuntimeError(
+                        f"Cannot create unique index {index.name}: {table.name} has duplicate "
+                        f"values ({values}). Run `{fix}`, then start again."
+                    )
+
+
+def ensure_schema(engine) -> bool:
+    """
+    Create missing tables and indexes unless the schema stamp is current.
+
+    On SQLite the stamp is the database ``user_version``; other backends
+    always run the (idempotent) creation.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Engine to check and, if needed, update.
+
+    Returns
+    -------
+    bool
+        ``True`` if the schema was (re)created, ``False`` if it was skipped.
+
+    Raises
+    ------
+    RuntimeError
+        If existing rows violate a unique index this version adds. Nothing
+        is changed and the stamp is left as it was.
+    """
+    is_sqlite = engine.dialect.name == "sqlite"
+
+    if is_sqlite:
+        with engine.connect() as conn:
+            if conn.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION:
+                return False
+
+    _check_unique_indexes(engine)
+    Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, including indexes added to
+    # them in later schema versions.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    if is_sqlite:
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+    return True
+
+
+def get_engine():
+    """
+    Return the process-wide engine, creating it on first call.
+
+    The URL comes from ``DB_URL`` in ``vars.json`` and SQL echo from the
+    optional ``DB_ECHO`` flag (default ``False``).
+    """
+    global _engine
+    if _engine is None:
+        config = get_config()
+        engine = create_engine(config["DB_URL"], echo=config.get("DB_ECHO", False))
+        install_pragmas(engine)
+        ensure_schema(engine)
+        _engine = engine
+    return _engine
+
+
+def get_session_factory():
+    """
+    Return the process-wide ``sessionmaker`` bound to :func:`get_engine`.
+    """
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(bind=get_engine())
+    return _session_factory
@@ -0,0 +1,312 @@
+"""
+Streaming Data Export
+=====================
+
+Dumps every table, plus the chats stored in ``vars/dev/chats.xml``, to
+gzip-compressed JSONL or CSV files for the data warehouse. Run from the
+project root::
+
+    python -m db.export --format jsonl --out-dir ./exports
+
+Main features:
+- Rows are read in chunks with the ``yield_per`` execution option and
+  written as they arrive, so memory use does not grow with table size.
+- Only columns are selected; no ORM objects enter the session.
+- Chats are parsed once, incrementally, with :func:`xml.etree.ElementTree.iterparse`
+  and split into ``chats``, ``chat_participants`` and ``chat_messages`` on
+  the fly; handled elements are cleared and detached, so memory use does
+  not grow with the file either.
+- Password hashes are never exported.
+"""
+
+from sqlalchemy import select
+from contextlib import ExitStack
+from datetime import datetime
+import xml.etree.ElementTree as ET
+import argparse
+import csv
+import gzip
+import json
+import os
+import time
+
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents
+from .engine import get_engine
+from .config import BASE_DIR
+
+CHUNK_SIZE = 1000
+CHATS_FILE = os.path.join(BASE_DIR, "vars", "dev", "chats.xml")
+
+TABLES = {
+    "users": (User.id, User.username, User.email, User.created_at, User.access_level),
+    "groups": (Group.id, Group.group_name, Group.created_at, Group.owner_id),
+    "users_in_groups": (UsersInGroups.user_id, UsersInGroups.group_id),
+    "events": (Event.id, Event.event_name, Event.description, Event.event_time, Event.owner_id),
+    "users_attending_events": (UsersAttendingEvents.user_id, UsersAttendingEvents.event_id),
+}
+
+CHAT_STREAMS = {
+    "chats": ("chat_id", "name", "owner", "latest_timestamp"),
+    "chat_participants": ("chat_id", "username"),
+    "chat_messages": ("chat_id", "sender", "content", "timestamp"),
+}
+
+
+def iter_table(name: str, engine=None, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield the rows of an exported table as dictionaries.
+
+    Parameters
+    ----------
+    name : str
+        Key of :data:`TABLES`.
+    engine : sqlalchemy.engine.Engine, optional
+        Source engine. Defaults to :func:`db.engine.get_engine`.
+    chunk_size : int
+        Rows fetched from the cursor at a time.
+
+    Yields
+    ------
+    dict
+        Column name to value, in primary-key order.
+    """
+    columns = TABLES[name]
+    stmt = select(*columns).order_by(*columns[0].table.primary_key.columns)
+    engine = engine or get_engine()
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for partition in result.mappings().partitions():
+            for row in partition:
+                yield dict(row)
+
+
+def iter_chat_rows(chats_file: str = CHATS_FILE):
+    """
+    Yield the rows of every chat stream in one incremental parse of the
+    chats XML.
+
+    Participants and messages are yielded as soon as their element ends
+    and are then detached from their chat; each finished ``<chat>`` is
+    yielded, cleared and detached from the root. Memory use therefore stays constant however
+    many chats or messages the file holds.
+
+    Parameters
+    ----------
+    chats_file : str
+        Path to the chats XML file. A missing or empty file yields nothing.
+
+    Yields
+    ------
+    tuple
+        ``(stream, row)``, where ``stream`` is a key of :data:`CHAT_STREAMS`.
+    """
+    if not os.path.exists(chats_file) or os.path.getsize(chats_file) == 0:
+        return
+
+    root = chat = chat_id = None
+    for event, elem in ET.iterparse(chats_file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            elif elem.tag == "chat":
+                chat, chat_id = elem, elem.get("id")
+            continue
+        if elem.tag == "participant":
+            yield "chat_participants", {"chat_id": chat_id, "username": elem.text}
+            chat.remove(elem)
+        elif elem.tag == "message":
+            yield "chat_messages", {
+                "chat_id": chat_id,
+                "sender": elem.findtext("sender"),
+                "content": elem.findtext("content"),
+                "timestamp": elem.findtext("timestamp"),
+            }
+            chat.remove(elem)
+        elif elem.tag == "chat":
+            yield "chats", {
+                "chat_id": chat_id,
+                "name": elem.findtext("name"),
+                "owner": elem.findtext("owner"),
+                "latest_timestamp": elem.findtext("latest_timestamp"),
+            }
+            elem.clear()
+            root.remove(elem)
+
+
+def iter_chats(stream: str, chats_file: str = CHATS_FILE):
+    """
+    Yield rows of one chat stream.
+
+    Convenience filter over :func:`iter_chat_rows`; to export several
+    streams, use that function directly so the file is parsed only once.
+
+    Parameters
+    ----------
+    stream : str
+        Key of :data:`CHAT_STREAMS`.
+    chats_file : str
+        Path to the chats XML file. A missing or empty file yields nothing.
+
+    Yields
+    ------
+    dict
+        One row of the requested stream.
+    """
+    for name, row in iter_chat_rows(chats_file):
+        if name == stream:
+            yield row
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _row_writer(file, columns, fmt: str):
+    """
+    Return a function writing one row to an open text file.
+    """
+    if fmt == "csv":
+        writer = csv.DictWriter(file, fieldnames=list(columns))
+        writer.writeheader()
+        return lambda row: writer.writerow({k: _serialize(v) for k, v in row.items()})
+
+    def write(row):
+        file.write(json.dumps({k: _serialize(v) for k, v in row.items()}))
+        file.write("\n")
+    return write
+
+
+def _open_output(path: str):
+    return gzip.open(path, "wt", encoding="utf-8", newline="")
+
+
+def write_rows(rows, path: str, columns, fmt: str = "jsonl") -> int:
+    """
+    Write rows to a gzip-compressed JSONL or CSV file, one row at a time.
+
+    Parameters
+    ----------
+    rows : iterable of dict
+        Rows to write.
+    path : str
+        Destination file.
+    columns : sequence of str
+        Column names, used as the CSV header.
+    fmt : str
+        ``"jsonl"`` or ``"csv"``.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    count = 0
+    with _open_output(path) as file:
+        write = _row_writer(file, columns, fmt)
+        for row in rows:
+            write(row)
+            count += 1
+    return count
+
+
+def write_chat_streams(streams, out_dir: str, fmt: str = "jsonl",
+                       chats_file: str = CHATS_FILE) -> dict:
+    """
+    Write the requested chat streams from a single parse of the chats XML.
+
+    Parameters
+    ----------
+    streams : iterable of str
+        Keys of :data:`CHAT_STREAMS`. Each gets its own
+        ``<stream>.<fmt>.gz`` file in ``out_dir``.
+    out_dir : str
+        Existing output directory.
+    fmt : str
+        ``"jsonl"`` or ``"csv"``.
+    chats_file : str
+        Path to the chats XML file.
+
+    Returns
+    -------
+    dict
+        Number of rows written per stream.
+    """
+    counts = {name: 0 for name in streams}
+    with ExitStack() as stack:
+        writers = {}
+        for name in counts:
+            file = stack.enter_context(_open_output(os.path.join(out_dir, f"{name}.{fmt}.gz")))
+            writers[name] = _row_writer(file, CHAT_STREAMS[name], fmt)
+        for name, row in iter_chat_rows(chats_file):
+            if name in writers:
+                writers[name](row)
+                counts[name] += 1
+    return counts
+
+
+def export_all(out_dir: str, fmt: str = "jsonl", tables=None, engine=None,
+               chats_file: str = CHATS_FILE, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Export database tables and chat streams to ``out_dir``.
+
+    Parameters
+    ----------
+    out_dir : str
+        Output directory, created if missing. Files are named
+        ``<table>.<fmt>.gz``.
+    fmt : str
+        ``"jsonl"`` or ``"csv"``.
+    tables : iterable of str, optional
+        Subset of :data:`TABLES` and :data:`CHAT_STREAMS` to export.
+        Defaults to all of them.
+    engine : sqlalchemy.engine.Engine, optional
+        Source engine. Defaults to :func:`db.engine.get_engine`.
+    chats_file : str
+        Path to the chats XML file.
+    chunk_size : int
+        Rows fetched from the database at a time.
+
+    Returns
+    -------
+    dict
+        Number of rows written per table.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tables = list(tables or [*TABLES, *CHAT_STREAMS])
+    unknown = [name for name in tables if name not in TABLES and name not in CHAT_STREAMS]
+    if unknown:
+        raise ValueError(f"Unknown table: {unknown[0]}")
+
+    counts = {}
+    for name in tables:
+        if name in TABLES:
+            path = os.path.join(out_dir, f"{name}.{fmt}.gz")
+            columns = [c.key for c in TABLES[name]]
+            counts[name] = write_rows(iter_table(name, engine, chunk_size), path, columns, fmt)
+    streams = [name for name in tables if name in CHAT_STREAMS]
+    if streams:
+        counts.update(write_chat_streams(streams, out_dir, fmt, chats_file))
+    return {name: counts[name] for name in tables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export all data to compressed JSONL or CSV.")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--out-dir", default="./exports")
+    parser.add_argument("--tables", nargs="*", choices=[*TABLES, *CHAT_STREAMS])
+    parser.add_argument("--chats-file", default=CHATS_FILE)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = export_all(args.out_dir, args.format, args.tables,
+                        chats_file=args.chats_file, chunk_size=args.chunk_size)
+    for name, count in counts.items():
+        print(f"{name}: {count}")
+    print(f"done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
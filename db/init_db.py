@@ -1,63 +1,38 @@
 """
 Database Initialization and Utilities Module.
 
-This module provides functionality to initialize the database, 
-seed it with sample data, and perform basic utility operations 
-like password hashing.
+This module provides functionality to initialize the database 
+and seed it with sample data.
 
 Modules
 -------
 - sqlalchemy: ORM for database interactions.
 - datetime: Date and time handling.
-- hashlib: Password hashing using SHA-256.
-- json, os: Configuration file loading and path handling.
+- db.passwords: Salted password hashing.
 
 Functions
 ---------
-- hash_password(password: str) -> str
-    Hashes a password using SHA-256.
 - init_db(seed: bool = True)
     Initializes the database and optionally seeds it with initial data.
+- main()
+    Command-line entry point; ``--users``, ``--groups``, ``--events``,
+    ``--chats`` and ``--messages`` add a synthetic dataset generated by
+    :func:`db.seed.seed_synthetic`.
 
 Notes
 -----
-- Configuration data is read from "vars/dev/vars.json".
-- The database URL must be defined under the "DB_URL" key.
+- The engine, configuration and schema creation come from
+  :mod:`db.engine`; the database URL is the "DB_URL" key of
+  "vars/dev/vars.json".
 - This module can be run as a script to initialize the database directly.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from datetime import datetime
-from .schema import Base, User, Group, Event
-import hashlib
-import json
-import os
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-with open(os.path.join(BASE_DIR, "vars/dev/vars.json")) as file:
-    config_data = json.load(file)
-DB_URL = config_data["DB_URL"]
-
-
-def hash_password(password: str) -> str:
-    """
-    Hash a password using SHA-256.
-
-    Parameters
-    ----------
-    password : str
-        The plain-text password to hash.
-
-    Returns
-    -------
-    str
-        The hexadecimal SHA-256 hash of the password.
-
-    Notes
-    -----
-    - No salting is applied; this is a simple SHA-256 hash.
-    """
-    return hashlib.sha256(password.encode('utf-8')).hexdigest()
+from .schema import User, Group, Event
+from .engine import get_session_factory
+from .passwords import hash_password
+import argparse
+import time
 
 
 def init_db(seed: bool = True):
@@ -72,16 +47,14 @@ def init_db(seed: bool = True):
 
     Notes
     -----
-    - Creates all tables defined in the SQLAlchemy Base metadata.
+    - Tables are created through :func:`db.engine.get_engine`, which skips
+      creation when the stored schema version is current.
     - Seeds with a root user and a sample event if the database is empty.
     - If the database already contains users, seeding is skipped.
     - Commits changes to the database and closes the session.
     - Can be executed directly via `python <this_module>.py`.
     """
-    engine = create_engine(DB_URL, echo=True)
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = get_session_factory()()
 
     if seed:
         if session.query(User).first():
@@ -118,5 +91,31 @@ def init_db(seed: bool = True):
     session.close()
 
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(
+        description="Initialize the database, optionally adding a synthetic dataset."
+    )
+    parser.add_argument("--users", type=int, default=0)
+    parser.add_argument("--groups", type=int, default=0)
+    parser.add_argument("--events", type=int, default=0)
+    parser.add_argument("--chats", type=int, default=0)
+    parser.add_argument("--messages", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data.")
+    args = parser.parse_args()
+
     init_db(seed=True)
+
+    sizes = dict(users=args.users, groups=args.groups, events=args.events,
+                 chats=args.chats, messages=args.messages)
+    if any(sizes.values()):
+        from .seed import seed_synthetic
+
+        start = time.perf_counter()
+        counts = seed_synthetic(seed=args.seed, **sizes)
+        for name, count in counts.items():
+            print(f"{name}: {count}")
+        print(f"Synthetic data generated in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
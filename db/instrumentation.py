@@ -0,0 +1,213 @@
+"""
+SQL Instrumentation
+===================
+
+Counts and times every SQL statement executed through SQLAlchemy while a
+command (a menu handler invocation) is running, flags statement shapes
+repeated often enough to look like N+1 query patterns, and appends a
+per-command JSON summary to a log file.
+
+Configuration lives in ``vars/dev/vars.json`` under ``SQL_PROFILING``::
+
+    "SQL_PROFILING": {
+        "enabled": false,
+        "log_file": "./vars/dev/sql_profile.jsonl",
+        "n_plus_one_threshold": 5
+    }
+
+Profiling is off by default; while it is off no listener is installed and
+nothing is written. Turn it on to investigate a slow command. The log
+file is appended to and never rotated.
+
+Main features:
+- Engine-wide ``before/after_cursor_execute`` hooks (all engines), plus
+  ``handle_error`` so statements that fail are timed and counted too.
+- Statement shapes with whitespace and ``IN (?, ?, ...)`` lists collapsed.
+- One JSON line per command, suitable for ``jq`` or pandas.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import get_config
+import json
+import re
+import threading
+import time
+
+SQL_PROFILING = get_config().get("SQL_PROFILING", {})
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL string so that executions differing only in layout or
+    in the length of ``IN`` lists share the same shape.
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _IN_LIST.sub("(?)", shape)
+
+
+class CommandProfile:
+    """
+    Statement statistics collected for a single command.
+    """
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started_at = datetime.now()
+        self.elapsed = 0.0
+        self.queries = 0
+        self.errors = 0
+        self.sql_time = 0.0
+        # shape -> [count, total_seconds]
+        self.statements = {}
+
+    def record(self, statement: str, duration: float, failed: bool = False):
+        """
+        Account one executed statement; ``failed`` marks one that raised.
+        """
+        stats = self.statements.setdefault(statement_shape(statement), [0, 0.0])
+        stats[0] += 1
+        stats[1] += duration
+        self.queries += 1
+        self.errors += failed
+        self.sql_time += duration
+
+    def suspected_n_plus_one(self, threshold: int) -> list:
+        """
+        Return the shapes executed at least ``threshold`` times.
+        """
+        return [shape for shape, (count, _) in self.statements.items() if count >= threshold]
+
+    def summary(self, threshold: int) -> dict:
+        """
+        Build the JSON-serialisable summary written to the log file.
+        """
+        return {
+            "command": self.command,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "elapsed_ms": round(self.elapsed * 1000, 3),
+            "queries": self.queries,
+            "errors": self.errors,
+            "sql_ms": round(self.sql_time * 1000, 3),
+            "statements": [
+                {"shape": shape, "count": count, "total_ms": round(total * 1000, 3)}
+                for shape, (count, total) in sorted(
+                    self.statements.items(), key=lambda item: -item[1][0]
+                )
+            ],
+            "n_plus_one": self.suspected_n_plus_one(threshold),
+        }
+
+
+class QueryProfiler:
+    """
+    Collect per-command SQL statistics through SQLAlchemy engine events.
+
+    Statements executed outside :meth:`profile` scopes are ignored. Scopes
+    are tracked per thread, so a background thread never pollutes the
+    profile of the command running on the main thread.
+    """
+
+    def __init__(self, log_file=None, n_plus_one_threshold=5, enabled=True):
+        """
+        Parameters
+        ----------
+        log_file : str, optional
+            JSON-lines file receiving one summary per command. If ``None``,
+            summaries are only kept in :attr:`last_profile`.
+        n_plus_one_threshold : int, optional
+            Minimum repetitions of one statement shape within a command to
+            flag it as a likely N+1 pattern. Defaults to ``5``.
+        enabled : bool, optional
+            When ``False``, :meth:`profile` is a no-op.
+        """
+        self.log_file = log_file
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.enabled = enabled
+        self.last_profile = None
+        self._local = threading.local()
+        self._installed = False
+
+    def install(self):
+        """
+        Register the cursor-execute and error listeners on every
+        :class:`Engine`.
+
+        Safe to call more than once.
+        """
+        if self._installed:
+            return
+        event.listen(Engine, "before_cursor_execute", self._before_execute)
+        event.listen(Engine, "after_cursor_execute", self._after_execute)
+        event.listen(Engine, "handle_error", self._handle_error)
+        self._installed = True
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if getattr(self._local, "current", None) is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        current = getattr(self._local, "current", None)
+        starts = conn.info.get("query_start")
+        if current is not None and starts:
+            current.record(statement, time.perf_counter() - starts.pop())
+
+    def _handle_error(self, context):
+        # A failing statement never reaches after_cursor_execute; pop its
+        # start here, or the next statement would be timed from it.
+        current = getattr(self._local, "current", None)
+        conn = context.connection
+        starts = conn.info.get("query_start") if conn is not None else None
+        if current is not None and starts and context.statement is not None:
+            current.record(context.statement, time.perf_counter() - starts.pop(), failed=True)
+
+    @contextmanager
+    def profile(self, command: str):
+        """
+        Profile every statement executed on this thread inside the block.
+
+        Nested scopes are folded into the outermost one.
+
+        Parameters
+        ----------
+        command : str
+            Name recorded in the summary (usually the handler name).
+
+        Yields
+        ------
+        CommandProfile or None
+            The live profile, or ``None`` when disabled or nested.
+        """
+        if not self.enabled or getattr(self._local, "current", None) is not None:
+            yield None
+            return
+
+        self.install()
+        current = CommandProfile(command)
+        self._local.current = current
+        start = time.perf_counter()
+        try:
+            yield current
+        finally:
+            current.elapsed = time.perf_counter() - start
+            self._local.current = None
+            self.last_profile = current
+            self._write(current)
+
+    def _write(self, profile: CommandProfile):
+        if not self.log_file:
+            return
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(profile.summary(self.n_plus_one_threshold)) + "\n")
+
+
+profiler = QueryProfiler(
+    log_file=SQL_PROFILING.get("log_file"),
+    n_plus_one_threshold=SQL_PROFILING.get("n_plus_one_threshold", 5),
+    enabled=SQL_PROFILING.get("enabled", False),
+)
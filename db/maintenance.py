@@ -0,0 +1,169 @@
+"""
+Database Maintenance Commands
+=============================
+
+One-off maintenance tasks for existing ``app.db`` files. Run from the
+project root::
+
+    python -m db.maintenance sweep-orphans
+    python -m db.maintenance dedupe-group-names
+    python -m db.maintenance purge-sessions
+
+Main features:
+- Set-wise removal of association rows pointing at deleted users,
+  groups or events (left behind before foreign keys were enforced).
+- Owner references to deleted users reset to ``NULL``, matching the
+  ``ON DELETE SET NULL`` declarations in :mod:`db.schema`.
+- A final ``PRAGMA foreign_key_check`` to confirm nothing is left.
+- Renaming of duplicate group names, which must happen before the unique
+  index on ``groups.group_name`` (schema version 3) can be created.
+- Deletion of expired login sessions.
+"""
+
+from sqlalchemy import bindparam, create_engine, delete, update, select, or_, func
+from datetime import datetime
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents, UserSession
+from .engine import get_engine
+from .config import get_config
+import argparse
+
+
+def sweep_orphans(engine=None) -> dict:
+    """
+    Delete or detach rows whose foreign keys point at missing rows.
+
+    Each table is cleaned with one set-based statement and all statements
+    run in a single transaction.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine, optional
+        Engine to clean. Defaults to :func:`db.engine.get_engine`.
+
+    Returns
+    -------
+    dict
+        Number of affected rows per cleanup step, plus
+        ``"remaining_violations"`` from ``PRAGMA foreign_key_check``.
+    """
+    engine = engine or get_engine()
+    user_ids = select(User.id)
+
+    steps = {
+        "users_in_groups": delete(UsersInGroups).where(or_(
+            UsersInGroups.user_id.not_in(user_ids),
+            UsersInGroups.group_id.not_in(select(Group.id)),
+        )),
+        "users_attending_events": delete(UsersAttendingEvents).where(or_(
+            UsersAttendingEvents.user_id.not_in(user_ids),
+            UsersAttendingEvents.event_id.not_in(select(Event.id)),
+        )),
+        "groups.owner_id": update(Group)
+            .where(Group.owner_id.is_not(None), Group.owner_id.not_in(user_ids))
+            .values(owner_id=None),
+        "events.owner_id": update(Event)
+            .where(Event.owner_id.is_not(None), Event.owner_id.not_in(user_ids))
+            .values(owner_id=None),
+    }
+
+    counts = {}
+    with engine.begin() as conn:
+        for name, stmt in steps.items():
+            counts[name] = conn.execute(stmt).rowcount
+        if engine.dialect.name == "sqlite":
+            counts["remaining_violations"] = len(
+                conn.exec_driver_sql("PRAGMA foreign_key_check").all()
+            )
+    return counts
+
+
+def dedupe_group_names(engine=None) -> int:
+    """
+    Make group names unique by suffixing later duplicates with their ID.
+
+    The oldest group (lowest ID) of each name keeps it; the others become
+    ``"<name> (<id>)"``, or ``"<name> (<id>-2)"``, ``"<name> (<id>-3)"``...
+    when that name is itself taken. All renames run in one ``executemany``.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine, optional
+        Engine to clean. Defaults to a plain engine on ``DB_URL`` that does
+        not run :func:`db.engine.ensure_schema`, since creating the unique
+        index is exactly what fails while duplicates exist.
+
+    Returns
+    -------
+    int
+        Number of renamed groups.
+    """
+    engine = engine or create_engine(get_config()["DB_URL"])
+    keep = select(func.min(Group.id)).group_by(Group.group_name)
+    with engine.begin() as conn:
+        duplicates = conn.execute(
+            select(Group.id, Group.group_name)
+            .where(Group.group_name.is_not(None), Group.id.not_in(keep))
+            .order_by(Group.id)
+        ).all()
+        if not duplicates:
+            return 0
+        taken = set(conn.scalars(select(Group.group_name).where(Group.group_name.is_not(None))))
+        renames = []
+        for group_id, name in duplicates:
+            new_name, attempt = f"{name} ({group_id})", 1
+            while new_name in taken:
+                attempt += 1
+                new_name = f"{name} ({group_id}-{attempt})"
+            taken.add(new_name)
+            renames.append({"gid": group_id, "new_name": new_name})
+        conn.execute(
+            update(Group).where(Group.id == bindparam("gid")).values(group_name=bindparam("new_name")),
+            renames,
+        )
+    return len(renames)
+
+
+def purge_sessions(engine=None, now=None) -> int:
+    """
+    Delete login sessions that have expired.
+
+    Expired sessions are already ignored at login, so this only reclaims
+    space; it uses the index on ``sessions.expires_at``.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine, optional
+        Engine to clean. Defaults to :func:`db.engine.get_engine`.
+    now : datetime, optional
+        Reference time. Defaults to the current time.
+
+    Returns
+    -------
+    int
+        Number of deleted sessions.
+    """
+    engine = engine or get_engine()
+    stmt = delete(UserSession).where(UserSession.expires_at <= (now or datetime.now()))
+    with engine.begin() as conn:
+        return conn.execute(stmt).rowcount
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Database maintenance commands.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("sweep-orphans", help="Remove rows referencing deleted users, groups or events.")
+    sub.add_parser("dedupe-group-names", help="Rename groups whose name is already taken.")
+    sub.add_parser("purge-sessions", help="Delete expired login sessions.")
+    args = parser.parse_args()
+
+    if args.command == "sweep-orphans":
+        for name, count in sweep_orphans().items():
+            print(f"{name}: {count}")
+    elif args.command == "dedupe-group-names":
+        print(f"renamed: {dedupe_group_names()}")
+    elif args.command == "purge-sessions":
+        print(f"deleted: {purge_sessions()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+Password Hashing
+================
+
+Salted, tunable-cost password hashes shared by registration, login, the
+seeders and the bulk importer.
+
+Hashes are stored as ``$``-separated strings that carry their own
+algorithm, cost and salt, so the cost can be raised later without
+invalidating existing passwords::
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+Salt and hash are unpadded URL-safe base64. A plain 64-character hex
+string is a legacy unsalted SHA-256 hash; it still verifies, and
+:func:`needs_rehash` reports it (and any hash made with other parameters
+than the configured ones) so it can be replaced on the next login.
+
+Both KDFs spend most of their time in OpenSSL with the GIL released, so
+:func:`verify_password_async` runs them in a small thread pool: a burst
+of logins uses at most ``workers`` cores and never blocks the caller's
+thread. Configuration lives in ``vars/dev/vars.json`` under
+``PASSWORD_HASHING``::
+
+    "PASSWORD_HASHING": {
+        "algorithm": "scrypt",
+        "scrypt": {"n": 16384, "r": 8, "p": 1},
+        "pbkdf2_iterations": 600000,
+        "workers": 2
+    }
+
+``python -m benchmarks.password_cost`` suggests the cost for a target
+login latency on the current machine.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import hmac
+import os
+import threading
+
+from .config import get_config
+
+PASSWORD_HASHING = get_config().get("PASSWORD_HASHING", {})
+ALGORITHM = PASSWORD_HASHING.get("algorithm", "scrypt")
+SCRYPT_PARAMS = {"n": 16384, "r": 8, "p": 1, **PASSWORD_HASHING.get("scrypt", {})}
+PBKDF2_ITERATIONS = PASSWORD_HASHING.get("pbkdf2_iterations", 600000)
+WORKERS = PASSWORD_HASHING.get("workers", 2)
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _b64encode(data: bytes) -> str:
+    return urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: bytes, salt: bytes, n: int, r: int, p: int) -> bytes:
+    # OpenSSL refuses to use more than ``maxmem`` (32 MiB by default), which
+    # is less than n=32768, r=8 needs; allow what the parameters call for.
+    maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+    return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=KEY_BYTES)
+
+
+def _pbkdf2(password: bytes, salt: bytes, iterations: int) -> bytes:
+    return hashlib.pbkdf2_hmac("sha256", password, salt, iterations, dklen=KEY_BYTES)
+
+
+def legacy_hash(password: str) -> str:
+    """
+    Return the unsalted SHA-256 hex digest used before salted hashes.
+    """
+    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+def is_legacy(stored: str) -> bool:
+    """
+    Return whether ``stored`` is a legacy unsalted SHA-256 hash.
+    """
+    return "$" not in stored and len(stored) == 64
+
+
+def hash_password(password: str, algorithm: str = None, **params) -> str:
+    """
+    Hash a password with a fresh random salt.
+
+    Parameters
+    ----------
+    password : str
+        The plaintext password to hash.
+    algorithm : str, optional
+        ``"scrypt"`` or ``"pbkdf2_sha256"``. Defaults to the configured
+        algorithm.
+    **params
+        Cost overrides: ``n``, ``r`` and ``p`` for scrypt, ``iterations``
+        for PBKDF2. Missing ones come from the configuration.
+
+    Returns
+    -------
+    str
+        Encoded hash, including the algorithm, cost and salt.
+
+    Raises
+    ------
+    ValueError
+        If ``algorithm`` is unknown.
+    """
+    algorithm = algorithm or ALGORITHM
+    salt = os.urandom(SALT_BYTES)
+    secret = password.encode("utf-8")
+    if algorithm == "scrypt":
+        p = {**SCRYPT_PARAMS, **params}
+        key = _scrypt(secret, salt, p["n"], p["r"], p["p"])
+        return f"scrypt${p['n']}${p['r']}${p['p']}${_b64encode(salt)}${_b64encode(key)}"
+    if algorithm == "pbkdf2_sha256":
+        iterations = params.get("iterations", PBKDF2_ITERATIONS)
+        key = _pbkdf2(secret, salt, iterations)
+        return f"pbkdf2_sha256${iterations}${_b64encode(salt)}${_b64encode(key)}"
+    raise ValueError(f"Unknown password hashing algorithm: {algorithm!r}")
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Check a plaintext password against a stored hash.
+
+    Accepts every format produced by :func:`hash_password` as well as
+    legacy SHA-256 hashes. Comparisons are constant-time.
+
+    Parameters
+    ----------
+    password : str
+        Plaintext password to check.
+    stored : str
+        Hash read from the ``users`` table.
+
+    Returns
+    -------
+    bool
+        ``True`` if the password matches. Malformed hashes never match.
+    """
+    if not stored:
+        return False
+    if is_legacy(stored):
+        return hmac.compare_digest(legacy_hash(password), stored)
+
+    secret = password.encode("utf-8")
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            n, r, p = (int(v) for v in parts[1:4])
+            key = _scrypt(secret, _b64decode(parts[4]), n, r, p)
+            expected = _b64decode(parts[5])
+        elif parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            key = _pbkdf2(secret, _b64decode(parts[2]), int(parts[1]))
+            expected = _b64decode(parts[3])
+        else:
+            return False
+    except ValueError:
+        return False
+    return hmac.compare_digest(key, expected)
+
+
+def needs_rehash(stored: str) -> bool:
+    """
+    Return whether ``stored`` should be replaced by a hash made with the
+    configured algorithm and cost.
+
+    True for legacy hashes and for hashes of another algorithm or with
+    other cost parameters, whether weaker or stronger.
+    """
+    parts = stored.split("$")
+    if ALGORITHM == "scrypt":
+        current = ["scrypt", *(str(SCRYPT_PARAMS[k]) for k in ("n", "r", "p"))]
+        return parts[:4] != current
+    return parts[:2] != [ALGORITHM, str(PBKDF2_ITERATIONS)]
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide pool used for password hashing.
+
+    Created on first use with ``WORKERS`` threads, which bounds how many
+    cores concurrent logins can occupy.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="password")
+    return _executor
+
+
+def hash_password_async(password: str):
+    """
+    Hash a password in the pool of :func:`get_executor`.
+
+    Returns
+    -------
+    concurrent.futures.Future
+        Resolves to the result of :func:`hash_password`. Wrap it with
+        :func:`asyncio.wrap_future` to await it from a coroutine.
+    """
+    return get_executor().submit(hash_password, password)
+
+
+def verify_password_async(password: str, stored: str):
+    """
+    Verify a password in the pool of :func:`get_executor`.
+
+    Returns
+    -------
+    concurrent.futures.Future
+        Resolves to the result of :func:`verify_password`.
+    """
+    return get_executor().submit(verify_password, password, stored)
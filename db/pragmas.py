@@ -0,0 +1,116 @@
+"""
+SQLite Performance Profiles
+===========================
+
+Applies a named set of SQLite ``PRAGMA`` settings to every new DBAPI
+connection opened by a SQLAlchemy engine. Profiles are defined in
+``vars/dev/vars.json`` under ``SQLITE_PROFILES`` and the active one is
+selected with ``SQLITE_PROFILE``.
+
+Main features:
+- Connect-time hook registered through :func:`sqlalchemy.event.listen`.
+- Whitelisted pragma names and validated values (no raw SQL from config).
+- ``durable`` and ``fast`` presets shipped in the default configuration.
+- Foreign-key enforcement switched on for every connection, regardless
+  of profile, so ``ON DELETE`` actions declared in :mod:`db.schema` run.
+"""
+
+from sqlalchemy import event
+from .config import get_config
+
+# Applied in this order: journal_mode first so that synchronous is
+# interpreted against the final journal mode.
+PRAGMA_ORDER = (
+    "journal_mode",
+    "synchronous",
+    "cache_size",
+    "mmap_size",
+    "temp_store",
+    "busy_timeout",
+)
+
+
+def get_profile(name: str = None) -> dict:
+    """
+    Return the pragma settings of a profile.
+
+    Parameters
+    ----------
+    name : str, optional
+        Profile name. Defaults to the ``SQLITE_PROFILE`` configured in
+        ``vars.json``.
+
+    Returns
+    -------
+    dict
+        Mapping of pragma name to value.
+
+    Raises
+    ------
+    ValueError
+        If the profile is unknown or contains an unsupported pragma.
+    """
+    config = get_config()
+    profiles = config.get("SQLITE_PROFILES", {})
+    name = name or config.get("SQLITE_PROFILE", "durable")
+    if name not in profiles:
+        raise ValueError(f"Unknown SQLite profile: {name}")
+
+    profile = profiles[name]
+    for pragma, value in profile.items():
+        if pragma not in PRAGMA_ORDER:
+            raise ValueError(f"Unsupported pragma in profile '{name}': {pragma}")
+        if not isinstance(value, int) and not str(value).isalnum():
+            raise ValueError(f"Invalid value for pragma '{pragma}': {value}")
+    return profile
+
+
+def apply_pragmas(dbapi_connection, profile: dict):
+    """
+    Execute the pragmas of ``profile`` on a raw DBAPI connection and
+    enable foreign-key enforcement.
+
+    Parameters
+    ----------
+    dbapi_connection : sqlite3.Connection
+        Freshly opened connection.
+    profile : dict
+        Validated profile as returned by :func:`get_profile`.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in PRAGMA_ORDER:
+            if pragma in profile:
+                cursor.execute(f"PRAGMA {pragma}={profile[pragma]}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+    finally:
+        cursor.close()
+
+
+def install_pragmas(engine, profile_name: str = None):
+    """
+    Register a connect hook on ``engine`` applying a pragma profile.
+
+    Parameters
+    ----------
+    engine : sqlalchemy.engine.Engine
+        Engine whose new connections should be configured. Non-SQLite
+        engines are left untouched.
+    profile_name : str, optional
+        Profile to apply. Defaults to the configured ``SQLITE_PROFILE``.
+
+    Returns
+    -------
+    dict
+        The profile that was installed (empty for non-SQLite engines).
+    """
+    if engine.dialect.name != "sqlite":
+        return {}
+
+    profile = get_profile(profile_name)
+
+    def on_connect(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, profile)
+
+    event.listen(engine, "connect", on_connect)
+    return profile
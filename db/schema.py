@@ -4,29 +4,26 @@ Database Models (SQLAlchemy ORM)
 
 Defines all SQLAlchemy ORM models used by the application, including
 users, groups, events, and the association tables for many-to-many
-relationships. The module loads the database URL from the project
-configuration and initializes a SQLite engine, creating all tables
-automatically at import time.
+relationships. Importing this module has no side effects; tables are
+created by :func:`db.engine.ensure_schema` when the engine is first used.
 
 Main features:
 - User accounts with roles, passwords, timestamps.
 - Groups owned by users, with user membership via association table.
 - Events owned by users, with attendee tracking via association table.
-- Automatic table creation through SQLAlchemy declarative base.
+- Login sessions identified by a hash of their opaque token.
+- ``SCHEMA_VERSION`` stamp used to skip table creation on restart.
 """
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, DateTime, ForeignKey, CheckConstraint
+    Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index
 )
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
-import json
-import os
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-with open(os.path.join(BASE_DIR, "vars/dev/vars.json")) as file:
-    config_data = json.load(file)
-DB_URL = config_data["DB_URL"]
+# Bump whenever tables or indexes change so existing databases get the
+# missing objects created on next start.
+SCHEMA_VERSION = 5
 
 Base = declarative_base()
 
@@ -75,7 +72,7 @@ class Group(Base):
     Attributes
     ----------
     group_name : str
-        Name of the group.
+        Name of the group, unique across groups.
     created_at : datetime
         Auto-populated creation timestamp.
     owner_id : int or None
@@ -90,7 +87,10 @@ class Group(Base):
     __tablename__ = 'groups'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    group_name = Column(String)
+    # A unique index rather than a table constraint, so that databases
+    # created before it existed get it through ensure_schema (after
+    # ``python -m db.maintenance dedupe-group-names`` if they hold duplicates).
+    group_name = Column(String, unique=True, index=True)
     created_at = Column(DateTime, default=datetime.now)
     owner_id = Column(
         Integer,
@@ -110,10 +110,16 @@ class UsersInGroups(Base):
     Association table linking users and groups.
 
     This is a pure junction table implementing a many-to-many
-    relationship between :class:`User` and :class:`Group`.
+    relationship between :class:`User` and :class:`Group`. The primary
+    key serves user -> groups lookups; ``ix_users_in_groups_group_id``
+    serves group -> members (listings, counts and the cascade on group
+    deletion).
     """
 
     __tablename__ = 'users_in_groups'
+    __table_args__ = (
+        Index('ix_users_in_groups_group_id', 'group_id', 'user_id'),
+    )
 
     user_id = Column(
         Integer,
@@ -153,7 +159,7 @@ class Event(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     event_name = Column(String)
     description = Column(String)
-    event_time = Column(DateTime, default=datetime.now())
+    event_time = Column(DateTime, default=datetime.now, index=True)
     owner_id = Column(
         Integer,
         ForeignKey('users.id', ondelete='SET NULL'),
@@ -172,10 +178,14 @@ class UsersAttendingEvents(Base):
     Association table linking users and events.
 
     Implements a many-to-many relationship between :class:`User`
-    and :class:`Event`.
+    and :class:`Event`. The primary key serves user -> events lookups;
+    ``ix_users_attending_events_event_id`` serves event -> attendees.
     """
 
     __tablename__ = 'users_attending_events'
+    __table_args__ = (
+        Index('ix_users_attending_events_event_id', 'event_id', 'user_id'),
+    )
 
     user_id = Column(
         Integer,
@@ -189,6 +199,32 @@ class UsersAttendingEvents(Base):
     )
 
 
-# --- Create SQLite database ---
-engine = create_engine(DB_URL, echo=True)
-Base.metadata.create_all(engine)
+class UserSession(Base):
+    """
+    Authenticated login session.
+
+    The client holds an opaque random token; only its SHA-256 digest is
+    stored, so a leaked database does not reveal usable tokens. Sessions
+    are removed with their user and ignored once ``expires_at`` passes.
+
+    Attributes
+    ----------
+    token_hash : str
+        Hex SHA-256 of the session token.
+    user_id : int
+        Authenticated user.
+    expires_at : datetime
+        End of validity.
+    """
+
+    __tablename__ = 'sessions'
+
+    token_hash = Column(String, primary_key=True)
+    user_id = Column(
+        Integer,
+        ForeignKey('users.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    created_at = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,277 @@
+"""
+Synthetic Dataset Seeder
+========================
+
+Fills the database (and the chats XML file) with a large, reproducible
+dataset so production-scale behavior can be tried locally. Normally run
+through :mod:`db.init_db`::
+
+    python -m db.init_db --users 100000 --groups 5000 --events 50000 \\
+        --chats 10000 --messages 5000000 --seed 42
+
+Main features:
+- Deterministic: the same arguments and ``--seed`` on an empty database
+  always produce the same rows (timestamps are offsets from a fixed date;
+  only the random salt of the shared password hash differs).
+- Skewed, Zipf-like popularity: a few users own and join far more groups,
+  events and chats than the rest, and a few groups, events and chats
+  are far larger than the median one.
+- Rows are inserted with Core ``executemany`` batches inside a single
+  transaction; IDs are assigned up front so no rows are read back.
+- Generated accounts are named ``seed_user<id>`` (email
+  ``seed_user<id>@example.com``); a clash with an existing account is
+  reported before anything is inserted.
+- Chats are written to XML as a stream, one message at a time, so
+  millions of messages never sit in memory.
+"""
+
+from datetime import datetime, timedelta
+from itertools import accumulate
+from xml.sax.saxutils import escape
+import os
+import random
+import shutil
+
+from sqlalchemy import func, insert, select
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents
+from .engine import get_engine
+from .config import BASE_DIR
+from .passwords import hash_password
+
+BATCH_SIZE = 10000
+CHATS_FILE = os.path.join(BASE_DIR, "vars", "dev", "chats.xml")
+BASE_TIME = datetime(2025, 1, 1)
+SEED_PASSWORD = "password"
+USERNAME_PREFIX = "seed_user"
+ZIPF_EXPONENT = 1.1
+WORDS = (
+    "meeting", "deadline", "project", "update", "review", "lunch", "sprint",
+    "release", "bug", "fix", "plan", "team", "today", "tomorrow", "ok",
+    "thanks", "please", "check", "the", "a", "we", "need", "can", "you",
+)
+
+
+def _zipf_cum_weights(n: int, rng: random.Random):
+    """
+    Return cumulative Zipf weights for ``n`` items in a shuffled order.
+
+    The shuffle keeps popularity independent of ID, so the busiest rows
+    are spread across the table rather than being the oldest ones.
+    """
+    ranks = list(range(1, n + 1))
+    rng.shuffle(ranks)
+    return list(accumulate(1 / r ** ZIPF_EXPONENT for r in ranks))
+
+
+def _pick(rng, population, cum_weights, k):
+    """
+    Draw ``k`` distinct items (fewer if the population is smaller).
+    """
+    k = min(k, len(population))
+    picked = set()
+    # Popular items repeat often, so stop after a bounded number of tries.
+    for _ in range(k * 4):
+        picked.update(rng.choices(population, cum_weights=cum_weights, k=k - len(picked)))
+        if len(picked) >= k:
+            break
+    return picked
+
+
+def _insert_batched(conn, model, rows):
+    """
+    Insert an iterable of row dicts with one ``executemany`` per batch.
+    """
+    count = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.execute(insert(model), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        conn.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+def _next_id(conn, column) -> int:
+    return (conn.scalar(select(func.max(column))) or 0) + 1
+
+
+def _taken_seed_names(conn, first_user: int, users: int) -> list:
+    """
+    Return existing usernames or emails that users ``first_user`` to
+    ``first_user + users - 1`` would be given.
+    """
+    wanted = range(first_user, first_user + users)
+    taken = []
+    for column, suffix in ((User.username, ""), (User.email, "@example.com")):
+        for value in conn.scalars(select(column).where(column.like(f"{USERNAME_PREFIX}%{suffix}"))):
+            # LIKE treats "_" as a wildcard, so re-check the exact prefix.
+            number = value[len(USERNAME_PREFIX):len(value) - len(suffix)]
+            if value.startswith(USERNAME_PREFIX) and number.isdigit() and int(number) in wanted:
+                taken.append(value)
+    return taken
+
+
+def seed_synthetic(users: int = 0, groups: int = 0, events: int = 0, chats: int = 0,
+                   messages: int = 0, seed: int = 42, engine=None,
+                   chats_file: str = CHATS_FILE) -> dict:
+    """
+    Generate a synthetic dataset.
+
+    Parameters
+    ----------
+    users, groups, events : int
+        Number of rows to add to each table. Memberships and attendees
+        are derived from these (about three groups per user on average,
+        heavy-tailed attendee counts per event).
+    chats, messages : int
+        Number of chats and total messages to write to ``chats_file``.
+        When ``chats`` is non-zero the file is replaced; the previous one
+        is kept next to it with a ``.bak`` suffix.
+    seed : int
+        Random seed.
+    engine : sqlalchemy.engine.Engine, optional
+        Target engine. Defaults to :func:`db.engine.get_engine`.
+    chats_file : str
+        Chats XML file to write.
+
+    Returns
+    -------
+    dict
+        Number of generated rows per table (and chats/messages).
+
+    Raises
+    ------
+    ValueError
+        If groups, events or chats are requested without any users, or if
+        an existing account already has a generated username or email.
+    """
+    rng = random.Random(seed)
+    engine = engine or get_engine()
+    counts = {}
+    password_hash = hash_password(SEED_PASSWORD)
+
+    with engine.begin() as conn:
+        first_user = _next_id(conn, User.id)
+        taken = _taken_seed_names(conn, first_user, users)
+        if taken:
+            raise ValueError(f"Seed usernames or emails already in use: {', '.join(taken[:5])}")
+        counts["users"] = _insert_batched(conn, User, (
+            {
+                "id": uid,
+                "username": f"{USERNAME_PREFIX}{uid}",
+                "email": f"{USERNAME_PREFIX}{uid}@example.com",
+                "password_hash": password_hash,
+                "access_level": "user",
+                "created_at": BASE_TIME + timedelta(minutes=uid),
+            }
+            for uid in range(first_user, first_user + users)
+        ))
+
+        pool = conn.execute(select(User.id, User.username).order_by(User.id)).all()
+        if not pool and (groups or events or chats):
+            raise ValueError("Groups, events and chats need at least one user.")
+        user_ids = [row.id for row in pool]
+        user_weights = _zipf_cum_weights(len(user_ids), rng)
+
+        first_group = _next_id(conn, Group.id)
+        group_ids = list(range(first_group, first_group + groups))
+        counts["groups"] = _insert_batched(conn, Group, (
+            {
+                "id": gid,
+                "group_name": f"group{gid}",
+                "owner_id": rng.choices(user_ids, cum_weights=user_weights)[0],
+                "created_at": BASE_TIME + timedelta(minutes=gid),
+            }
+            for gid in group_ids
+        ))
+
+        # Each new user joins a geometric number of groups (mean ~3),
+        # chosen by group popularity.
+        counts["users_in_groups"] = 0
+        if group_ids:
+            group_weights = _zipf_cum_weights(len(group_ids), rng)
+            counts["users_in_groups"] = _insert_batched(conn, UsersInGroups, (
+                {"user_id": uid, "group_id": gid}
+                for uid in range(first_user, first_user + users)
+                for gid in sorted(_pick(rng, group_ids, group_weights, int(rng.expovariate(1 / 3))))
+            ))
+
+        first_event = _next_id(conn, Event.id)
+        event_ids = list(range(first_event, first_event + events))
+        counts["events"] = _insert_batched(conn, Event, (
+            {
+                "id": eid,
+                "event_name": f"event{eid}",
+                "description": " ".join(rng.choices(WORDS, k=8)),
+                "event_time": BASE_TIME + timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+                "owner_id": rng.choices(user_ids, cum_weights=user_weights)[0],
+            }
+            for eid in event_ids
+        ))
+
+        # Log-normal attendee counts: median ~7, a long tail of huge events.
+        counts["users_attending_events"] = _insert_batched(conn, UsersAttendingEvents, (
+            {"user_id": uid, "event_id": eid}
+            for eid in event_ids
+            for uid in sorted(_pick(rng, user_ids, user_weights, int(rng.lognormvariate(2.0, 1.0))))
+        ))
+
+    if chats:
+        usernames = [row.username for row in pool]
+        counts["chats"], counts["messages"] = _write_chats(
+            chats_file, chats, messages, usernames, user_weights, rng
+        )
+    return counts
+
+
+def _write_chats(path, chats, messages, usernames, user_weights, rng):
+    """
+    Stream ``chats`` chats with ``messages`` messages in total to ``path``.
+
+    Messages are split across chats by Zipf weight, so a few chats hold
+    most of the traffic.
+    """
+    weights = [1 / r ** ZIPF_EXPONENT for r in range(1, chats + 1)]
+    rng.shuffle(weights)
+    total = sum(weights)
+    per_chat = [int(messages * w / total) for w in weights]
+    per_chat[0] += messages - sum(per_chat)
+
+    if os.path.exists(path):
+        shutil.copyfile(path, path + ".bak")
+
+    written = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("<chats>\n")
+        for n, count in enumerate(per_chat, start=1):
+            participants = sorted(_pick(rng, usernames, user_weights, 2 + int(rng.expovariate(1 / 3))))
+            moment = BASE_TIME + timedelta(minutes=rng.randrange(365 * 24 * 60))
+            # Exponential gaps spread the chat's messages over about a year.
+            mean_gap = 365 * 24 * 3600 / max(count, 1)
+
+            file.write(f'    <chat id="chat_{n:03}">\n')
+            file.write(f"        <name>Chat {n}</name>\n")
+            file.write(f"        <owner>{escape(participants[0])}</owner>\n")
+            for p in participants:
+                file.write(f"        <participant>{escape(p)}</participant>\n")
+            for _ in range(count):
+                moment += timedelta(seconds=rng.expovariate(1 / mean_gap))
+                sender = rng.choice(participants)
+                content = " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+                file.write(
+                    "        <message>\n"
+                    f"            <sender>{escape(sender)}</sender>\n"
+                    f"            <content>{content}</content>\n"
+                    f"            <timestamp>{moment:%Y-%m-%d %H:%M:%S}</timestamp>\n"
+                    "        </message>\n"
+                )
+            # Written last because it is only known once the messages are out.
+            file.write(f"        <latest_timestamp>{moment:%Y-%m-%d %H:%M:%S}</latest_timestamp>\n")
+            written += count
+            file.write("    </chat>\n")
+        file.write("</chats>\n")
+    return chats, written
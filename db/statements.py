@@ -0,0 +1,120 @@
+"""
+Shared Statements
+=================
+
+Pre-built statements, SQL helpers and constants used by both
+:class:`db.db_controller.DBController` and
+:class:`db.async_db_controller.AsyncDBController`. Keeping them in one
+module means the two controllers always run the same SQL and return the
+same messages.
+"""
+
+from sqlalchemy import bindparam, func, insert, literal, select, exists, or_
+from sqlalchemy.exc import IntegrityError
+from .schema import User, Group, UsersInGroups, Event, UsersAttendingEvents, UserSession
+from .views import USER_COLUMNS
+
+# Pre-built statements for the hot point lookups. They are constructed once
+# at import and only bound to new parameter values per call, so each call
+# skips building the ORM query and hits SQLAlchemy's compiled-SQL cache.
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+HAS_USERS = select(exists().where(User.id.is_not(None)))
+GROUP_BY_ID = select(Group).where(Group.id == bindparam("group_id"))
+EVENT_BY_ID = select(Event).where(Event.id == bindparam("event_id"))
+IS_MEMBER = select(exists().where(
+    UsersInGroups.user_id == bindparam("user_id"),
+    UsersInGroups.group_id == bindparam("group_id"),
+))
+COUNT_GROUP_MEMBERS = (
+    select(func.count()).select_from(UsersInGroups)
+    .where(UsersInGroups.group_id == bindparam("group_id"))
+)
+SESSION_USER = (
+    select(*USER_COLUMNS, UserSession.expires_at)
+    .join(UserSession, UserSession.user_id == User.id)
+    .where(UserSession.token_hash == bindparam("token_hash"), UserSession.expires_at > bindparam("now"))
+)
+COUNT_EVENT_ATTENDEES = (
+    select(func.count()).select_from(UsersAttendingEvents)
+    .where(UsersAttendingEvents.event_id == bindparam("event_id"))
+)
+
+# Column names published with insert changes (the full row, unlike the
+# read-model columns of db.views).
+USER_FIELDS = tuple(User.__table__.columns.keys())
+GROUP_FIELDS = tuple(Group.__table__.columns.keys())
+MEMBER_FIELDS = tuple(UsersInGroups.__table__.columns.keys())
+EVENT_FIELDS = tuple(Event.__table__.columns.keys())
+ATTENDEE_FIELDS = tuple(UsersAttendingEvents.__table__.columns.keys())
+SESSION_FIELDS = tuple(UserSession.__table__.columns.keys())
+
+# Constraint names as they appear in SQLite's IntegrityError text, mapped to
+# the messages the mutators return.
+USER_VIOLATIONS = {
+    "users.username": "Username already exists.",
+    "users.email": "Email already exists.",
+}
+GROUP_VIOLATIONS = {
+    "groups.group_name": "Group name already exists.",
+    "FOREIGN KEY": "Owner not found.",
+}
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    return "FOREIGN KEY" in str(error.orig)
+
+
+def violation_message(error: IntegrityError, messages: dict) -> str:
+    """
+    Map an :class:`IntegrityError` to a user-facing message.
+
+    :param error: The error raised by the failed write.
+    :param dict messages: Substrings of the database message mapped to
+        the message to return.
+    :raises IntegrityError: If no substring matches (e.g. a ``NOT NULL``
+        violation), since that indicates a bug rather than a duplicate.
+    """
+    text = str(error.orig)
+    for fragment, message in messages.items():
+        if fragment in text:
+            return message
+    raise error
+
+
+def add_attendees(event_id, user_ids):
+    """
+    Return an ``INSERT ... SELECT`` adding the existing users among
+    ``user_ids`` to an event in one statement. Unknown IDs, duplicates and
+    users already attending are skipped by the ``SELECT``.
+    """
+    attending = exists().where(
+        UsersAttendingEvents.event_id == event_id,
+        UsersAttendingEvents.user_id == User.id,
+    )
+    return insert(UsersAttendingEvents).from_select(
+        ["user_id", "event_id"],
+        select(User.id, literal(event_id)).where(User.id.in_(set(user_ids)), ~attending),
+    )
+
+
+def attended_by(stmt, user_id):
+    """
+    Restrict an events statement to the events ``user_id`` attends, if given.
+    """
+    if user_id is None:
+        return stmt
+    return stmt.join(
+        UsersAttendingEvents, UsersAttendingEvents.event_id == Event.id
+    ).where(UsersAttendingEvents.user_id == user_id)
+
+
+def groups_of(user_id):
+    """
+    Condition matching the groups ``user_id`` owns or is a member of.
+    """
+    return or_(
+        Group.owner_id == user_id,
+        Group.id.in_(select(UsersInGroups.group_id).where(UsersInGroups.user_id == user_id)),
+    )
@@ -0,0 +1,101 @@
+"""
+Read Models
+===========
+
+Immutable snapshots of users, groups and events for listing screens.
+
+The ``list_*`` methods of :class:`db.db_controller.DBController` select
+only the columns below and wrap each row in one of these classes instead
+of loading ORM objects. A view is not tracked by the session, so it is
+never expired by a commit, never refreshed, and has no relationships to
+lazy-load by accident. With ``__slots__`` it is also a fraction of the
+size of an instrumented ORM instance.
+
+Use the ORM getters (``get_user_by_id`` and friends) when an object is
+going to be modified; use the views to display rows.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from .schema import User, Group, Event
+
+_Owner = aliased(User)
+
+USER_COLUMNS = (User.id, User.username, User.email, User.access_level, User.created_at)
+GROUP_COLUMNS = (Group.id, Group.group_name, Group.owner_id, _Owner.username, Group.created_at)
+EVENT_COLUMNS = (Event.id, Event.event_name, Event.description, Event.event_time, Event.owner_id)
+
+
+@dataclass(frozen=True, slots=True)
+class UserView:
+    """
+    Snapshot of a user row, without the password hash.
+    """
+
+    id: int
+    username: str
+    email: str
+    access_level: str
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class GroupView:
+    """
+    Snapshot of a group row, with the owner's username already joined in.
+
+    ``owner_name`` is ``None`` when the group has no owner.
+    """
+
+    id: int
+    group_name: str
+    owner_id: int
+    owner_name: str
+    created_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class EventView:
+    """
+    Snapshot of an event row.
+    """
+
+    id: int
+    event_name: str
+    description: str
+    event_time: datetime
+    owner_id: int
+
+
+def select_users():
+    """
+    Return a ``SELECT`` of :data:`USER_COLUMNS` to build :class:`UserView` rows.
+    """
+    return select(*USER_COLUMNS)
+
+
+def select_groups():
+    """
+    Return a ``SELECT`` of :data:`GROUP_COLUMNS` to build :class:`GroupView` rows.
+
+    The owner is joined with a ``LEFT OUTER JOIN`` so groups without one
+    are kept.
+    """
+    return select(*GROUP_COLUMNS).outerjoin(_Owner, _Owner.id == Group.owner_id)
+
+
+def select_events():
+    """
+    Return a ``SELECT`` of :data:`EVENT_COLUMNS` to build :class:`EventView` rows.
+    """
+    return select(*EVENT_COLUMNS)
+
+
+def to_views(view, rows) -> list:
+    """
+    Wrap result rows in ``view`` instances, column by column.
+    """
+    return [view(*row) for row in rows]
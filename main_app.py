@@ -6,7 +6,12 @@ from app.menus import menu_loop
 
 
 def main():
-    initializer.init_db()
+    try:
+        initializer.init_db()
+    except RuntimeError as e:
+        # Raised by ensure_schema when the data blocks a schema upgrade.
+        print(e)
+        return
     db = DBController()
     auth = AuthService(db)
     permissions = PermissionManager("./vars/dev/permissions.json")